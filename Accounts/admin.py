@@ -1,16 +1,15 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
 from .forms import CustomUserCreationForm, CustomUserChangeForm
-from .models import CustomUser
-import admin_thumbnails
+from .models import CustomUser, OutboundEmail
+from ProjectManagement.images import ThumbnailAdminMixin
 
 
-@admin_thumbnails.thumbnail('image')
-class CustomUserAdmin(UserAdmin):
+class CustomUserAdmin(ThumbnailAdminMixin, UserAdmin):
     """
     manage user instances in admin panel.
     get 2 forms for create and update user instance.
-    with thumbnail show a preview for profile image.
+    with the pre-generated thumbnail show a preview for profile image.
     search by -> phone number, email
     filter by -> is staff status
     sort by -> phone number, email
@@ -37,3 +36,27 @@ class CustomUserAdmin(UserAdmin):
 
 
 admin.site.register(CustomUser, CustomUserAdmin)
+
+
+class OutboundEmailAdmin(admin.ModelAdmin):
+    """
+    show queued email instances in admin panel (read only, the body is not shown:
+    the emails are only changed by the email worker, and they can be deleted).
+    search by -> subject
+    filter by -> kind, status
+    """
+
+    list_display = ('subject', 'kind', 'recipients', 'status', 'attempts', 'next_attempt_at', 'sent_at')
+    list_filter = ('kind', 'status')
+    search_fields = ('subject',)
+    exclude = ('body',)
+    raw_id_fields = ('user',)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+admin.site.register(OutboundEmail, OutboundEmailAdmin)
@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class AccountsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'Accounts'
+
+    def ready(self):
+        from django.db.models.signals import post_migrate
+        from . import signals
+        post_migrate.connect(receiver=signals.create_user_search_indexes, sender=self)
@@ -0,0 +1,104 @@
+import copy
+import threading
+import time
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+_local_users = {}
+_local_users_lock = threading.Lock()
+
+
+def user_cache_key(user_id):
+    """
+    return the shared cache key of the user with the given id.
+    """
+    return f'auth-user:{user_id}'
+
+
+def get_cached_user(user_id):
+    """
+    return a copy of the cached user with the given id, first from the in-process cache,
+    then from the shared cache. return None if the user is not cached.
+    """
+    with _local_users_lock:
+        entry = _local_users.get(user_id)
+    if entry and entry[0] > time.monotonic():
+        return copy.copy(entry[1])
+
+    user = cache.get(user_cache_key(user_id))
+    if user is not None:
+        set_local_user(user_id, user)
+        return copy.copy(user)
+    return None
+
+
+def set_local_user(user_id, user):
+    """
+    store the user in the in-process cache for a short time.
+    when the cache is full, the entries that expire first are removed.
+    """
+    with _local_users_lock:
+        if len(_local_users) >= settings.AUTH_USER_LOCAL_CACHE_SIZE:
+            for key, _entry in sorted(_local_users.items(), key=lambda item: item[1][0])[:len(_local_users) // 2]:
+                del _local_users[key]
+        _local_users[user_id] = (time.monotonic() + settings.AUTH_USER_LOCAL_CACHE_TIMEOUT, user)
+
+
+def cache_user(user):
+    """
+    store the user in the in-process cache and the shared cache.
+    """
+    user_id = getattr(user, api_settings.USER_ID_FIELD)
+    set_local_user(user_id, user)
+    cache.set(user_cache_key(user_id), user, timeout=settings.AUTH_USER_CACHE_TIMEOUT)
+
+
+def invalidate_cached_user(user_id):
+    """
+    remove the user from the in-process cache and the shared cache.
+    the in-process caches of other workers expire by their short timeout.
+    """
+    with _local_users_lock:
+        _local_users.pop(user_id, None)
+    cache.delete(user_cache_key(user_id))
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that resolves the user of the token from cache instead of database.
+    the user is cached for a short time in the worker process and for a longer time in the shared cache,
+    and it is invalidated when the user is saved or deleted (profile update, password change, deactivation).
+    """
+
+    def get_user(self, validated_token):
+        """
+        override this method to find the user in cache before querying the database.
+        the same checks as the parent method (active user, revoked token) run on the cached user.
+        """
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        user = get_cached_user(user_id)
+        if user is None:
+            try:
+                user = self.user_model.objects.get(**{api_settings.USER_ID_FIELD: user_id})
+            except self.user_model.DoesNotExist:
+                raise AuthenticationFailed(_("User not found"), code="user_not_found")
+            cache_user(user)
+            user = copy.copy(user)
+
+        if not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+
+        return user
@@ -0,0 +1,39 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.hashers import make_password, verify_password
+
+from .hashers import run_hashing
+
+
+class PooledModelBackend(ModelBackend):
+    """
+    authentication backend that checks the password in the bounded hashing pool.
+    the user is looked up in the request thread, only the hashing itself runs in the pool.
+    if the password hash uses an old hasher or old parameters, it is rehashed with the preferred hasher.
+    """
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        """
+        override this method to verify the password in the hashing pool.
+        """
+        UserModel = get_user_model()
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+
+        try:
+            user = UserModel._default_manager.get_by_natural_key(username)
+        except UserModel.DoesNotExist:
+            # hash the password anyway, so the response time doesn't show whether the user exists.
+            run_hashing(make_password, password)
+            return None
+
+        is_correct, must_update = run_hashing(verify_password, password, user.password)
+        if not is_correct or not self.user_can_authenticate(user):
+            return None
+
+        if must_update:
+            user.password = run_hashing(make_password, password)
+            user.save(update_fields=['password'])
+        return user
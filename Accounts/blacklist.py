@@ -0,0 +1,163 @@
+import hashlib
+import logging
+import math
+import threading
+import time
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+from rest_framework_simplejwt.tokens import RefreshToken as BaseRefreshToken
+from rest_framework_simplejwt.utils import aware_utcnow
+
+logger = logging.getLogger(__name__)
+
+
+class BloomFilter:
+    """
+    a compact set of strings that can answer 'surely not in the set' or 'maybe in the set'.
+    the number of bits and hash functions are chosen from the capacity and the false positive rate.
+    """
+
+    def __init__(self, capacity, error_rate=0.001):
+        capacity = max(capacity, 1)
+        self.size = max(int(-capacity * math.log(error_rate) / (math.log(2) ** 2)), 8)
+        self.hash_count = max(int(round(self.size / capacity * math.log(2))), 1)
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, value):
+        """
+        return the bit positions of the value (double hashing over one blake2b digest).
+        """
+        digest = hashlib.blake2b(value.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+        return ((first + i * second) % self.size for i in range(self.hash_count))
+
+    def add(self, value):
+        for position in self._positions(value):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, value):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(value))
+
+
+class TokenBlacklistFilter:
+    """
+    keeps a bloom filter of the blacklisted tokens that are not expired yet, and rebuilds it periodically.
+    the tokens that are blacklisted after the last rebuild (in any worker) are marked in the shared cache
+    until the next rebuilds include them, so the filter never misses a blacklisted token.
+    only the first filter of the worker is built in a request, the later rebuilds run in one background thread
+    while the requests keep using the old filter.
+    """
+
+    def __init__(self):
+        self._filter = None
+        self._built_at = 0
+        self._rebuilding = False
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+
+    @staticmethod
+    def recent_key(jti):
+        return f'jwt-blacklisted:{jti}'
+
+    def rebuild(self):
+        """
+        build a new filter from the blacklisted tokens that are not expired.
+        """
+        tokens = BlacklistedToken.objects.filter(token__expires_at__gt=aware_utcnow())
+        bloom = BloomFilter(capacity=tokens.count() * 2 + 1000, error_rate=settings.TOKEN_BLACKLIST_BLOOM_ERROR_RATE)
+        for jti in tokens.values_list('token__jti', flat=True).iterator(chunk_size=10000):
+            bloom.add(jti)
+
+        with self._lock:
+            self._filter = bloom
+            self._built_at = time.monotonic()
+
+    def rebuild_in_background(self):
+        """
+        rebuild the filter in this thread (started by get_filter) and let the next stale check start another one.
+        """
+        try:
+            self.rebuild()
+        except Exception:
+            logger.exception('the token blacklist filter is not rebuilt')
+        finally:
+            with self._lock:
+                self._rebuilding = False
+            connection.close()
+
+    def get_filter(self):
+        """
+        return the current filter.
+        the first filter is built here (one thread builds it, the others wait for it); when the filter is older than
+        the refresh interval, one thread starts a background rebuild and the old filter is returned meanwhile.
+        """
+        if self._filter is None:
+            with self._build_lock:
+                if self._filter is None:
+                    self.rebuild()
+            return self._filter
+
+        with self._lock:
+            stale = not self._rebuilding and time.monotonic() - self._built_at > settings.TOKEN_BLACKLIST_BLOOM_REFRESH
+            if stale:
+                self._rebuilding = True
+            bloom = self._filter
+        if stale:
+            threading.Thread(target=self.rebuild_in_background, name='token-blacklist-filter', daemon=True).start()
+        return bloom
+
+    def add(self, jti):
+        """
+        add a newly blacklisted token to this worker's filter and mark it for the other workers.
+        """
+        with self._lock:
+            if self._filter is not None:
+                self._filter.add(jti)
+        cache.set(self.recent_key(jti), True, timeout=settings.TOKEN_BLACKLIST_BLOOM_REFRESH * 2)
+
+    def is_blacklisted(self, jti):
+        """
+        return True if the token is blacklisted.
+        the database is queried only when the filter says 'maybe'.
+        """
+        if cache.get(self.recent_key(jti)):
+            return True
+        if jti not in self.get_filter():
+            return False
+        return BlacklistedToken.objects.filter(token__jti=jti).exists()
+
+    def reset(self):
+        with self._lock:
+            self._filter = None
+
+
+token_blacklist_filter = TokenBlacklistFilter()
+
+
+class RefreshToken(BaseRefreshToken):
+    """
+    refresh token that checks the blacklist through the bloom filter instead of querying it every time.
+    """
+
+    def check_blacklist(self):
+        """
+        override this method to check the blacklist by the bloom filter (exact check only on filter hits).
+        """
+        jti = self.payload[api_settings.JTI_CLAIM]
+
+        if token_blacklist_filter.is_blacklisted(jti):
+            raise TokenError(_("Token is blacklisted"))
+
+    def blacklist(self):
+        """
+        override this method to add the blacklisted token to the bloom filter too.
+        """
+        result = super().blacklist()
+        token_blacklist_filter.add(self.payload[api_settings.JTI_CLAIM])
+        return result
@@ -0,0 +1,108 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher, Argon2PasswordHasher, BCryptSHA256PasswordHasher
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+
+class TunedPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """
+    PBKDF2 hasher with the iterations from settings (PASSWORD_PBKDF2_ITERATIONS).
+    the algorithm name is the same as django's hasher, so the existing hashes are still valid,
+    and the hashes with other iterations are updated on the next login.
+    """
+
+    @property
+    def iterations(self):
+        return settings.PASSWORD_PBKDF2_ITERATIONS or PBKDF2PasswordHasher.iterations
+
+
+class TunedArgon2PasswordHasher(Argon2PasswordHasher):
+    """
+    argon2 hasher with the parameters from settings
+    (PASSWORD_ARGON2_TIME_COST, PASSWORD_ARGON2_MEMORY_COST, PASSWORD_ARGON2_PARALLELISM).
+    needs the argon2-cffi package.
+    """
+
+    @property
+    def time_cost(self):
+        return settings.PASSWORD_ARGON2_TIME_COST or Argon2PasswordHasher.time_cost
+
+    @property
+    def memory_cost(self):
+        return settings.PASSWORD_ARGON2_MEMORY_COST or Argon2PasswordHasher.memory_cost
+
+    @property
+    def parallelism(self):
+        return settings.PASSWORD_ARGON2_PARALLELISM or Argon2PasswordHasher.parallelism
+
+
+class TunedBCryptSHA256PasswordHasher(BCryptSHA256PasswordHasher):
+    """
+    bcrypt hasher with the rounds from settings (PASSWORD_BCRYPT_ROUNDS).
+    needs the bcrypt package.
+    """
+
+    @property
+    def rounds(self):
+        return settings.PASSWORD_BCRYPT_ROUNDS or BCryptSHA256PasswordHasher.rounds
+
+
+class HashingUnavailable(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = 'The server is busy, please try again in a few seconds.'
+    default_code = 'hashing_unavailable'
+
+
+_executor = None
+_slots = None
+_executor_lock = threading.Lock()
+
+
+def get_hashing_executor():
+    """
+    return the thread pool that runs password hashing (created on first use).
+    the hashing libraries release the GIL, so PASSWORD_HASHING_WORKERS threads can use that many cores,
+    and no more than that, so the other requests of the process are not starved.
+    """
+    global _executor, _slots
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                workers = settings.PASSWORD_HASHING_WORKERS
+                _slots = threading.BoundedSemaphore(workers * 2)
+                _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password-hashing')
+    return _executor
+
+
+def run_hashing(func, *args):
+    """
+    run a hashing function (make_password, verify_password, ...) in the hashing pool and return its result.
+    if the pool and its queue are full for PASSWORD_HASHING_QUEUE_TIMEOUT seconds -> 503 error.
+    """
+    executor = get_hashing_executor()
+    if not _slots.acquire(timeout=settings.PASSWORD_HASHING_QUEUE_TIMEOUT):
+        raise HashingUnavailable()
+    try:
+        return executor.submit(func, *args).result()
+    finally:
+        _slots.release()
+
+
+def map_hashing(func, values):
+    """
+    run a hashing function on every value in the hashing pool and return the results in the same order
+    (a bulk request uses the same bounded pool as login and registration, not a pool of its own).
+    every value takes a slot of the pool's queue, if none is free for PASSWORD_HASHING_QUEUE_TIMEOUT seconds
+    -> 503 error.
+    """
+    executor = get_hashing_executor()
+    futures = []
+    for value in values:
+        if not _slots.acquire(timeout=settings.PASSWORD_HASHING_QUEUE_TIMEOUT):
+            raise HashingUnavailable()
+        future = executor.submit(func, value)
+        future.add_done_callback(lambda _future: _slots.release())
+        futures.append(future)
+    return [future.result() for future in futures]
@@ -0,0 +1,129 @@
+import uuid
+from datetime import timedelta
+from django.conf import settings
+from django.contrib.auth.tokens import default_token_generator
+from django.core.mail import EmailMessage, get_connection
+from django.db.models import Case, F, PositiveSmallIntegerField, Q, When
+from django.urls import reverse
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
+from django.utils.timezone import now
+
+from .models import OutboundEmail
+
+PASSWORD_RESET_SUBJECT = 'Password Reset Request of Project Manager'
+PASSWORD_RESET_MESSAGE = 'Click the link below to reset your password: {url}'
+
+
+def enqueue_mail(subject, message, recipient_list, from_email=None):
+    """
+    store the email in the outbox to be sent by the email worker and return the outbox record.
+    """
+    return OutboundEmail.objects.create(subject=subject, body=message, recipients=list(recipient_list),
+                                        from_email=from_email or settings.DEFAULT_FROM_EMAIL)
+
+
+def enqueue_password_reset(user, base_url):
+    """
+    store the password reset email of the user in the outbox and return the outbox record.
+    only the user and the address of the site are stored, the reset link is built when the email is sent.
+    """
+    return OutboundEmail.objects.create(kind='password_reset', subject=PASSWORD_RESET_SUBJECT, user=user,
+                                        base_url=base_url, recipients=[user.email],
+                                        from_email=settings.DEFAULT_FROM_EMAIL)
+
+
+def render_body(email):
+    """
+    return the body of the email to send (the password reset link is made here, with a new token).
+    """
+    if email.kind != 'password_reset':
+        return email.body
+    path = reverse(viewname='accounts:password_reset_confirm',
+                   kwargs={'uidb64': urlsafe_base64_encode(force_bytes(email.user_id)),
+                           'token': default_token_generator.make_token(email.user)})
+    return PASSWORD_RESET_MESSAGE.format(url=email.base_url.rstrip('/') + path)
+
+
+def claim_batch(batch_size):
+    """
+    mark a batch of due emails as 'sending' for this worker and return them.
+    the emails are claimed by one update query, so two workers never send the same email.
+    emails that stayed in 'sending' status for too long (the worker has stopped) count as a failed attempt:
+    they are claimed again, or marked as failed when it was their last attempt.
+    """
+    current_time = now()
+    stale_time = current_time - timedelta(seconds=settings.EMAIL_OUTBOX_SENDING_TIMEOUT)
+    OutboundEmail.objects.filter(
+        status='sending', next_attempt_at__lte=stale_time, attempts__gte=settings.EMAIL_OUTBOX_MAX_ATTEMPTS - 1
+    ).update(status='failed', attempts=F('attempts') + 1, last_error='The worker stopped while sending the email.')
+
+    due = OutboundEmail.objects.filter(Q(status='pending', next_attempt_at__lte=current_time) |
+                                       Q(status='sending', next_attempt_at__lte=stale_time))
+    ids = list(due.order_by('next_attempt_at').values_list('id', flat=True)[:batch_size])
+    if not ids:
+        return []
+
+    lock_id = uuid.uuid4()
+    due.filter(id__in=ids).update(status='sending', lock_id=lock_id, next_attempt_at=current_time,
+                                  attempts=Case(When(status='sending', then=F('attempts') + 1),
+                                                default=F('attempts'), output_field=PositiveSmallIntegerField()))
+    return list(OutboundEmail.objects.filter(lock_id=lock_id, status='sending').select_related('user'))
+
+
+def send_queued_mail(batch_size=None):
+    """
+    send a batch of queued emails over one SMTP connection, the body of a sent email is cleared.
+    failed emails are retried with exponential backoff until EMAIL_OUTBOX_MAX_ATTEMPTS.
+    return a dictionary with the count of sent, retried and failed emails.
+    """
+    emails = claim_batch(batch_size or settings.EMAIL_OUTBOX_BATCH_SIZE)
+    result = {'sent': 0, 'retried': 0, 'failed': 0}
+    if not emails:
+        return result
+
+    connection = get_connection(fail_silently=False)
+    try:
+        connection.open()
+    except Exception as e:
+        # the SMTP server is not reachable, so the whole batch is retried later.
+        for email in emails:
+            result[record_failure(email, e)] += 1
+        return result
+
+    try:
+        for email in emails:
+            try:
+                EmailMessage(subject=email.subject, body=render_body(email), from_email=email.from_email,
+                             to=email.recipients, connection=connection).send()
+            except Exception as e:
+                result[record_failure(email, e)] += 1
+            else:
+                email.status = 'sent'
+                email.sent_at = now()
+                email.body = ''
+                email.save(update_fields=('status', 'sent_at', 'body'))
+                result['sent'] += 1
+    finally:
+        connection.close()
+
+    return result
+
+
+def record_failure(email, error):
+    """
+    save the failed attempt of the email.
+    if it has attempts left -> status = pending and the next attempt is delayed (1x, 2x, 4x, ... retry delay)
+    else -> status = failed
+    return 'retried' or 'failed'
+    """
+    email.attempts += 1
+    email.last_error = str(error)
+    if email.attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+        email.status = 'failed'
+    else:
+        email.status = 'pending'
+        delay = settings.EMAIL_OUTBOX_RETRY_DELAY * 2 ** (email.attempts - 1)
+        email.next_attempt_at = now() + timedelta(seconds=delay)
+    email.save(update_fields=('status', 'attempts', 'last_error', 'next_attempt_at'))
+    return 'failed' if email.status == 'failed' else 'retried'
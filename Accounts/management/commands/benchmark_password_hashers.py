@@ -0,0 +1,90 @@
+import time
+from django.core.management.base import BaseCommand
+
+from Accounts.hashers import TunedPBKDF2PasswordHasher, TunedArgon2PasswordHasher, TunedBCryptSHA256PasswordHasher
+
+# parameter grid of each hasher: (setting name -> hasher attribute, candidate values)
+PARAMETER_GRID = {
+    'pbkdf2': (TunedPBKDF2PasswordHasher, [
+        {'PASSWORD_PBKDF2_ITERATIONS': ('iterations', 260000)},
+        {'PASSWORD_PBKDF2_ITERATIONS': ('iterations', 600000)},
+        {'PASSWORD_PBKDF2_ITERATIONS': ('iterations', 870000)},
+    ]),
+    'argon2': (TunedArgon2PasswordHasher, [
+        {'PASSWORD_ARGON2_TIME_COST': ('time_cost', 2), 'PASSWORD_ARGON2_MEMORY_COST': ('memory_cost', 19456),
+         'PASSWORD_ARGON2_PARALLELISM': ('parallelism', 1)},
+        {'PASSWORD_ARGON2_TIME_COST': ('time_cost', 2), 'PASSWORD_ARGON2_MEMORY_COST': ('memory_cost', 65536),
+         'PASSWORD_ARGON2_PARALLELISM': ('parallelism', 1)},
+        {'PASSWORD_ARGON2_TIME_COST': ('time_cost', 3), 'PASSWORD_ARGON2_MEMORY_COST': ('memory_cost', 65536),
+         'PASSWORD_ARGON2_PARALLELISM': ('parallelism', 1)},
+        {'PASSWORD_ARGON2_TIME_COST': ('time_cost', 2), 'PASSWORD_ARGON2_MEMORY_COST': ('memory_cost', 102400),
+         'PASSWORD_ARGON2_PARALLELISM': ('parallelism', 8)},
+    ]),
+    'bcrypt': (TunedBCryptSHA256PasswordHasher, [
+        {'PASSWORD_BCRYPT_ROUNDS': ('rounds', 10)},
+        {'PASSWORD_BCRYPT_ROUNDS': ('rounds', 11)},
+        {'PASSWORD_BCRYPT_ROUNDS': ('rounds', 12)},
+    ]),
+}
+
+
+class Command(BaseCommand):
+    """
+    measure the speed of the supported password hashers with different parameters on this machine.
+    each setting is timed in a single thread, so the result is hashes per second on one core.
+    the hashers whose library is not installed are skipped.
+    """
+
+    help = 'Report password hashes per second per core for each hasher setting.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hashers', nargs='+', choices=list(PARAMETER_GRID), default=list(PARAMETER_GRID),
+                            help='Hashers to benchmark.')
+        parser.add_argument('--duration', type=float, default=2.0,
+                            help='Seconds to spend on each setting.')
+        parser.add_argument('--target-ms', type=float, default=None,
+                            help='Recommend the strongest setting of each hasher that is faster than this.')
+
+    def handle(self, *args, **options):
+        for name in options['hashers']:
+            hasher_class, candidates = PARAMETER_GRID[name]
+            try:
+                if hasher_class.library:
+                    hasher_class()._load_library()
+            except ValueError:
+                self.stdout.write(self.style.WARNING(f'{name}: library is not installed, skipped.'))
+                continue
+
+            results = []
+            for params in candidates:
+                # class attributes of the subclass take the place of the properties that read the settings.
+                hasher = type(hasher_class.__name__, (hasher_class,),
+                              {attribute: value for attribute, value in params.values()})()
+                milliseconds = self.measure(hasher, options['duration'])
+                settings_text = ' '.join(f'{setting}={value}' for setting, (_attribute, value) in params.items())
+                results.append((milliseconds, settings_text))
+                self.stdout.write(f'{name:8} {settings_text:90} {milliseconds:8.1f} ms/hash  '
+                                  f'{1000 / milliseconds:8.2f} hashes/sec/core')
+
+            if options['target_ms']:
+                fitting = [result for result in results if result[0] <= options['target_ms']]
+                if fitting:
+                    milliseconds, settings_text = max(fitting)
+                    self.stdout.write(self.style.SUCCESS(f'{name}: recommended {settings_text} ({milliseconds:.1f} ms)'))
+                else:
+                    self.stdout.write(self.style.WARNING(f'{name}: no setting is faster than {options["target_ms"]} ms'))
+
+    @staticmethod
+    def measure(hasher, duration):
+        """
+        hash a sample password for the given duration and return the average milliseconds per hash.
+        """
+        salt = hasher.salt()
+        count = 0
+        start = time.perf_counter()
+        while True:
+            hasher.encode('benchmark-password', salt)
+            count += 1
+            elapsed = time.perf_counter() - start
+            if elapsed >= duration:
+                return elapsed * 1000 / count
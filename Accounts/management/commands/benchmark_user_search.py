@@ -0,0 +1,76 @@
+import random
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from Accounts.models import CustomUser
+from Accounts.views import UserSearchView
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    """
+    measure the latency of the user search endpoint with prefixes taken from the existing users
+    and fail if the p95 latency is higher than the target.
+    with --users, that many sample users are created first and removed at the end (in a rolled back transaction).
+    """
+
+    help = 'Benchmark accounts/users/search/ and check its p95 latency.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=0,
+                            help='Number of sample users to create for the benchmark (rolled back at the end).')
+        parser.add_argument('--requests', type=int, default=500,
+                            help='Number of search requests.')
+        parser.add_argument('--target-p95', type=float, default=None,
+                            help='p95 target in milliseconds (default: USER_SEARCH_P95_TARGET_MS).')
+        parser.add_argument('--seed', type=int, default=1)
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self.run(options)
+                raise Rollback()
+        except Rollback:
+            pass
+
+    def run(self, options):
+        generator = random.Random(options['seed'])
+        if options['users']:
+            names = ['ali', 'sara', 'reza', 'maryam', 'hamid', 'neda', 'omid', 'leila', 'amir', 'zahra']
+            CustomUser.objects.bulk_create([
+                CustomUser(first_name=f'{generator.choice(names)}{i}', last_name=f'{generator.choice(names)}i{i}',
+                           phone_number=f'099{i:08d}', email=f'benchmark{i}@example.com', password='!')
+                for i in range(options['users'])], batch_size=2000)
+
+        samples = list(CustomUser.objects.order_by('?').values_list('first_name', 'last_name', 'email', 'phone_number')
+                       [:1000])
+        if not samples:
+            raise CommandError('There is no user to search, use --users to create sample users.')
+
+        factory = APIRequestFactory()
+        view = UserSearchView.as_view()
+        requester = CustomUser(id=0, is_active=True)
+        timings = []
+        for _ in range(options['requests']):
+            value = generator.choice(generator.choice(samples))
+            request = factory.get('/accounts/users/search/', {'q': value[:generator.randint(2, 5)]})
+            force_authenticate(request, user=requester)
+            start = time.perf_counter()
+            response = view(request)
+            response.render()
+            timings.append((time.perf_counter() - start) * 1000)
+
+        timings.sort()
+        percentile = lambda p: timings[min(int(len(timings) * p), len(timings) - 1)]
+        target = options['target_p95'] or settings.USER_SEARCH_P95_TARGET_MS
+        self.stdout.write(f'{len(timings)} requests  p50: {percentile(0.5):.2f} ms  p95: {percentile(0.95):.2f} ms  '
+                          f'p99: {percentile(0.99):.2f} ms  target p95: {target} ms')
+        if percentile(0.95) > target:
+            raise CommandError(f'p95 latency {percentile(0.95):.2f} ms is higher than the target {target} ms.')
+        self.stdout.write(self.style.SUCCESS('p95 latency is within the target.'))
@@ -0,0 +1,60 @@
+import csv
+import time
+from django.core.management.base import BaseCommand, CommandError
+
+from Accounts.provisioning import hashing_pool
+from Accounts.serializers import BulkUserSerializer
+
+
+class Command(BaseCommand):
+    """
+    create users from a CSV file in batches (columns: first_name, last_name, phone_number, email, gender, password).
+    each batch is validated by two queries, its passwords are hashed in a process pool (started once for all batches)
+    and it is inserted by bulk_create. the password column is optional, users without it must reset their password.
+    """
+
+    help = 'Create users in bulk from a CSV file.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('csv_file', help='Path of the CSV file (with a header row).')
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help='Number of users validated and inserted in each batch.')
+        parser.add_argument('--workers', type=int, default=None,
+                            help='Number of hashing processes (default: USER_PROVISIONING_WORKERS or cores).')
+        parser.add_argument('--skip-invalid', action='store_true',
+                            help='Skip invalid rows instead of stopping at the first invalid batch.')
+
+    def handle(self, *args, **options):
+        try:
+            with open(options['csv_file'], newline='', encoding='utf-8-sig') as file:
+                rows = [{key: value for key, value in row.items() if value != ''} for row in csv.DictReader(file)]
+        except OSError as e:
+            raise CommandError(f'Cannot read {options["csv_file"]}: {e}')
+
+        start = time.perf_counter()
+        created = skipped = 0
+        with hashing_pool(options['workers']) as pool:
+            for offset in range(0, len(rows), options['batch_size']):
+                batch = list(enumerate(rows[offset:offset + options['batch_size']], start=offset + 2))
+
+                while batch:
+                    serializer = BulkUserSerializer(data=[row for _line, row in batch], many=True,
+                                                    context={'hashing_pool': pool})
+                    if serializer.is_valid():
+                        created += len(serializer.save())
+                        break
+                    if not isinstance(serializer.errors, list):
+                        raise CommandError(f'{created} users created, stopped by: {serializer.errors}')
+
+                    invalid = [(line, error) for (line, _row), error in zip(batch, serializer.errors) if error]
+                    for line, error in invalid:
+                        self.stderr.write(f'line {line}: {error}')
+                    if not options['skip_invalid']:
+                        raise CommandError(f'{created} users created, stopped at an invalid batch.')
+
+                    skipped += len(invalid)
+                    invalid_lines = {line for line, _error in invalid}
+                    batch = [(line, row) for line, row in batch if line not in invalid_lines]
+
+        self.stdout.write(self.style.SUCCESS(
+            f'{created} users created, {skipped} rows skipped in {time.perf_counter() - start:.1f} seconds.'))
@@ -0,0 +1,36 @@
+from datetime import timedelta
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils.timezone import now
+
+from Accounts.models import OutboundEmail
+
+
+class Command(BaseCommand):
+    """
+    delete the sent and failed emails of the outbox that are older than EMAIL_OUTBOX_KEEP_DAYS (or --days),
+    in batches. the pending and sending emails are kept.
+    this command is meant to be run periodically (for example by cron once a day).
+    """
+
+    help = 'Delete old sent and failed outbound emails in batches.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=None,
+                            help='Keep the emails of the last days (default: EMAIL_OUTBOX_KEEP_DAYS).')
+        parser.add_argument('--batch-size', type=int, default=5000,
+                            help='Number of emails that are deleted in each batch.')
+
+    def handle(self, *args, **options):
+        cutoff = now() - timedelta(days=options['days'] or settings.EMAIL_OUTBOX_KEEP_DAYS)
+        old = OutboundEmail.objects.filter(status__in=('sent', 'failed'), created_at__lt=cutoff).order_by()
+        deleted = 0
+
+        while True:
+            ids = list(old.values_list('id', flat=True)[:options['batch_size']])
+            if not ids:
+                break
+            OutboundEmail.objects.filter(id__in=ids).delete()
+            deleted += len(ids)
+
+        self.stdout.write(self.style.SUCCESS(f'{deleted} outbound emails deleted.'))
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+from rest_framework_simplejwt.utils import aware_utcnow
+
+from Accounts.blacklist import token_blacklist_filter
+
+
+class Command(BaseCommand):
+    """
+    delete the expired outstanding tokens (and their blacklist records) in batches.
+    expired tokens are rejected by their exp claim, so they don't need to stay in the blacklist.
+    this command is meant to be run periodically (for example by cron once a day).
+    """
+
+    help = 'Delete expired outstanding and blacklisted tokens in batches.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000,
+                            help='Number of tokens that are deleted in each batch.')
+
+    def handle(self, *args, **options):
+        expired = OutstandingToken.objects.filter(expires_at__lte=aware_utcnow()).order_by()
+        deleted = 0
+
+        while True:
+            ids = list(expired.values_list('id', flat=True)[:options['batch_size']])
+            if not ids:
+                break
+            OutstandingToken.objects.filter(id__in=ids).delete()
+            deleted += len(ids)
+
+        token_blacklist_filter.reset()
+        self.stdout.write(self.style.SUCCESS(f'{deleted} expired tokens deleted.'))
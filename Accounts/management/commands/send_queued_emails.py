@@ -0,0 +1,33 @@
+import time
+from django.core.management.base import BaseCommand
+
+from Accounts.mail import send_queued_mail
+
+
+class Command(BaseCommand):
+    """
+    email worker: send the queued emails in batches over one SMTP connection per batch.
+    run it once (for example by cron) or keep it running with --loop.
+    """
+
+    help = 'Send queued outbound emails.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=None,
+                            help='Number of emails sent in each batch (default: EMAIL_OUTBOX_BATCH_SIZE).')
+        parser.add_argument('--loop', action='store_true',
+                            help='Keep running and check the queue every --interval seconds.')
+        parser.add_argument('--interval', type=float, default=5,
+                            help='Seconds to wait when the queue is empty (with --loop).')
+
+    def handle(self, *args, **options):
+        while True:
+            result = send_queued_mail(batch_size=options['batch_size'])
+            if any(result.values()):
+                self.stdout.write(self.style.SUCCESS(
+                    f"sent: {result['sent']}, retried: {result['retried']}, failed: {result['failed']}"))
+
+            if not options['loop']:
+                break
+            if not any(result.values()):
+                time.sleep(options['interval'])
@@ -1,5 +1,7 @@
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin
 from django.db import models
+from django.utils.timezone import now
+from ProjectManagement.images import ProcessedImageField
 from .managers import CustomUserManager
 
 
@@ -20,7 +22,7 @@ class CustomUser(AbstractBaseUser, PermissionsMixin):
     phone_number = models.CharField(max_length=11, unique=True)
     email = models.EmailField(unique=True)
     gender = models.CharField(choices=GENDER_OPTIONS, max_length=6)
-    image = models.ImageField(default='accounts/profile/default/default_profile_picture.jpg',
+    image = ProcessedImageField(default='accounts/profile/default/default_profile_picture.jpg',
                               upload_to='accounts/profile')
     created_at = models.DateTimeField(auto_now_add=True)
 
@@ -34,3 +36,48 @@ class CustomUser(AbstractBaseUser, PermissionsMixin):
 
     def __str__(self):
         return f'{self.first_name} {self.last_name}'
+
+
+class OutboundEmail(models.Model):
+    """
+    outbound email model stores the emails that are waiting to be sent by the email worker
+    (send_queued_emails command), so requests don't wait for the SMTP server.
+    if sending fails, the email is retried later (with growing delay) until the max attempts.
+    kind -> message: the body is sent as it is
+            password_reset: the reset link of the user is built when the email is sent (Accounts/mail.py),
+            so the uid and token are never stored, base_url is the address of the site that the user used
+    the body is cleared after the email is sent (prune_outbound_emails deletes the old sent and failed emails).
+    """
+
+    KIND_OPTIONS = (
+        ('message', 'Message'),
+        ('password_reset', 'Password Reset'),
+    )
+
+    STATUS_OPTIONS = (
+        ('pending', 'Pending'),
+        ('sending', 'Sending'),
+        ('sent', 'Sent'),
+        ('failed', 'Failed'),
+    )
+
+    kind = models.CharField(choices=KIND_OPTIONS, max_length=14, default='message')
+    subject = models.CharField(max_length=255)
+    body = models.TextField(blank=True)
+    user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, null=True, blank=True, related_name='+')
+    base_url = models.CharField(max_length=255, blank=True)
+    from_email = models.CharField(max_length=255)
+    recipients = models.JSONField(default=list)
+    status = models.CharField(choices=STATUS_OPTIONS, max_length=7, default='pending')
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=now)
+    last_error = models.TextField(blank=True)
+    lock_id = models.UUIDField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [models.Index(fields=['status', 'next_attempt_at'])]
+
+    def __str__(self):
+        return self.subject
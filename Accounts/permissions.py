@@ -0,0 +1,19 @@
+from rest_framework import permissions
+
+from .workload import team_members
+
+
+class CanSeeWorkload(permissions.BasePermission):
+    """
+    custom permission to see the workload of a user.
+    method -> GET: the user, staff users, and the project CEOs and task managers the user works under
+              (who assign the work), org-wide: staff users, project CEOs and task managers
+              (only the users that work under them are shown)
+    """
+    def has_permission(self, request, view):
+        user = request.user
+        if user.pk == view.kwargs.get('pk') or user.is_staff:
+            return True
+        if 'pk' in view.kwargs:
+            return team_members(user).filter(id=view.kwargs['pk']).exists()
+        return user.project_ceo.exists() or user.task_manager.exists()
@@ -0,0 +1,97 @@
+import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+
+from .hashers import map_hashing
+from .models import CustomUser
+
+
+def _setup_hashing_process(settings_module):
+    """
+    prepare a new worker process of the hashing pool (it needs the same settings to use the same hashers).
+    """
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
+    import django
+    django.setup()
+
+
+def hashing_pool(workers=None):
+    """
+    return a process pool for hashing passwords (USER_PROVISIONING_WORKERS processes, or one per core),
+    for the provision_users command: every process imports the project, so it is not started by web requests.
+    spawn (not fork) is used, so the pool doesn't copy the threads and connections of the command.
+    """
+    workers = workers or settings.USER_PROVISIONING_WORKERS or os.cpu_count() or 1
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'),
+                               initializer=_setup_hashing_process,
+                               initargs=(os.environ.get('DJANGO_SETTINGS_MODULE', 'ProjectManagement.settings'),))
+
+
+def hash_passwords(passwords, pool=None):
+    """
+    hash the given passwords and return the hashes in the same order: in the given process pool
+    (provision_users command), otherwise in the hashing thread pool of the process (Accounts/hashers.py).
+    an empty password gets an unusable hash (without any hashing cost), so those users must reset their password.
+    """
+    hashes = [None if password else make_password(None) for password in passwords]
+    pending = [(index, password) for index, password in enumerate(passwords) if password]
+
+    if pool is None:
+        results = map_hashing(make_password, [password for _index, password in pending])
+    else:
+        chunksize = max(len(pending) // ((os.cpu_count() or 1) * 4), 1)
+        results = pool.map(make_password, [password for _index, password in pending], chunksize=chunksize)
+    for (index, _password), encoded in zip(pending, results):
+        hashes[index] = encoded
+    return hashes
+
+
+def find_conflicts(rows):
+    """
+    check the emails and phone numbers of the rows against each other and against the database
+    (two queries for the whole batch).
+    return a list with an error dictionary for each row (empty if the row is valid).
+    """
+    emails = [CustomUser.objects.normalize_email(row['email']) for row in rows]
+    phone_numbers = [row['phone_number'] for row in rows]
+    existing_emails = set(CustomUser.objects.filter(email__in=set(emails)).values_list('email', flat=True))
+    existing_phone_numbers = set(CustomUser.objects.filter(phone_number__in=set(phone_numbers))
+                                 .values_list('phone_number', flat=True))
+
+    errors = []
+    seen_emails, seen_phone_numbers = set(), set()
+    for email, phone_number in zip(emails, phone_numbers):
+        row_errors = {}
+        if email in existing_emails:
+            row_errors['email'] = ['Email already exists. try another one!']
+        elif email in seen_emails:
+            row_errors['email'] = ['Email is repeated in this batch.']
+        if phone_number in existing_phone_numbers:
+            row_errors['phone_number'] = ['Phone number already exists. try another one!']
+        elif phone_number in seen_phone_numbers:
+            row_errors['phone_number'] = ['Phone number is repeated in this batch.']
+        seen_emails.add(email)
+        seen_phone_numbers.add(phone_number)
+        errors.append(row_errors)
+    return errors
+
+
+def provision_users(rows, batch_size=1000, pool=None):
+    """
+    create users from a list of validated rows (dictionaries of CustomUser fields and a password).
+    the passwords are hashed in the given process pool or in the hashing thread pool (hash_passwords)
+    and the users are inserted by bulk_create in one transaction.
+    the rows must be checked by find_conflicts first; a row that still conflicts makes the whole batch fail.
+    return the created users.
+    """
+    passwords = hash_passwords([row.get('password') for row in rows], pool=pool)
+    users = [CustomUser(**{field: value for field, value in row.items() if field != 'password'}, password=encoded)
+             for row, encoded in zip(rows, passwords)]
+    for user in users:
+        user.email = CustomUser.objects.normalize_email(user.email)
+
+    with transaction.atomic():
+        return CustomUser.objects.bulk_create(users, batch_size=batch_size)
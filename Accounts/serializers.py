@@ -2,7 +2,14 @@ from rest_framework import serializers
 from .models import CustomUser
 from django.contrib.auth.hashers import make_password
 from django.contrib.auth.password_validation import validate_password
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer as BaseTokenRefreshSerializer
+from .blacklist import RefreshToken
+from .hashers import run_hashing
+from .provisioning import find_conflicts, provision_users
+from django.conf import settings
+from django.utils.timezone import now
+from datetime import timedelta
+from ProjectManagement.images import ThumbnailImageField
 
 
 def clean_email(value):
@@ -14,14 +21,22 @@ def clean_email(value):
         raise serializers.ValidationError({'Error': 'Email already exists. try another one!'})
 
 
-def clean_phone_number(value):
+def clean_phone_length(value):
     """
-    check if the phone number is 11 digits and unique, if it's not(already exists in the database, raise an error)
+    check if the phone number is 11 digits, if it's not raise an error
     """
 
     if len(value) < 11:
         raise serializers.ValidationError('Phone number must be 11 digits')
 
+
+def clean_phone_number(value):
+    """
+    check if the phone number is 11 digits and unique, if it's not(already exists in the database, raise an error)
+    """
+
+    clean_phone_length(value)
+
     if CustomUser.objects.filter(phone_number=value).exists():
         raise serializers.ValidationError({'Error': 'Phone number already exists. try another one!'})
 
@@ -32,6 +47,8 @@ class UserRegisterSerializer(serializers.ModelSerializer):
     include validation on email and phone number fields and hashes the password.
     """
 
+    image = ThumbnailImageField(required=False)
+
     class Meta:
         model = CustomUser
         fields = ('first_name', 'last_name', 'phone_number', 'email', 'gender', 'image', 'password')
@@ -42,14 +59,112 @@ class UserRegisterSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         """
-        override this method to hash the password and then create user in database.
+        override this method to hash the password (in the hashing pool) and then create user in database.
         """
 
         password = validated_data.get('password')
-        validated_data['password'] = make_password(password)
+        validated_data['password'] = run_hashing(make_password, password)
         return super().create(validated_data)
 
 
+class BulkUserListSerializer(serializers.ListSerializer):
+    """
+    list serializer for provisioning many users at once.
+    the uniqueness of emails and phone numbers is checked for the whole list by two queries.
+    """
+
+    def to_internal_value(self, data):
+        """
+        override this method to check the emails and phone numbers of all users together
+        and raise the errors of each user in its position.
+        """
+
+        if isinstance(data, list) and len(data) > settings.USER_PROVISIONING_MAX_BATCH:
+            raise serializers.ValidationError(
+                {'Error': f'At most {settings.USER_PROVISIONING_MAX_BATCH} users can be created at once.'})
+
+        attrs = super().to_internal_value(data)
+        errors = find_conflicts(attrs)
+        if any(errors):
+            raise serializers.ValidationError(errors)
+        return attrs
+
+    def create(self, validated_data):
+        """
+        override this method to hash the passwords and insert all users by bulk_create.
+        a process pool can be passed in the context (hashing_pool, provision_users command),
+        otherwise the hashing thread pool of the process is used.
+        """
+
+        return provision_users(validated_data, pool=self.context.get('hashing_pool'))
+
+
+class BulkUserSerializer(serializers.ModelSerializer):
+    """
+    serialize data of one user in bulk provisioning.
+    email and phone number are checked by the list serializer (not one query per user).
+    the password is optional, users without password get an unusable one and must reset it.
+    """
+
+    class Meta:
+        model = CustomUser
+        fields = ('id', 'first_name', 'last_name', 'phone_number', 'email', 'gender', 'password')
+        read_only_fields = ('id',)
+        list_serializer_class = BulkUserListSerializer
+        extra_kwargs = {'password': {'write_only': True, 'required': False,
+                                     'validators': (validate_password,)},
+                        'email': {'validators': ()},
+                        'phone_number': {'validators': (clean_phone_length,)}, }
+
+
+
+
+class UserSearchQuerySerializer(serializers.Serializer):
+    """
+    serialize the query params of user search.
+    q -> the beginning of the first name, last name, email or phone number (each word of it separately).
+    """
+
+    q = serializers.CharField(required=True, max_length=100)
+    limit = serializers.IntegerField(required=False, min_value=1, max_value=settings.USER_SEARCH_MAX_LIMIT,
+                                     default=settings.USER_SEARCH_LIMIT)
+
+
+class WorkloadQuerySerializer(serializers.Serializer):
+    """
+    serialize the query params of workload.
+    from, to -> the date range (default: today until 30 days later, 366 days at most)
+    bucket -> show the peak assignments of each day or week
+    overallocated -> (org-wide workload) only the users with overallocations
+    """
+    from_date = serializers.DateField(required=False, allow_null=True)
+    to_date = serializers.DateField(required=False, allow_null=True)
+    bucket = serializers.ChoiceField(choices=('day', 'week'), default='day')
+    overallocated = serializers.BooleanField(default=False)
+
+    def validate(self, attrs):
+        from_date = attrs.get('from_date') or now().date()
+        to_date = attrs.get('to_date') or from_date + timedelta(days=30)
+
+        if from_date > to_date:
+            raise serializers.ValidationError({'Error': 'from date cannot be greater than to date.'})
+
+        if (to_date - from_date).days > 366:
+            raise serializers.ValidationError({'Error': 'The date range cannot be longer than 366 days.'})
+
+        attrs['from_date'] = from_date
+        attrs['to_date'] = to_date
+        return attrs
+
+
+class UserSearchSerializer(serializers.ModelSerializer):
+    """
+    serializes the users found by search (for expert and manager pickers).
+    """
+
+    class Meta:
+        model = CustomUser
+        fields = ('id', 'first_name', 'last_name', 'email')
 
 
 class UserLogoutSerializer(serializers.Serializer):
@@ -74,6 +189,15 @@ class UserLogoutSerializer(serializers.Serializer):
         return attrs
 
 
+class TokenRefreshSerializer(BaseTokenRefreshSerializer):
+    """
+    serializes data for refreshing the access token.
+    uses the refresh token class that checks the blacklist by bloom filter.
+    """
+
+    token_class = RefreshToken
+
+
 
 class UserProfileDetailSerializer(serializers.ModelSerializer):
     """
@@ -81,6 +205,8 @@ class UserProfileDetailSerializer(serializers.ModelSerializer):
     phone number and email cannot be changed by user.
     """
 
+    image = ThumbnailImageField(required=False)
+
     class Meta:
         model = CustomUser
         fields = ('id', 'first_name', 'last_name', 'phone_number', 'email', 'gender', 'image')
@@ -122,7 +248,7 @@ class UserPasswordResetConfirmSerializer(serializers.Serializer):
         override this method to update password for the user instance.
         """
         user.set_password(self.validated_data.get('new_password'))
-        user.save()
+        user.save(update_fields=['password'])
         return user
 
 
@@ -153,5 +279,5 @@ class UserChangePasswordSerializer(serializers.Serializer):
         """
 
         user.set_password(self.validated_data.get('new_password'))
-        user.save()
+        user.save(update_fields=['password'])
         return user
\ No newline at end of file
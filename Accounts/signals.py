@@ -0,0 +1,49 @@
+import logging
+from django.conf import settings
+from django.db import connections, transaction, DatabaseError
+from django.db.models.signals import post_save, post_delete
+from .models import CustomUser
+from .authentication import invalidate_cached_user
+from ProjectManagement.indexes import create_prefix_indexes
+
+logger = logging.getLogger(__name__)
+
+
+def invalidate_authenticated_user(sender, instance, **kwargs):
+    """
+    this method removes the saved or deleted user from the authentication cache,
+    so the next request of the user loads the new information (password, active status, ...).
+    it is removed again after the commit: a request that read the old row before the commit may have cached it.
+    """
+    user_id = instance.pk
+    invalidate_cached_user(user_id)
+    transaction.on_commit(lambda: invalidate_cached_user(user_id), using=kwargs.get('using'))
+
+
+post_save.connect(receiver=invalidate_authenticated_user, sender=CustomUser)
+post_delete.connect(receiver=invalidate_authenticated_user, sender=CustomUser)
+
+
+def create_user_search_indexes(sender, using='default', **kwargs):
+    """
+    this method creates the indexes of user search on PostgreSQL after migrate.
+    the search uses UPPER(column) LIKE 'PREFIX%' (istartswith), so the indexes are on UPPER(column)
+    with varchar_pattern_ops (the phone number is matched case-sensitively by the like index django creates itself).
+    with USER_SEARCH_TRIGRAM, trigram (gin_trgm_ops) indexes are created too, for matching anywhere in the text.
+    """
+    columns = ('first_name', 'last_name', 'email')
+    create_prefix_indexes(using, CustomUser, columns)
+
+    connection = connections[using]
+    if connection.vendor != 'postgresql' or not settings.USER_SEARCH_TRIGRAM:
+        return
+
+    table = connection.ops.quote_name(CustomUser._meta.db_table)
+    try:
+        with transaction.atomic(using=using), connection.cursor() as cursor:
+            cursor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+            for column in columns:
+                cursor.execute(f'CREATE INDEX IF NOT EXISTS "accounts_user_{column}_trgm" '
+                               f'ON {table} USING gin (UPPER("{column}"::text) gin_trgm_ops)')
+    except DatabaseError as e:
+        logger.warning('trigram indexes of user search are not created: %s', e)
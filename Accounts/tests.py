@@ -1,3 +1,64 @@
+from datetime import date
 from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from Projects.models import Project, Task
+from .models import CustomUser
+from .workload import assignment_intervals, workload
+
+
+def create_user(number):
+    return CustomUser.objects.create_user(phone_number=f'0912{number:07d}', email=f'user{number}@example.com',
+                                          password='pass12345!', first_name=f'First{number}',
+                                          last_name=f'Last{number}')
+
+
+class WorkloadTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.ceo, cls.manager, cls.other_ceo = create_user(1), create_user(2), create_user(3)
+        cls.project = Project.objects.create(title='project', ceo=cls.ceo, description='-', category='red',
+                                             start_date=date(2030, 1, 1), end_date=date(2030, 12, 31))
+        Project.objects.create(title='other project', ceo=cls.other_ceo, description='-', category='red')
+        Task.objects.create(title='task', project=cls.project, manager=cls.manager, description='-',
+                            category='red', start_date=date(2030, 1, 1), end_date=date(2030, 1, 31))
+        Task.objects.create(title='done early', project=cls.project, manager=cls.manager, description='-',
+                            category='red', start_date=date(2030, 1, 20), end_date=date(2030, 1, 31),
+                            status='completed', completion_date=date(2030, 1, 10))
+
+    def test_completed_before_start(self):
+        """
+        a task completed before its start date has no interval, so it doesn't cancel out another assignment.
+        """
+        from_date, to_date = date(2030, 1, 1), date(2030, 1, 31)
+        intervals = assignment_intervals(from_date, to_date, user_id=self.manager.pk)[self.manager.pk]
+        self.assertEqual(intervals, [(from_date, to_date)])
+
+        buckets = workload(intervals, from_date, to_date, 'day', 3)['buckets']
+        self.assertTrue(all(bucket['assignments'] == 1 for bucket in buckets))
+
+    def test_user_workload_permission(self):
+        """
+        a project CEO sees the workload of the users that work under them, not of the other users.
+        """
+        client = APIClient()
+        url = reverse('accounts:user_workload', kwargs={'pk': self.manager.pk})
+
+        client.force_authenticate(self.ceo)
+        self.assertEqual(client.get(url).status_code, 200)
+        client.force_authenticate(self.other_ceo)
+        self.assertEqual(client.get(url).status_code, 403)
+
+    def test_workload_team(self):
+        """
+        the org-wide workload of a project CEO only has the users that work under them.
+        """
+        client = APIClient()
+        url = reverse('accounts:workload') + '?from=2030-01-01&to=2030-01-31'
+
+        client.force_authenticate(self.ceo)
+        self.assertEqual([result['user']['id'] for result in client.get(url).data['results']], [self.manager.pk])
+        client.force_authenticate(self.other_ceo)
+        self.assertEqual(client.get(url).data['results'], [])
@@ -6,6 +6,10 @@ app_name = 'accounts'
 
 urlpatterns = [
     path('register/', views.UserRegistrationView.as_view(), name='user_register'),
+    path('users/search/', views.UserSearchView.as_view(), name='user_search'),
+    path('users/bulk/', views.UserBulkCreateView.as_view(), name='user_bulk_create'),
+    path('users/workload/', views.WorkloadView.as_view(), name='workload'),
+    path('users/<int:pk>/workload/', views.UserWorkloadView.as_view(), name='user_workload'),
     path('login/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
     path('login/refresh-token/', TokenRefreshView.as_view(), name='token_refresh'),
     path('logout/', views.UserLogoutView.as_view(), name='user_logout'),
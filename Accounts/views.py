@@ -1,17 +1,19 @@
-from django.shortcuts import render
+from django.shortcuts import render, get_object_or_404
 from rest_framework import generics
 from rest_framework.views import APIView
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework import permissions
 from django.contrib.auth.tokens import default_token_generator
-from django.utils.http import urlsafe_base64_encode, urlsafe_base64_decode
-from django.utils.encoding import force_bytes
-from django.core.mail import send_mail
-from django.urls import reverse
+from django.utils.http import urlsafe_base64_decode
+from django.urls import get_script_prefix
+from django.db.models import Q
 
 from . import serializers
 from .models import CustomUser
+from .permissions import CanSeeWorkload
+from .workload import assignment_intervals, team_members, workload
+from .mail import enqueue_password_reset
 from django.conf import settings
 
 
@@ -32,6 +34,134 @@ class UserRegistrationView(generics.CreateAPIView):
         serializer.save()
 
 
+class UserBulkCreateView(generics.CreateAPIView):
+    """
+    This view is used to create many users at once (onboarding).
+    it gets a list of users and if all of them are valid, creates them together.
+    permission ->  Only staff users
+    """
+
+    permission_classes = (permissions.IsAdminUser,)
+
+    serializer_class = serializers.BulkUserSerializer
+
+    def create(self, request, *args, **kwargs):
+        """
+        this method passes the list of users to the serializer and if all of them are valid,
+        creates them (passwords hashed in the hashing thread pool, one bulk insert) and shows the created users.
+        """
+
+        if not isinstance(request.data, list):
+            return Response(data={'Error': 'A list of users is required.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        serializer = self.get_serializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return Response(data={'detail': f'{len(serializer.data)} users created', 'users': serializer.data},
+                        status=status.HTTP_201_CREATED)
+
+
+class UserSearchView(generics.ListAPIView):
+    """
+    This view is used to find users by the beginning of their name, email or phone number.
+    each word of the query must match the start of one of those fields, and the first N users are returned.
+    the prefix lookups use the UPPER(...) varchar_pattern_ops indexes on PostgreSQL
+    (with USER_SEARCH_TRIGRAM, names and emails match anywhere by trigram indexes).
+    permission ->  Only authenticated users
+    """
+
+    permission_classes = (permissions.IsAuthenticated,)
+
+    serializer_class = serializers.UserSearchSerializer
+
+    def get_queryset(self):
+        """
+        this method builds the search query from the q param and returns the first `limit` active users.
+        """
+
+        query_serializer = serializers.UserSearchQuerySerializer(data=self.request.query_params)
+        query_serializer.is_valid(raise_exception=True)
+        terms = query_serializer.validated_data['q'].split()[:3]
+
+        lookup = 'icontains' if settings.USER_SEARCH_TRIGRAM else 'istartswith'
+        condition = Q()
+        for term in terms:
+            condition &= (Q(**{f'first_name__{lookup}': term}) | Q(**{f'last_name__{lookup}': term}) |
+                          Q(**{f'email__{lookup}': term}) | Q(phone_number__startswith=term))
+
+        return (CustomUser.objects.filter(condition, is_active=True)
+                .only('id', 'first_name', 'last_name', 'email')
+                .order_by('first_name', 'last_name', 'id')[:query_serializer.validated_data['limit']])
+
+
+class UserWorkloadView(APIView):
+    """
+    This view shows the workload of a user in a date range: the peak number of active assignments
+    (task/subtask manager, project/task/subtask expert) of each day or week and the overallocated periods
+    (more than WORKLOAD_MAX_ASSIGNMENTS active assignments).
+    query params -> from, to, bucket (day or week)
+    permission -> authenticated users: the user, staff users, and the project CEOs and task managers
+                  the user works under
+    """
+
+    permission_classes = (permissions.IsAuthenticated, CanSeeWorkload)
+
+    def get(self, request, *args, **kwargs):
+        """
+        this method reads the user's assignments in the range (five queries) and sweeps their date ranges.
+        """
+        user = get_object_or_404(CustomUser, pk=kwargs['pk'])
+        query_serializer = serializers.WorkloadQuerySerializer(data={
+            **request.query_params.dict(), 'from_date': request.query_params.get('from'),
+            'to_date': request.query_params.get('to')})
+        query_serializer.is_valid(raise_exception=True)
+        from_date, to_date, bucket = (query_serializer.validated_data[key] for key in ('from_date', 'to_date', 'bucket'))
+
+        intervals = assignment_intervals(from_date, to_date, user_id=user.pk).get(user.pk, [])
+        data = {'user': serializers.UserSearchSerializer(user).data, 'from_date': from_date, 'to_date': to_date,
+                'bucket': bucket, 'max_assignments': settings.WORKLOAD_MAX_ASSIGNMENTS,
+                **workload(intervals, from_date, to_date, bucket, settings.WORKLOAD_MAX_ASSIGNMENTS)}
+        return Response(data=data, status=status.HTTP_200_OK)
+
+
+class WorkloadView(APIView):
+    """
+    This view shows the workload of every user that has assignments in a date range (org-wide),
+    the most loaded users first.
+    query params -> from, to, bucket (day or week), overallocated (only the overallocated users)
+    permission -> authenticated users: staff users (every user), project CEOs and task managers
+                  (the users that work under them)
+    """
+
+    permission_classes = (permissions.IsAuthenticated, CanSeeWorkload)
+
+    def get(self, request, *args, **kwargs):
+        """
+        this method reads all the assignments in the range (five queries), sweeps the date ranges of each user
+        and reads the users in one more query.
+        non-staff users only get the users that work under them (team_members).
+        """
+        query_serializer = serializers.WorkloadQuerySerializer(data={
+            **request.query_params.dict(), 'from_date': request.query_params.get('from'),
+            'to_date': request.query_params.get('to')})
+        query_serializer.is_valid(raise_exception=True)
+        from_date, to_date, bucket = (query_serializer.validated_data[key] for key in ('from_date', 'to_date', 'bucket'))
+        max_assignments = settings.WORKLOAD_MAX_ASSIGNMENTS
+
+        users = None if request.user.is_staff else team_members(request.user)
+        loads = {user_id: workload(intervals, from_date, to_date, bucket, max_assignments)
+                 for user_id, intervals in assignment_intervals(from_date, to_date, users=users).items()}
+        if query_serializer.validated_data['overallocated']:
+            loads = {user_id: load for user_id, load in loads.items() if load['overallocations']}
+
+        users = CustomUser.objects.filter(pk__in=loads).only('id', 'first_name', 'last_name', 'email')
+        results = [{'user': serializers.UserSearchSerializer(user).data, **loads[user.pk]} for user in users]
+        results.sort(key=lambda result: (-result['peak'], result['user']['id']))
+
+        return Response(data={'from_date': from_date, 'to_date': to_date, 'bucket': bucket,
+                              'max_assignments': max_assignments, 'results': results}, status=status.HTTP_200_OK)
+
+
 class UserLogoutView(APIView):
     """
     This view is used to user logout by refresh token.
@@ -65,23 +195,22 @@ class UserProfileDetailUpdateView(APIView):
 
     def get(self, request, *args, **kwargs):
         """
-        this method gets the authenticated user's email and retrieve another information from database
-        and passes it to serializer
+        this method passes the authenticated user to serializer
         """
 
-        user = CustomUser.objects.get(email=request.user.email)
-        user_ser_data = self.serializer_class(instance=user)
+        user_ser_data = self.serializer_class(instance=request.user)
 
         return Response(data={'user_information': user_ser_data.data}, status=status.HTTP_200_OK)
 
     def put(self, request, *args, **kwargs):
         """
-        this method gets the authenticated user's email and retrieve another information from database
-        with new changes that provided by user and passes it to serializer
+        this method passes the authenticated user with new changes that provided by user to serializer
         if the data is valid, save them into database and show new information.
+        request.user may come from the authentication cache, so the user is read again from the database
+        and the save doesn't write old values over a concurrent change (password, active status).
         """
 
-        user = CustomUser.objects.get(email=request.user.email)
+        user = CustomUser.objects.get(pk=request.user.pk)
         user_ser_data = self.serializer_class(instance=user, data=request.data, partial=True)
 
         if user_ser_data.is_valid(raise_exception=True):
@@ -100,8 +229,9 @@ class UserPasswordResetView(generics.GenericAPIView):
     def post(self, request):
         """
         this method gets the user's email and passes it to serializer
-        if the data is valid, retrieve user from database and create token and uid for it.
-        create an url and send it via email that user can set new password.
+        if the data is valid, retrieve user from database and queue a password reset email for it
+        (the email is sent by the email worker, not in this request; the worker creates the token and uid
+        and the url that user can set new password with, so they are not stored in the outbox).
         """
 
         serializer = self.serializer_class(data=request.data)
@@ -110,16 +240,7 @@ class UserPasswordResetView(generics.GenericAPIView):
         user = CustomUser.objects.get(email=email)
 
         if user:
-            token = default_token_generator.make_token(user)
-            uid = urlsafe_base64_encode(force_bytes(user.pk))
-            reset_url = request.build_absolute_uri(
-                reverse(viewname='accounts:password_reset_confirm', kwargs={'uidb64': uid, 'token': token})
-            )
-            send_mail(subject='Password Reset Request of Project Manager',
-                      message=f'Click the link below to reset your password: {reset_url}',
-                      from_email=f'{settings.DEFAULT_FROM_EMAIL}',
-                      recipient_list=[user.email],
-                      fail_silently=False, )
+            enqueue_password_reset(user, base_url=request.build_absolute_uri(get_script_prefix()))
         return Response(data={'detail': 'Password reset link has been sent'}, status=status.HTTP_200_OK)
 
 
@@ -164,13 +285,14 @@ class UserChangePasswordView(APIView):
         this method gets the data token and pass it to the serializer and
         if the data is valid, check that old input password is match with user password
         then update the password in database.
+        the user is read again from the database (request.user may come from the authentication cache).
         """
 
         serializer = self.serializer_class(data=request.data)
 
         if serializer.is_valid(raise_exception=True):
             old_password = request.data.get('old_password')
-            user = CustomUser.objects.get(email=request.user.email)
+            user = CustomUser.objects.get(pk=request.user.pk)
             if user.check_password(old_password):
                 serializer.save(user)
                 return Response(data={'detail': 'user password updated!'}, status=status.HTTP_200_OK)
@@ -0,0 +1,118 @@
+from collections import defaultdict
+from datetime import timedelta
+from django.db.models import Q
+
+from Projects.models import Project, Task, SubTask
+from .models import CustomUser
+
+
+def team_members(user):
+    """
+    return the ids of the users that work under the user (a queryset, to use as a subquery):
+    the experts, task managers and subtask managers of the projects where the user is the CEO,
+    and the experts and subtask managers of the tasks that the user manages.
+    """
+    tasks = Task.objects.filter(Q(project__ceo=user) | Q(manager=user))
+    subtasks = SubTask.objects.filter(Q(task__project__ceo=user) | Q(task__manager=user))
+    return CustomUser.objects.filter(
+        Q(pk__in=Project.experts.through.objects.filter(project__ceo=user).values('customuser_id')) |
+        Q(pk__in=Task.objects.filter(project__ceo=user).values('manager_id')) |
+        Q(pk__in=Task.experts.through.objects.filter(task__in=tasks).values('customuser_id')) |
+        Q(pk__in=subtasks.values('manager_id')) |
+        Q(pk__in=SubTask.experts.through.objects.filter(subtask__in=subtasks).values('customuser_id'))
+    ).values('id')
+
+
+def assignment_intervals(from_date, to_date, user_id=None, users=None):
+    """
+    return {user id: [(start date, end date), ...]} of the assignments that overlap the date range:
+    task and subtask managers, and project, task and subtask experts (read from the through tables).
+    a completed item counts until its completion date, items without dates are not scheduled work,
+    and an item completed before its start date (or before the range) has no interval.
+    five queries of plain values, whatever the number of users and assignments.
+    user_id, users (a queryset of user ids) -> only the assignments of these users
+    """
+    sources = []
+    for model in (Task, SubTask):
+        sources.append((model.objects, 'manager_id', ''))
+    for model in (Project, Task, SubTask):
+        sources.append((model.experts.through.objects, 'customuser_id', f'{model._meta.model_name}__'))
+
+    intervals = defaultdict(list)
+    for manager, user_field, prefix in sources:
+        rows = manager.filter(**{f'{prefix}start_date__lte': to_date, f'{prefix}end_date__gte': from_date})
+        if user_id is not None:
+            rows = rows.filter(**{user_field: user_id})
+        if users is not None:
+            rows = rows.filter(**{f'{user_field}__in': users})
+        rows = rows.exclude(Q(**{f'{prefix}status': 'completed', f'{prefix}completion_date__lt': from_date}))
+        for user, start_date, end_date, status, completion_date in rows.values_list(
+                user_field, f'{prefix}start_date', f'{prefix}end_date', f'{prefix}status', f'{prefix}completion_date'):
+            if status == 'completed' and completion_date and completion_date < end_date:
+                end_date = completion_date
+            start_date, end_date = max(start_date, from_date), min(end_date, to_date)
+            if end_date < start_date:
+                continue
+            intervals[user].append((start_date, end_date))
+    return intervals
+
+
+def sweep(intervals):
+    """
+    return the segments [(first day, last day, active assignments), ...] of the intervals (inclusive dates)
+    by a sweep over their sorted endpoints: O(n log n) instead of comparing every day with every interval.
+    the days without assignments are not in the segments.
+    """
+    deltas = defaultdict(int)
+    for start_date, end_date in intervals:
+        deltas[start_date] += 1
+        deltas[end_date + timedelta(days=1)] -= 1
+
+    segments = []
+    active = 0
+    points = sorted(deltas)
+    for point, next_point in zip(points, points[1:]):
+        active += deltas[point]
+        if not active:
+            continue
+        if segments and segments[-1][2] == active and segments[-1][1] == point - timedelta(days=1):
+            # an assignment ends the day before another one starts, the count doesn't change
+            segments[-1] = (segments[-1][0], next_point - timedelta(days=1), active)
+        else:
+            segments.append((point, next_point - timedelta(days=1), active))
+    return segments
+
+
+def bucket_start(day, bucket):
+    return day - timedelta(days=day.weekday()) if bucket == 'week' else day
+
+
+def workload(intervals, from_date, to_date, bucket, max_assignments):
+    """
+    return the workload of one user from their assignment intervals:
+    the peak active assignments of each day or week (bucket) of the range and the periods with more than
+    max_assignments active assignments (overallocations).
+    """
+    segments = sweep(intervals)
+
+    peaks = {}
+    for first_day, last_day, active in segments:
+        start = bucket_start(first_day, bucket)
+        step = timedelta(days=7 if bucket == 'week' else 1)
+        while start <= last_day:
+            peaks[start] = max(peaks.get(start, 0), active)
+            start += step
+
+    buckets = []
+    start, step = bucket_start(from_date, bucket), timedelta(days=7 if bucket == 'week' else 1)
+    while start <= to_date:
+        buckets.append({'start': start, 'assignments': peaks.get(start, 0)})
+        start += step
+
+    return {
+        'peak': max((active for _first, _last, active in segments), default=0),
+        'assignments': len(intervals),
+        'overallocations': [{'from_date': first_day, 'to_date': last_day, 'assignments': active}
+                            for first_day, last_day, active in segments if active > max_assignments],
+        'buckets': buckets,
+    }
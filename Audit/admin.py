@@ -0,0 +1,29 @@
+from django.contrib import admin
+from .models import AuditEvent
+from ProjectManagement.paginators import EstimatedCountPaginator
+
+
+class AuditEventAdmin(admin.ModelAdmin):
+    """
+    show audit event instances in admin panel (read only, the events are append-only).
+    filter by -> object type, field
+    the list shows estimated counts, the event table only grows.
+    """
+
+    list_display = ('object_type', 'object_id', 'field', 'old_value', 'new_value', 'user', 'created_at')
+    list_select_related = ('user',)
+    list_filter = ('object_type', 'field')
+    raw_id_fields = ('user',)
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+admin.site.register(AuditEvent, AuditEventAdmin)
@@ -0,0 +1,42 @@
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.utils.timezone import now
+from Accounts.models import CustomUser
+
+
+class AuditEvent(models.Model):
+    """
+    audit event model stores one change of an audited field (status, budget, price, ...) of a project, task,
+    subtask or financial record. the events are only added (append-only), never changed.
+    object type -> the model name of the changed object (project, task, financialoutcomerecord, ...)
+    old value, new value -> the values of the field before and after the change (old value is null on create)
+    user -> the user of the request that made the change (null for background jobs)
+    the indexes serve the queries of the audit api: by object, by user and by time range (newest first).
+    """
+
+    object_type = models.CharField(max_length=50)
+    object_id = models.PositiveBigIntegerField()
+    field = models.CharField(max_length=50)
+    old_value = models.JSONField(null=True, blank=True, encoder=DjangoJSONEncoder)
+    new_value = models.JSONField(null=True, blank=True, encoder=DjangoJSONEncoder)
+    user = models.ForeignKey(CustomUser, on_delete=models.SET_NULL, null=True, blank=True, db_index=False,
+                             related_name='audit_events')
+    created_at = models.DateTimeField(default=now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['object_type', 'object_id', 'created_at']),
+            models.Index(fields=['user', 'created_at']),
+            models.Index(fields=['created_at']),
+        ]
+
+    def __str__(self):
+        return f'{self.object_type} {self.object_id} {self.field}: {self.old_value} -> {self.new_value}'
+
+    def save(self, *args, **kwargs):
+        """
+        Override this method to keep the events append-only.
+        """
+        if self.pk:
+            raise ValueError('audit events cannot be changed.')
+        super().save(*args, **kwargs)
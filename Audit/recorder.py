@@ -0,0 +1,90 @@
+import logging
+from contextvars import ContextVar
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.db import transaction
+from django.utils.timezone import now
+
+from .models import AuditEvent
+
+logger = logging.getLogger(__name__)
+
+# audit events of the current request (None outside the requests, for example in management commands)
+_buffer = ContextVar('audit_buffer', default=None)
+
+
+def make_events(model, field, changes, user_id=None):
+    """
+    return the audit events (not saved) of the changes [(object id, old value, new value), ...] of a field.
+    """
+    timestamp = now()
+    return [AuditEvent(object_type=model._meta.model_name, object_id=object_id, field=field, old_value=old_value,
+                       new_value=new_value, user_id=user_id, created_at=timestamp)
+            for object_id, old_value, new_value in changes if old_value != new_value]
+
+
+def record(events):
+    """
+    record the audit events when the current transaction commits (the events of a rolled back transaction or
+    savepoint are dropped with it). no query is made here:
+    in a request -> the events are added to the buffer of the request, written by AuditMiddleware at the end
+    outside the requests -> the events are written together when the transaction commits
+    """
+    if not events:
+        return
+    buffer = _buffer.get()
+    if buffer is None:
+        transaction.on_commit(lambda: AuditEvent.objects.bulk_create(events))
+    else:
+        transaction.on_commit(lambda: buffer.extend(events))
+
+
+class AuditMiddleware:
+    """
+    buffers the audit events of each request and writes them with one bulk insert after the view,
+    with the user of the request (authenticated by DRF in the view).
+    works in both modes: under ASGI the chain stays async, only the insert (when there are events) runs in a thread.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        buffer = []
+        token = _buffer.set(buffer)
+        try:
+            return self.get_response(request)
+        finally:
+            _buffer.reset(token)
+            if buffer:
+                self.flush(request, buffer)
+
+    async def __acall__(self, request):
+        buffer = []
+        token = _buffer.set(buffer)
+        try:
+            return await self.get_response(request)
+        finally:
+            _buffer.reset(token)
+            if buffer:
+                await sync_to_async(self.flush)(request, buffer)
+
+    @staticmethod
+    def flush(request, events):
+        user = getattr(request, 'user', None)
+        if user is not None and user.is_authenticated:
+            for event in events:
+                event.user_id = user.pk
+        try:
+            AuditEvent.objects.bulk_create(events)
+        except Exception:
+            # the changes are already committed, a failed audit write must not turn the response into an error
+            logger.exception('%d audit events of %s %s could not be written.', len(events), request.method,
+                             request.path)
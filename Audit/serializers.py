@@ -0,0 +1,39 @@
+from rest_framework import serializers
+from django.conf import settings
+from .models import AuditEvent
+from .signals import AUDIT_FIELDS
+
+
+class AuditQuerySerializer(serializers.Serializer):
+    """
+    serialize the query params of the audit events.
+    object_type, object_id -> only the events of this object (object_id needs object_type)
+    user -> only the changes of this user
+    from, to -> only the events of these days
+    cursor -> the next cursor of the previous page
+    """
+
+    object_type = serializers.ChoiceField(choices=sorted(model._meta.model_name for model in AUDIT_FIELDS),
+                                          required=False)
+    object_id = serializers.IntegerField(required=False, min_value=1)
+    user = serializers.IntegerField(required=False, min_value=1)
+    from_date = serializers.DateField(required=False, allow_null=True)
+    to_date = serializers.DateField(required=False, allow_null=True)
+    cursor = serializers.CharField(required=False, max_length=100)
+    limit = serializers.IntegerField(required=False, min_value=1, max_value=settings.AUDIT_MAX_LIMIT,
+                                     default=settings.AUDIT_LIMIT)
+
+    def validate(self, attrs):
+        if attrs.get('object_id') and not attrs.get('object_type'):
+            raise serializers.ValidationError({'Error': 'object type is required with object id.'})
+
+        if attrs.get('from_date') and attrs.get('to_date') and attrs['from_date'] > attrs['to_date']:
+            raise serializers.ValidationError({'Error': 'from date cannot be greater than to date.'})
+
+        return attrs
+
+
+class AuditEventSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = AuditEvent
+        fields = ('id', 'object_type', 'object_id', 'field', 'old_value', 'new_value', 'user', 'created_at')
@@ -0,0 +1,46 @@
+from django.db.models.signals import post_init, post_save
+from Projects.models import Project, Task, SubTask
+from Financials.models import FinancialOutcomeRecord, FinancialIncomeRecord, CashPaymentRecord, \
+    CheckPaymentRecord, InstallmentPaymentRecord, InstallmentSchedule
+from .recorder import make_events, record
+
+# audited fields of each model (status and money changes)
+AUDIT_FIELDS = {
+    Project: ('status', 'budget'),
+    Task: ('status', 'budget'),
+    SubTask: ('status', 'budget'),
+    FinancialOutcomeRecord: ('status', 'price', 'payment_method'),
+    FinancialIncomeRecord: ('amount',),
+    CashPaymentRecord: ('status',),
+    CheckPaymentRecord: ('status',),
+    InstallmentPaymentRecord: ('status',),
+    InstallmentSchedule: ('installment_status',),
+}
+
+
+def remember_audit_fields(sender, instance, **kwargs):
+    """
+    this method keeps the loaded audited fields of the instance, to know on save which of them changed.
+    """
+    instance._audit_fields = tuple(instance.__dict__.get(field) for field in AUDIT_FIELDS[sender])
+
+
+def audit_changes(sender, instance, created, **kwargs):
+    """
+    this method records an audit event for each audited field that changed (or has a value on create),
+    the events are written in bulk (Audit/recorder.py), so a change doesn't make a query of its own.
+    """
+    fields = AUDIT_FIELDS[sender]
+    values = tuple(instance.__dict__.get(field) for field in fields)
+    old_values = (None,) * len(fields) if created else getattr(instance, '_audit_fields', values)
+    instance._audit_fields = values
+
+    events = []
+    for field, old_value, new_value in zip(fields, old_values, values):
+        events += make_events(sender, field, [(instance.pk, old_value, new_value)])
+    record(events)
+
+
+for model in AUDIT_FIELDS:
+    post_init.connect(receiver=remember_audit_fields, sender=model)
+    post_save.connect(receiver=audit_changes, sender=model)
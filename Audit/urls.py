@@ -0,0 +1,9 @@
+from django.urls import path
+from . import views
+
+
+app_name = 'audit'
+
+urlpatterns = [
+    path('events/', views.AuditEventListView.as_view(), name='audit_events'),
+]
@@ -0,0 +1,79 @@
+import base64
+from datetime import datetime, time, timedelta
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from django.utils.timezone import make_aware
+from rest_framework import permissions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from . import serializers
+from .models import AuditEvent
+
+
+def encode_cursor(event):
+    return base64.urlsafe_b64encode(f'{event.created_at.isoformat()}|{event.pk}'.encode()).decode()
+
+
+def decode_cursor(cursor):
+    """
+    return (created at, id) of the last event of the previous page, or None if the cursor is not valid.
+    """
+    try:
+        created_at, event_id = base64.urlsafe_b64decode(cursor.encode()).decode().split('|')
+        return parse_datetime(created_at), int(event_id)
+    except (ValueError, UnicodeError):
+        return None
+
+
+class AuditEventListView(APIView):
+    """
+    this view shows the audit events (status and money changes), newest first.
+    query params -> object_type and object_id, user, from, to, cursor, limit
+    methods -> GET: for show the events (next -> the url of the next page or null)
+    permission -> authenticated users: staff users see every event, the other users see their own changes
+    """
+
+    permission_classes = (permissions.IsAuthenticated,)
+
+    def get(self, request, *args, **kwargs):
+        """
+        this method filters the events by the query params (each filter with the time range and the order uses
+        one of the composite indexes) and reads one page (one more event to know if there is a next page).
+        """
+        query_serializer = serializers.AuditQuerySerializer(data={
+            **request.query_params.dict(), 'from_date': request.query_params.get('from'),
+            'to_date': request.query_params.get('to')})
+        query_serializer.is_valid(raise_exception=True)
+        data = query_serializer.validated_data
+
+        events = AuditEvent.objects.all()
+        if not request.user.is_staff:
+            events = events.filter(user=request.user)
+        if data.get('object_type'):
+            events = events.filter(object_type=data['object_type'])
+        if data.get('object_id'):
+            events = events.filter(object_id=data['object_id'])
+        if data.get('user'):
+            events = events.filter(user_id=data['user'])
+        if data.get('from_date'):
+            events = events.filter(created_at__gte=make_aware(datetime.combine(data['from_date'], time.min)))
+        if data.get('to_date'):
+            events = events.filter(created_at__lt=make_aware(datetime.combine(data['to_date'] + timedelta(days=1),
+                                                                              time.min)))
+        if data.get('cursor'):
+            cursor = decode_cursor(data['cursor'])
+            if cursor is None or cursor[0] is None:
+                return Response(data={'Error': 'Invalid cursor.'}, status=status.HTTP_400_BAD_REQUEST)
+            events = events.filter(Q(created_at__lt=cursor[0]) | Q(created_at=cursor[0], id__lt=cursor[1]))
+
+        page = list(events.order_by('-created_at', '-id')[:data['limit'] + 1])
+        next_url = None
+        if len(page) > data['limit']:
+            page = page[:data['limit']]
+            params = request.query_params.copy()
+            params['cursor'] = encode_cursor(page[-1])
+            next_url = request.build_absolute_uri(f'{request.path}?{params.urlencode()}')
+
+        return Response(data={'next': next_url, 'results': serializers.AuditEventSerializer(page, many=True).data},
+                        status=status.HTTP_200_OK)
@@ -1,21 +1,27 @@
 from django.contrib import admin
 from .models import FinancialOutcomeRecord, CashPaymentRecord, CheckPaymentRecord, InstallmentSchedule, \
     InstallmentPaymentRecord, FinancialIncomeRecord
+from ProjectManagement.paginators import EstimatedCountPaginator
 
 
 class FinancialOutcomeRecordAdmin(admin.ModelAdmin):
     """
     manage financial outcome instances in admin panel.
     Provides additional display, filtering, and searching options
-    search by -> created_by, payment_method
+    search by -> beginning of title, beginning of creator's email or last name
     filter by -> status, payment_method
     also show its create date in readonly fields
+    the list loads the creator in the same query and shows estimated counts for large tables.
     """
 
     list_display = ('title', 'created_by', 'price', 'status')
-    search_fields = ('created_by', 'payment_method')
+    list_select_related = ('created_by',)
+    search_fields = ('^title', '^created_by__email', '^created_by__last_name')
     list_filter = ('status', 'payment_method')
     readonly_fields = ('create_date',)
+    raw_id_fields = ('created_by',)
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
 
 
 admin.site.register(FinancialOutcomeRecord, FinancialOutcomeRecordAdmin)
@@ -25,15 +31,20 @@ class CashPaymentRecordAdmin(admin.ModelAdmin):
     """
     manage cash payment instances in admin panel.
     Provides additional display, filtering, and searching options
-    search by -> it's financial outcome's title
+    search by -> beginning of it's financial outcome's title
     filter by -> status
     also show its update date in readonly fields
+    the list loads the financial outcome in the same query and shows estimated counts for large tables.
     """
 
     list_display = ('financial_outcome__title', 'payment_date', 'status')
-    search_fields = ('financial_outcome__title',)
+    list_select_related = ('financial_outcome',)
+    search_fields = ('^financial_outcome__title',)
     list_filter = ('status',)
     readonly_fields = ('update_date',)
+    raw_id_fields = ('financial_outcome',)
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
 
 
 admin.site.register(CashPaymentRecord, CashPaymentRecordAdmin)
@@ -43,14 +54,19 @@ class CheckPaymentRecordAdmin(admin.ModelAdmin):
     """
     manage check payment instances in admin panel.
     Provides additional display, filtering, and searching options
-    search by -> it's financial outcome's title
+    search by -> beginning of it's financial outcome's title
     filter by -> status
     also show its update date in readonly fields
+    the list loads the financial outcome in the same query and shows estimated counts for large tables.
     """
     list_display = ('financial_outcome__title', 'check_date', 'status')
-    search_fields = ('financial_outcome__title',)
+    list_select_related = ('financial_outcome',)
+    search_fields = ('^financial_outcome__title',)
     list_filter = ('status',)
     readonly_fields = ('update_date',)
+    raw_id_fields = ('financial_outcome',)
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
 
 
 admin.site.register(CheckPaymentRecord, CheckPaymentRecordAdmin)
@@ -69,11 +85,18 @@ class InstallmentPaymentRecordAdmin(admin.ModelAdmin):
     """
     manage installment payment instances in admin panel.
     Provides additional display, filtering, and searching options
+    search by -> beginning of it's financial outcome's title
     show its update date in readonly fields
+    the list loads the financial outcome in the same query and shows estimated counts for large tables.
     """
     list_display = ('financial_outcome__title', 'status')
+    list_select_related = ('financial_outcome',)
+    search_fields = ('^financial_outcome__title',)
     inlines = (InstallmentScheduleInline,)
     readonly_fields = ('update_date',)
+    raw_id_fields = ('financial_outcome',)
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
 
 
 admin.site.register(InstallmentPaymentRecord, InstallmentPaymentRecordAdmin)
@@ -83,12 +106,18 @@ class FinancialIncomeRecordAdmin(admin.ModelAdmin):
     """
     manage financial income instances in admin panel.
     Provides additional display, filtering, and searching options
-    search by -> owner, source, title
-    filter by -> project, source
+    search by -> beginning of title, beginning of owner's email or last name, beginning of project's title
+    filter by -> source
+    the list loads the owner and project in the same query and shows estimated counts for large tables.
+    (project is searched instead of filtered, because the filter would list every project)
     """
     list_display = ('title', 'owner', 'source', 'amount', 'project')
-    search_fields = ('owner', 'source', 'title')
-    list_filter = ('project', 'source')
+    list_select_related = ('owner', 'project')
+    search_fields = ('^title', '^owner__email', '^owner__last_name', '^project__title')
+    list_filter = ('source',)
     readonly_fields = ('create_date',)
+    raw_id_fields = ('owner', 'project')
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
 
 admin.site.register(FinancialIncomeRecord, FinancialIncomeRecordAdmin)
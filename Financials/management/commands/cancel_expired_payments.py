@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from Financials.sweepers import cancel_expired_payments
+
+
+class Command(BaseCommand):
+    """
+    cancel the expired checks and installment schedules and their financial outcome records.
+    this command is meant to be run periodically (for example by cron once an hour).
+    """
+
+    help = 'Cancel expired checks and installments and propagate the status to their financial outcomes.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true',
+                            help="Only report what would be canceled, don't change anything.")
+        parser.add_argument('--batch-size', type=int, default=500,
+                            help='Number of payment rows that are updated in each batch.')
+
+    def handle(self, *args, **options):
+        metrics = cancel_expired_payments(dry_run=options['dry_run'], batch_size=options['batch_size'])
+
+        prefix = '[dry run] ' if metrics['dry_run'] else ''
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefix}checks canceled: {metrics['checks_canceled']}, "
+            f"installments canceled: {metrics['installments_canceled']}, "
+            f"installment plans canceled: {metrics['plans_canceled']}, "
+            f"financial outcomes canceled: {metrics['outcomes_canceled']}, "
+            f"batches: {metrics['batches']}, duration: {metrics['duration']}s"))
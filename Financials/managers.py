@@ -0,0 +1,50 @@
+from django.apps import apps
+from django.contrib.contenttypes.models import ContentType
+from django.db import models
+from django.db.models import Q
+
+
+class FinancialOutcomeQuerySet(models.QuerySet):
+    """
+    queryset of financial outcome model.
+    """
+
+    def authorized_for(self, user):
+        """
+        return the financial outcome records that the user is allowed to see (same rules as the permissions):
+            if record related to project: project CEO
+            if the record related to task: task manager, project CEO
+            if the record related to subtask: subtask manager, task manager, project CEO
+        the filter is built from subqueries, so it is evaluated as one query.
+        """
+        project_model = apps.get_model('Projects', 'Project')
+        task_model = apps.get_model('Projects', 'Task')
+        subtask_model = apps.get_model('Projects', 'SubTask')
+
+        projects = project_model.objects.filter(ceo=user).values('id')
+        tasks = task_model.objects.filter(Q(manager=user) | Q(project__ceo=user)).values('id')
+        subtasks = subtask_model.objects.filter(Q(manager=user) | Q(task__manager=user) |
+                                                Q(task__project__ceo=user)).values('id')
+
+        content_types = ContentType.objects.get_for_models(project_model, task_model, subtask_model)
+
+        return self.filter(Q(content_type=content_types[project_model], object_id__in=projects) |
+                           Q(content_type=content_types[task_model], object_id__in=tasks) |
+                           Q(content_type=content_types[subtask_model], object_id__in=subtasks))
+
+    def for_project(self, project_id):
+        """
+        return the financial outcome records of a project, its tasks and its subtasks.
+        """
+        project_model = apps.get_model('Projects', 'Project')
+        task_model = apps.get_model('Projects', 'Task')
+        subtask_model = apps.get_model('Projects', 'SubTask')
+
+        tasks = task_model.objects.filter(project_id=project_id).values('id')
+        subtasks = subtask_model.objects.filter(task__project_id=project_id).values('id')
+
+        content_types = ContentType.objects.get_for_models(project_model, task_model, subtask_model)
+
+        return self.filter(Q(content_type=content_types[project_model], object_id=project_id) |
+                           Q(content_type=content_types[task_model], object_id__in=tasks) |
+                           Q(content_type=content_types[subtask_model], object_id__in=subtasks))
@@ -3,9 +3,11 @@ from Accounts.models import CustomUser
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.utils.timezone import now
+from Sync.sequence import SyncedModel
+from .managers import FinancialOutcomeQuerySet
 
 
-class FinancialOutcomeRecord(models.Model):
+class FinancialOutcomeRecord(SyncedModel):
     """
     financial outcome model stores user financial outcome information.
     user can enter -> title, description, price, payment method
@@ -37,6 +39,11 @@ class FinancialOutcomeRecord(models.Model):
     object_id = models.PositiveIntegerField()
     content_object = GenericForeignKey('content_type', 'object_id')
 
+    objects = FinancialOutcomeQuerySet.as_manager()
+
+    class Meta:
+        indexes = [models.Index(fields=['content_type', 'object_id', 'status'])]
+
     def __str__(self):
         return self.title
 
@@ -67,6 +74,9 @@ class CashPaymentRecord(models.Model):
     update_date = models.DateField(auto_now=True)
     financial_outcome = models.ForeignKey(FinancialOutcomeRecord, on_delete=models.CASCADE, related_name='cash_payment')
 
+    class Meta:
+        indexes = [models.Index(fields=['payment_date', 'status'])]
+
     def __str__(self):
         return self.financial_outcome.title
 
@@ -105,17 +115,20 @@ class CheckPaymentRecord(models.Model):
     financial_outcome = models.ForeignKey(FinancialOutcomeRecord, on_delete=models.CASCADE,
                                           related_name='check_payment')
 
+    class Meta:
+        indexes = [models.Index(fields=['check_date', 'status'])]
+
     def __str__(self):
         return self.financial_outcome.title
 
     @property
     def cancel_check_payment(self):
         """
-        check if the check date and check number has values and status is none ->
+        check if the check date and check number has values and status is empty ->
                 if the check date is in the past -> status = 'canceled'
         else -> don't change the status value
         """
-        if self.check_date and self.check_number and self.status is None:
+        if self.check_date and self.check_number and not self.status:
             if self.check_date < now().date():
                 return 'canceled'
         return self.status
@@ -187,6 +200,9 @@ class InstallmentSchedule(models.Model):
     installment_id = models.ForeignKey(InstallmentPaymentRecord, on_delete=models.CASCADE,
                                        related_name='installments_schedule')
 
+    class Meta:
+        indexes = [models.Index(fields=['date', 'installment_status'])]
+
     def __str__(self):
         return self.installment_id.financial_outcome.title
 
@@ -230,7 +246,7 @@ class InstallmentSchedule(models.Model):
 
 
 
-class FinancialIncomeRecord(models.Model):
+class FinancialIncomeRecord(SyncedModel):
     """
     financial income model stores user financial income information.
     user can enter -> title, description, amount, source, related project
@@ -249,5 +265,8 @@ class FinancialIncomeRecord(models.Model):
     project = models.ForeignKey('Projects.Project', on_delete=models.CASCADE, related_name='project')
     create_date = models.DateField(auto_now_add=True)
 
+    class Meta:
+        indexes = [models.Index(fields=['project', 'create_date'])]
+
     def str(self):
         return self.title
\ No newline at end of file
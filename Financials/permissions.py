@@ -147,3 +147,14 @@ class CanUpdateDeleteFinancialIncome(permissions.BasePermission):
      """
     def has_object_permission(self, request, view, obj):
         return request.user == obj.project.ceo
+
+
+class CanSeeProjectFinancialReport(permissions.BasePermission):
+    """
+    custom permission to see the financial reports of a project.
+    by project id that fetched from url, access the project CEO
+    method -> GET: project CEO
+    """
+    def has_permission(self, request, view):
+        project_obj = get_object_or_404(Project, id=view.kwargs.get('project_id'))
+        return request.user == project_obj.ceo
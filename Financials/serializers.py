@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from abc import ABC
+from datetime import timedelta
 from django.contrib.contenttypes.models import ContentType
 from django.utils.timezone import now
 
@@ -286,3 +287,70 @@ class FinancialIncomeSerializer(serializers.ModelSerializer):
                 raise serializers.ValidationError({'Error': "You cant change financial income's amount"})
         return attrs
 
+
+class DateRangeSerializer(serializers.Serializer):
+    """
+    serialize a date range that comes from query params.
+    if the dates are not sent -> from today until 30 days later.
+    include validation -> from date must be before to date and the range can be 366 days at most.
+    """
+    from_date = serializers.DateField(required=False, allow_null=True)
+    to_date = serializers.DateField(required=False, allow_null=True)
+
+    def validate(self, attrs):
+        from_date = attrs.get('from_date') or now().date()
+        to_date = attrs.get('to_date') or from_date + timedelta(days=30)
+
+        if from_date > to_date:
+            raise serializers.ValidationError({'Error': 'from date cannot be greater than to date.'})
+
+        if (to_date - from_date).days > 366:
+            raise serializers.ValidationError({'Error': 'The date range cannot be longer than 366 days.'})
+
+        attrs['from_date'] = from_date
+        attrs['to_date'] = to_date
+        return attrs
+
+
+class PaymentCalendarItemSerializer(serializers.Serializer):
+    """
+    serialize a row of payment calendar (cash payment, check or installment schedule).
+    """
+    kind = serializers.CharField()
+    payment_id = serializers.IntegerField()
+    due_date = serializers.DateField()
+    payment_status = serializers.CharField(allow_null=True)
+    outcome_id = serializers.IntegerField()
+    title = serializers.CharField()
+    amount = serializers.IntegerField(allow_null=True)
+
+
+class CashFlowQuerySerializer(serializers.Serializer):
+    """
+    serialize the query params of project cash flow report.
+    """
+    bucket = serializers.ChoiceField(choices=('week', 'month'), default='month')
+
+
+class FinancialOutcomeSummaryQuerySerializer(serializers.Serializer):
+    """
+    serialize the query params of financial outcome summary.
+    group_by is required, other fields are optional filters.
+    """
+    group_by = serializers.ChoiceField(choices=('status', 'payment_method', 'project', 'month'), default='status')
+    status = serializers.ChoiceField(choices=FinancialOutcomeRecord.STATUS_CHOICES, required=False)
+    payment_method = serializers.ChoiceField(choices=FinancialOutcomeRecord.PAYMENT_METHOD_CHOICES, required=False)
+    from_date = serializers.DateField(required=False, allow_null=True)
+    to_date = serializers.DateField(required=False, allow_null=True)
+
+
+class FinancialIncomeSummaryQuerySerializer(serializers.Serializer):
+    """
+    serialize the query params of financial income summary.
+    group_by is required, other fields are optional filters.
+    """
+    group_by = serializers.ChoiceField(choices=('source', 'project', 'month'), default='source')
+    source = serializers.ChoiceField(choices=FinancialIncomeRecord.INCOME_SOURCE_CHOICES, required=False)
+    project = serializers.IntegerField(required=False)
+    from_date = serializers.DateField(required=False, allow_null=True)
+    to_date = serializers.DateField(required=False, allow_null=True)
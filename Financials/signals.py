@@ -1,6 +1,9 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete
+from django.contrib.contenttypes.models import ContentType
 from .models import InstallmentSchedule, InstallmentPaymentRecord, CheckPaymentRecord, CashPaymentRecord, \
-    FinancialIncomeRecord
+    FinancialIncomeRecord, FinancialOutcomeRecord
+from ProjectManagement.cache import bump_versions
+from ProjectManagement.indexes import create_prefix_indexes
 
 
 def complete_installment_payment_status(sender, instance,**kwargs):
@@ -86,3 +89,30 @@ def update_project_budget(sender, instance, created, **kwargs):
 post_save.connect(receiver=update_project_budget, sender=FinancialIncomeRecord)
 
 
+
+def invalidate_financial_ledger(sender, instance, **kwargs):
+    """
+    this method changes the financial ledger version of the user that owns the saved or deleted record,
+    so the cached financial summaries of that user are not used anymore.
+    it also changes the cache version of the related project, task or subtask, because their detail
+    responses include financial reports.
+    """
+    if isinstance(instance, FinancialOutcomeRecord):
+        content_type = ContentType.objects.get_for_id(instance.content_type_id)
+        bump_versions(f'financial-ledger:{instance.created_by_id}', f'{content_type.model}:{instance.object_id}')
+    elif isinstance(instance, FinancialIncomeRecord):
+        bump_versions(f'financial-ledger:{instance.owner_id}', f'project:{instance.project_id}')
+
+
+post_save.connect(receiver=invalidate_financial_ledger, sender=FinancialOutcomeRecord)
+post_delete.connect(receiver=invalidate_financial_ledger, sender=FinancialOutcomeRecord)
+post_save.connect(receiver=invalidate_financial_ledger, sender=FinancialIncomeRecord)
+post_delete.connect(receiver=invalidate_financial_ledger, sender=FinancialIncomeRecord)
+
+
+def create_title_search_indexes(sender, using='default', **kwargs):
+    """
+    this method creates the prefix indexes of the titles (admin search by beginning of title) on PostgreSQL.
+    """
+    for model in (FinancialOutcomeRecord, FinancialIncomeRecord):
+        create_prefix_indexes(using, model, ('title',))
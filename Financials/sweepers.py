@@ -0,0 +1,123 @@
+import time
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.db.models import Q
+from django.utils.timezone import now
+
+from Audit.recorder import make_events, record
+from ProjectManagement.cache import bump_versions
+from Sync.sequence import next_change_seq
+from .models import FinancialOutcomeRecord, CheckPaymentRecord, InstallmentPaymentRecord, InstallmentSchedule
+
+
+def iter_id_batches(queryset, fields, batch_size):
+    """
+    yields the rows of the queryset in primary key order, batch by batch.
+    each batch is fetched with a 'pk > last seen pk' condition, so rows that are updated
+    by the caller don't shift the next batches.
+    """
+    last_pk = 0
+    while True:
+        batch = list(queryset.filter(pk__gt=last_pk).order_by('pk').values_list('pk', *fields)[:batch_size])
+        if not batch:
+            return
+        yield batch
+        last_pk = batch[-1][0]
+
+
+def expired_checks():
+    """
+    return the check payments that are not done or canceled and their check date is in the past.
+    """
+    return CheckPaymentRecord.objects.filter(Q(status='') | Q(status__isnull=True),
+                                             check_date__lt=now().date(),
+                                             check_number__isnull=False).exclude(check_number='')
+
+
+def expired_installment_schedules():
+    """
+    return the installment schedules that are still in progress and their date is in the past.
+    """
+    return InstallmentSchedule.objects.filter(installment_status='in_progress', date__lt=now().date())
+
+
+def cancel_expired_payments(dry_run=False, batch_size=500):
+    """
+    cancel expired checks and installment schedules with set-based updates and propagate the
+    canceled status to their installment plans and financial outcome records.
+    it does the same thing as 'cancel_check_payment' and 'cancel_installment_schedule_payment' do on save,
+    but for all the expired rows, without waiting for someone to edit them.
+    if dry_run is True -> nothing changes in database, only the counts are reported.
+    return a dictionary with the metrics of the run.
+    """
+    started = time.perf_counter()
+    today = now().date()
+    metrics = {'dry_run': dry_run, 'checks_canceled': 0, 'installments_canceled': 0, 'plans_canceled': 0,
+               'outcomes_canceled': 0, 'batches': 0}
+
+    for batch in iter_id_batches(expired_checks(), ('financial_outcome_id', 'status'), batch_size):
+        check_ids = [row[0] for row in batch]
+        outcome_ids = {row[1] for row in batch}
+
+        with transaction.atomic():
+            if dry_run:
+                metrics['checks_canceled'] += len(check_ids)
+            else:
+                metrics['checks_canceled'] += CheckPaymentRecord.objects.filter(id__in=check_ids).update(
+                    status='canceled', update_date=today)
+                record(make_events(CheckPaymentRecord, 'status', [(row[0], row[2], 'canceled') for row in batch]))
+            metrics['outcomes_canceled'] += cancel_financial_outcomes(outcome_ids, today, dry_run)
+        metrics['batches'] += 1
+
+    for batch in iter_id_batches(expired_installment_schedules(), ('installment_id_id',), batch_size):
+        schedule_ids = [row[0] for row in batch]
+        plan_ids = {row[1] for row in batch}
+
+        with transaction.atomic():
+            if dry_run:
+                metrics['installments_canceled'] += len(schedule_ids)
+            else:
+                metrics['installments_canceled'] += InstallmentSchedule.objects.filter(id__in=schedule_ids).update(
+                    installment_status='canceled')
+                record(make_events(InstallmentSchedule, 'installment_status',
+                                   [(schedule_id, 'in_progress', 'canceled') for schedule_id in schedule_ids]))
+
+            plans = list(InstallmentPaymentRecord.objects.filter(id__in=plan_ids).exclude(status='canceled')
+                         .values_list('id', 'financial_outcome_id', 'status'))
+            outcome_ids = {plan[1] for plan in plans}
+            if dry_run:
+                metrics['plans_canceled'] += len(plans)
+            else:
+                metrics['plans_canceled'] += InstallmentPaymentRecord.objects.filter(
+                    id__in=[plan[0] for plan in plans]).update(status='canceled', update_date=today)
+                record(make_events(InstallmentPaymentRecord, 'status',
+                                   [(plan[0], plan[2], 'canceled') for plan in plans]))
+            metrics['outcomes_canceled'] += cancel_financial_outcomes(outcome_ids, today, dry_run)
+        metrics['batches'] += 1
+
+    metrics['duration'] = round(time.perf_counter() - started, 3)
+    return metrics
+
+
+def cancel_financial_outcomes(outcome_ids, today, dry_run=False):
+    """
+    change the status of the given financial outcome records to canceled (if they aren't already).
+    return the number of changed records.
+    """
+    outcomes = FinancialOutcomeRecord.objects.filter(id__in=outcome_ids).exclude(status='canceled')
+    if dry_run:
+        return outcomes.count()
+
+    rows = list(outcomes.values_list('id', 'status', 'created_by_id', 'content_type_id', 'object_id'))
+    count = outcomes.update(status='canceled', update_date=today, change_seq=next_change_seq())
+
+    # queryset updates don't send pre_save and post_save, so here the records of the batch get one change
+    # sequence number (sync api), their audit events are recorded (one insert per batch), and the cached ledgers
+    # of the owners and the cached details of the related projects, tasks and subtasks are invalidated.
+    record(make_events(FinancialOutcomeRecord, 'status', [(row[0], row[1], 'canceled') for row in rows]))
+    names = set()
+    for _outcome_id, _status, owner_id, content_type_id, object_id in rows:
+        names.add(f'financial-ledger:{owner_id}')
+        names.add(f'{ContentType.objects.get_for_id(content_type_id).model}:{object_id}')
+    transaction.on_commit(lambda: bump_versions(*names))
+    return count
@@ -25,4 +25,17 @@ urlpatterns = [
          name='create_list_financial_income'),
     path('update-delete-financial-income/<int:pk>/', views.FinancialIncomeUpdateDeleteView.as_view(),
          name='update_delete_financial_income'),
+    path('calendar/', views.PaymentCalendarView.as_view(), name='payment_calendar'),
+    path('cashflow/<int:project_id>/', views.ProjectCashFlowView.as_view(), name='project_cashflow'),
+    path('summary/outcome/', views.FinancialOutcomeSummaryView.as_view(), name='financial_outcome_summary'),
+    path('summary/income/', views.FinancialIncomeSummaryView.as_view(), name='financial_income_summary'),
+
+    path('async/list-financial-outcome/<str:model>/<int:object_id>/', views.AsyncFinancialOutcomeListView.as_view(),
+         name='async_list_financial_outcome'),
+    path('async/financial-outcome/<int:pk>/', views.AsyncFinancialOutcomeDetailView.as_view(),
+         name='async_financial_outcome'),
+    path('async/list-financial-income/<int:project_id>/', views.AsyncFinancialIncomeListView.as_view(),
+         name='async_list_financial_income'),
+    path('async/financial-income/<int:pk>/', views.AsyncFinancialIncomeDetailView.as_view(),
+         name='async_financial_income'),
 ]
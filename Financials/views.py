@@ -1,6 +1,13 @@
 from rest_framework import generics, permissions, status
 from rest_framework.views import APIView
 from django.shortcuts import get_object_or_404
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.db import models
+from django.db.models import F, Q, Value, Sum, Count, Case, When, OuterRef, Subquery
+from django.db.models.functions import Coalesce, TruncMonth, TruncWeek
+from django.utils.timezone import now
 from rest_framework.response import Response
 
 from .models import FinancialOutcomeRecord, CashPaymentRecord, CheckPaymentRecord, InstallmentPaymentRecord, \
@@ -8,8 +15,10 @@ from .models import FinancialOutcomeRecord, CashPaymentRecord, CheckPaymentRecor
 from . import serializers
 from .permissions import (IsOwnerFinancialOutcome, CanUpdateDeleteFinancial, CanUpdateDeletePaymentMethod, \
     CanSeeInstallmentSchedule, CanUpdateInstallmentSchedule, CanUpdateStatusPaymentMethod, IsOwnerFinancialIncome,
-                          CanUpdateDeleteFinancialIncome)
-from Projects.models import Project
+                          CanUpdateDeleteFinancialIncome, CanSeeProjectFinancialReport)
+from Projects.models import Project, Task, SubTask
+from ProjectManagement.asyncviews import AsyncAPIView
+from ProjectManagement.cache import get_versions, make_key
 
 
 class FinancialOutcomeListCreateView(generics.ListCreateAPIView):
@@ -298,3 +307,310 @@ class FinancialIncomeUpdateDeleteView(generics.RetrieveUpdateDestroyAPIView):
         delete the financial income record
         """
         instance.delete()
+
+
+class PaymentCalendarView(generics.ListAPIView):
+    """
+    this view is used to listing the cash, check and installment payments that fall due in a date range
+    across all the projects, tasks and subtasks that the user is allowed to see.
+    query params -> from, to (default: today until 30 days later)
+    methods -> GET: for show the date-sorted list of payments
+    permission -> authenticated users
+    """
+    permission_classes = (permissions.IsAuthenticated,)
+    serializer_class = serializers.PaymentCalendarItemSerializer
+
+    def get_queryset(self):
+        """
+        return the union of the three payment tables (one SQL query) filtered by the date range
+        and the user's authorized financial outcome records, sorted by the due date.
+        """
+        date_range = serializers.DateRangeSerializer(data={'from_date': self.request.query_params.get('from'),
+                                                           'to_date': self.request.query_params.get('to')})
+        date_range.is_valid(raise_exception=True)
+        from_date = date_range.validated_data['from_date']
+        to_date = date_range.validated_data['to_date']
+
+        outcomes = FinancialOutcomeRecord.objects.authorized_for(self.request.user).values('id')
+
+        cash = CashPaymentRecord.objects.filter(payment_date__range=(from_date, to_date),
+                                                financial_outcome__in=outcomes)
+        check = CheckPaymentRecord.objects.filter(check_date__range=(from_date, to_date),
+                                                  financial_outcome__in=outcomes)
+        installment = InstallmentSchedule.objects.filter(date__range=(from_date, to_date),
+                                                         installment_id__financial_outcome__in=outcomes)
+
+        # every branch annotates the same columns in the same order, so they can be combined with UNION.
+        cash = cash.annotate(**self.calendar_columns('cash', 'payment_date', 'status', 'financial_outcome',
+                                                     F('financial_outcome__price')))
+        check = check.annotate(**self.calendar_columns('check', 'check_date', 'status', 'financial_outcome',
+                                                       F('financial_outcome__price')))
+        installment = installment.annotate(**self.calendar_columns(
+            'installment', 'date', 'installment_status', 'installment_id__financial_outcome',
+            F('installment_id__financial_outcome__price') / F('installment_id__count_installments')))
+
+        columns = ('payment_id', 'kind', 'due_date', 'payment_status', 'outcome_id', 'title', 'amount')
+        return cash.values(*columns).union(check.values(*columns), installment.values(*columns),
+                                           all=True).order_by('due_date', 'kind', 'payment_id')
+
+    @staticmethod
+    def calendar_columns(kind, date_field, status_field, outcome_field, amount):
+        """
+        return the annotations that map a payment table to the columns of the calendar.
+        """
+        return {'payment_id': F('id'),
+                'kind': Value(kind, output_field=models.CharField()),
+                'due_date': F(date_field),
+                'payment_status': F(status_field),
+                'outcome_id': F(f'{outcome_field}__id'),
+                'title': F(f'{outcome_field}__title'),
+                'amount': models.ExpressionWrapper(amount, output_field=models.BigIntegerField())}
+
+
+class ProjectCashFlowView(APIView):
+    """
+    this view is used to show the cash flow of a project as time buckets.
+    query params -> bucket: week or month (default: month)
+    each bucket has -> income: the amount of financial incomes by their create date
+                       paid_outcome: the price of paid financial outcomes by their payment (or update) date
+                       scheduled_installments, scheduled_checks: the future outflows that are not paid yet
+    all the sums are computed by grouped aggregate queries in database.
+    permission -> authenticated users, project's ceo
+    """
+    permission_classes = (permissions.IsAuthenticated, CanSeeProjectFinancialReport)
+
+    def get(self, request, *args, **kwargs):
+        """
+        this method runs one grouped query for each series and merges them into sorted buckets.
+        """
+        query_serializer = serializers.CashFlowQuerySerializer(data=request.query_params)
+        query_serializer.is_valid(raise_exception=True)
+        trunc = TruncWeek if query_serializer.validated_data['bucket'] == 'week' else TruncMonth
+
+        project_id = kwargs['project_id']
+        today = now().date()
+        outcomes = FinancialOutcomeRecord.objects.for_project(project_id)
+
+        series = {
+            'income': FinancialIncomeRecord.objects.filter(project_id=project_id).annotate(
+                period=trunc('create_date')).values('period').annotate(total=Sum('amount')),
+
+            'paid_outcome': outcomes.filter(status='paid').annotate(
+                period=trunc(Coalesce('payment_date', 'update_date', 'create_date'))
+            ).values('period').annotate(total=Sum('price')),
+
+            'scheduled_installments': InstallmentSchedule.objects.filter(
+                installment_status='in_progress', date__gte=today,
+                installment_id__financial_outcome__in=outcomes.values('id')
+            ).annotate(period=trunc('date')).values('period').annotate(
+                total=Sum(F('installment_id__financial_outcome__price') / F('installment_id__count_installments'))),
+
+            'scheduled_checks': CheckPaymentRecord.objects.filter(
+                Q(status='') | Q(status__isnull=True), check_date__gte=today,
+                financial_outcome__in=outcomes.values('id')
+            ).annotate(period=trunc('check_date')).values('period').annotate(total=Sum('financial_outcome__price')),
+        }
+
+        buckets = {}
+        for name, queryset in series.items():
+            for row in queryset.order_by():
+                bucket = buckets.setdefault(row['period'], dict.fromkeys(series, 0))
+                bucket[name] = row['total'] or 0
+
+        results = [{'period': period, **totals} for period, totals in sorted(buckets.items())]
+        return Response(data={'project': project_id,
+                              'bucket': query_serializer.validated_data['bucket'],
+                              'results': results}, status=status.HTTP_200_OK)
+
+
+class FinancialSummaryView(APIView):
+    """
+    base view for the financial summaries of the requesting user.
+    the summary is one grouped query (values(...).annotate(Sum, Count)) and its result is cached per user;
+    the cache is invalidated by the user's financial ledger version, that changes on every write.
+    subclasses set -> query_serializer_class, cache_prefix and get_summary_queryset(filters)
+    these views read from the primary (a replica that lags could cache old totals under the new version).
+    """
+    permission_classes = (permissions.IsAuthenticated,)
+    replica_reads = False
+    query_serializer_class = None
+    cache_prefix = None
+
+    def get(self, request, *args, **kwargs):
+        """
+        this method validates the query params and returns the cached summary or computes it.
+        """
+        query_serializer = self.query_serializer_class(data={
+            **request.query_params.dict(),
+            'from_date': request.query_params.get('from'),
+            'to_date': request.query_params.get('to'),
+        })
+        query_serializer.is_valid(raise_exception=True)
+        filters = {key: value for key, value in query_serializer.validated_data.items() if value is not None}
+
+        version, = get_versions(f'financial-ledger:{request.user.id}')
+        key = make_key(self.cache_prefix, request.user.id, version, sorted(filters.items()))
+
+        data = cache.get(key)
+        if data is None:
+            results = [{'key': row['key'], 'total': row['total'] or 0, 'count': row['count']}
+                       for row in self.get_summary_queryset(filters)]
+            data = {'group_by': filters['group_by'],
+                    'total': sum(row['total'] for row in results),
+                    'count': sum(row['count'] for row in results),
+                    'results': results}
+            cache.set(key, data, timeout=settings.FINANCIAL_SUMMARY_CACHE_TIMEOUT)
+
+        return Response(data=data, status=status.HTTP_200_OK)
+
+
+class FinancialOutcomeSummaryView(FinancialSummaryView):
+    """
+    this view is used to show the totals of user's financial outcome records.
+    query params -> group_by: status, payment_method, project, month
+                    filters: status, payment_method, from, to (create date)
+    permission -> authenticated users
+    """
+    query_serializer_class = serializers.FinancialOutcomeSummaryQuerySerializer
+    cache_prefix = 'financial-outcome-summary'
+
+    def get_summary_queryset(self, filters):
+        """
+        return the grouped totals of prices. for project grouping, the project of task and subtask records
+        is resolved by subqueries in the same query.
+        """
+        queryset = FinancialOutcomeRecord.objects.filter(created_by=self.request.user)
+
+        if 'status' in filters:
+            queryset = queryset.filter(status=filters['status'])
+        if 'payment_method' in filters:
+            queryset = queryset.filter(payment_method=filters['payment_method'])
+        if 'from_date' in filters:
+            queryset = queryset.filter(create_date__gte=filters['from_date'])
+        if 'to_date' in filters:
+            queryset = queryset.filter(create_date__lte=filters['to_date'])
+
+        group_by = filters['group_by']
+        if group_by == 'project':
+            content_types = ContentType.objects.get_for_models(Project, Task, SubTask)
+            key = Case(
+                When(content_type=content_types[Project], then=F('object_id')),
+                When(content_type=content_types[Task], then=Subquery(
+                    Task.objects.filter(pk=OuterRef('object_id')).values('project_id')[:1])),
+                When(content_type=content_types[SubTask], then=Subquery(
+                    SubTask.objects.filter(pk=OuterRef('object_id')).values('task__project_id')[:1])),
+                output_field=models.BigIntegerField())
+        elif group_by == 'month':
+            key = TruncMonth('create_date')
+        else:
+            key = F(group_by)
+
+        return queryset.annotate(key=key).values('key').annotate(
+            total=Sum('price'), count=Count('id')).order_by('key')
+
+
+class FinancialIncomeSummaryView(FinancialSummaryView):
+    """
+    this view is used to show the totals of user's financial income records.
+    query params -> group_by: source, project, month
+                    filters: source, project, from, to (create date)
+    permission -> authenticated users
+    """
+    query_serializer_class = serializers.FinancialIncomeSummaryQuerySerializer
+    cache_prefix = 'financial-income-summary'
+
+    def get_summary_queryset(self, filters):
+        """
+        return the grouped totals of amounts.
+        """
+        queryset = FinancialIncomeRecord.objects.filter(owner=self.request.user)
+
+        if 'source' in filters:
+            queryset = queryset.filter(source=filters['source'])
+        if 'project' in filters:
+            queryset = queryset.filter(project_id=filters['project'])
+        if 'from_date' in filters:
+            queryset = queryset.filter(create_date__gte=filters['from_date'])
+        if 'to_date' in filters:
+            queryset = queryset.filter(create_date__lte=filters['to_date'])
+
+        group_by = filters['group_by']
+        if group_by == 'month':
+            key = TruncMonth('create_date')
+        elif group_by == 'project':
+            key = F('project_id')
+        else:
+            key = F(group_by)
+
+        return queryset.annotate(key=key).values('key').annotate(
+            total=Sum('amount'), count=Count('id')).order_by('key')
+
+
+class AsyncFinancialOutcomeListView(AsyncAPIView):
+    """
+    async variant of the financial outcome list.
+    methods -> GET: for show the list of financial outcome records with their count and totals
+    permission -> authenticated users, the owner(project CEO or task manager or subtask manager)
+    """
+    permission_classes = (permissions.IsAuthenticated, IsOwnerFinancialOutcome)
+    serializer_class = serializers.FinancialOutcomeSerializer
+
+    async def get(self, request, *args, **kwargs):
+        """
+        this method reads the user's financial outcome records and their totals.
+        """
+        outcomes = FinancialOutcomeRecord.objects.filter(created_by=request.user)
+        rows = await self.alist(outcomes.select_related('created_by', 'content_type')
+                                .prefetch_related('content_object'))
+        totals = await outcomes.aaggregate(count=Count('id'), total_price=Coalesce(Sum('price'), 0),
+                                           paid_price=Coalesce(Sum('price', filter=Q(status='paid')), 0))
+        return Response(data={**totals, 'results': await self.serialize(rows, many=True)}, status=status.HTTP_200_OK)
+
+
+class AsyncFinancialOutcomeDetailView(AsyncAPIView):
+    """
+    async variant of the financial outcome detail.
+    methods -> GET: for show the information of the financial outcome record
+    permission -> authenticated users, the owner(project CEO or task manager or subtask manager)
+    """
+    permission_classes = (permissions.IsAuthenticated, CanUpdateDeleteFinancial)
+    serializer_class = serializers.FinancialOutcomeSerializer
+
+    async def get(self, request, *args, **kwargs):
+        outcome = await self.aget_object(FinancialOutcomeRecord.objects.select_related('created_by', 'content_type')
+                                         .prefetch_related('content_object'), pk=kwargs['pk'])
+        return Response(data=await self.serialize(outcome), status=status.HTTP_200_OK)
+
+
+class AsyncFinancialIncomeListView(AsyncAPIView):
+    """
+    async variant of the financial income list.
+    methods -> GET: for show the list of financial income records with their count and total amount
+    permission -> authenticated users, the project CEO
+    """
+    permission_classes = (permissions.IsAuthenticated, IsOwnerFinancialIncome)
+    serializer_class = serializers.FinancialIncomeSerializer
+
+    async def get(self, request, *args, **kwargs):
+        """
+        this method reads the user's financial income records and their totals.
+        """
+        incomes = FinancialIncomeRecord.objects.filter(owner=request.user)
+        rows = await self.alist(incomes.select_related('owner', 'project__ceo').prefetch_related('project__experts'))
+        totals = await incomes.aaggregate(count=Count('id'), total_amount=Coalesce(Sum('amount'), 0))
+        return Response(data={**totals, 'results': await self.serialize(rows, many=True)}, status=status.HTTP_200_OK)
+
+
+class AsyncFinancialIncomeDetailView(AsyncAPIView):
+    """
+    async variant of the financial income detail.
+    methods -> GET: for show the information of the financial income record
+    permission -> authenticated users, the project CEO
+    """
+    permission_classes = (permissions.IsAuthenticated, CanUpdateDeleteFinancialIncome)
+    serializer_class = serializers.FinancialIncomeSerializer
+
+    async def get(self, request, *args, **kwargs):
+        income = await self.aget_object(FinancialIncomeRecord.objects.select_related('owner', 'project__ceo')
+                                        .prefetch_related('project__experts'), pk=kwargs['pk'])
+        return Response(data=await self.serialize(income), status=status.HTTP_200_OK)
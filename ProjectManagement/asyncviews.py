@@ -0,0 +1,73 @@
+import asyncio
+from asgiref.sync import sync_to_async
+from django.http import Http404
+from rest_framework.views import APIView
+
+
+class AsyncAPIView(APIView):
+    """
+    APIView whose handlers are coroutines, so under ASGI a request doesn't hold a worker thread while it waits for
+    the database (under WSGI Django runs the view in an event loop of its own).
+    authentication, permission checks and throttling of DRF are synchronous, they run in a thread (sync_to_async);
+    the handlers read with the async ORM and serialize in a thread (serializer properties can query the database).
+    the async ORM runs every query of a request in the one thread of the request (sync_to_async is thread
+    sensitive, a connection belongs to one thread), so the queries of a handler run one after the other:
+    the gain is that a request waiting for the database doesn't hold a thread, not parallel queries.
+    """
+
+    serializer_class = None
+
+    async def dispatch(self, request, *args, **kwargs):
+        """
+        override this method to await the handler (the same steps as APIView.dispatch).
+        """
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+            if not asyncio.iscoroutinefunction(handler):
+                handler = sync_to_async(handler)
+            response = await handler(request, *args, **kwargs)
+
+        except Exception as exc:
+            response = await sync_to_async(self.handle_exception)(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+    def get_serializer_context(self):
+        return {'request': self.request, 'format': self.format_kwarg, 'view': self}
+
+    async def serialize(self, instance, many=False):
+        """
+        return the serialized data of the instance (or the list of instances).
+        """
+        serializer = self.serializer_class(instance, many=many, context=self.get_serializer_context())
+        return await sync_to_async(lambda: serializer.data)()
+
+    async def aget_object(self, queryset, **lookup):
+        """
+        return the object of the queryset with the lookup (or 404) after checking the object permissions.
+        """
+        try:
+            obj = await queryset.aget(**lookup)
+        except queryset.model.DoesNotExist:
+            raise Http404(f'No {queryset.model._meta.object_name} matches the given query.')
+        await sync_to_async(self.check_object_permissions)(self.request, obj)
+        return obj
+
+    @staticmethod
+    async def alist(queryset):
+        """
+        return the rows of the queryset (read with aiterator, prefetch_related needs a chunk size).
+        """
+        return [obj async for obj in queryset.aiterator(chunk_size=500)]
@@ -0,0 +1,89 @@
+import hashlib
+from uuid import uuid4
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework import status
+from rest_framework.response import Response
+
+
+def version_key(name):
+    """
+    return the cache key that stores the version of the given name (for example 'project:12').
+    """
+    return f'version:{name}'
+
+
+def get_versions(*names):
+    """
+    return the current version token of each given name in one cache round trip.
+    a missing version (never bumped or evicted) gets a new random token, so old cached values that
+    were stored under an evicted version are never served again.
+    """
+    keys = {version_key(name): name for name in names}
+    versions = cache.get_many(list(keys))
+
+    missing = {key: uuid4().hex for key in keys if key not in versions}
+    if missing:
+        for key, token in missing.items():
+            # add() keeps the token of a concurrent request if it has been set in the meantime.
+            if not cache.add(key, token, timeout=None):
+                missing[key] = cache.get(key, token)
+        versions.update(missing)
+
+    return tuple(versions[version_key(name)] for name in names)
+
+
+def bump_versions(*names):
+    """
+    give a new version token to the given names, so every value cached under the old versions becomes stale.
+    """
+    if names:
+        cache.set_many({version_key(name): uuid4().hex for name in names}, timeout=None)
+
+
+def make_key(prefix, *parts):
+    """
+    build a short cache key from a prefix and any number of parts (versions, ids, query params, ...).
+    """
+    digest = hashlib.md5(':'.join(str(part) for part in parts).encode()).hexdigest()
+    return f'{prefix}:{digest}'
+
+
+class VersionedRetrieveMixin:
+    """
+    mixin for retrieve views that caches the serialized data of the object.
+    the cache key is built from the object id and the version tokens that get_cache_version_names returns
+    (by default only the version of the object, '<model name>:<id>'), so any write that bumps one of those
+    versions makes the cached data stale.
+    the key is also sent as ETag; if the client sends it back with If-None-Match and nothing has changed,
+    the response is 304 without serializing anything.
+    these views read from the primary (a replica that lags could cache old data under the new versions).
+    """
+
+    replica_reads = False
+
+    def get_cache_version_names(self, instance):
+        """
+        return the names of the versions that the cached data of the instance depends on.
+        """
+        return (f'{instance._meta.model_name}:{instance.pk}',)
+
+    def retrieve(self, request, *args, **kwargs):
+        """
+        override this method to serve the object from cache (or 304) when its versions didn't change.
+        """
+        instance = self.get_object()
+        versions = get_versions(*self.get_cache_version_names(instance))
+        key = make_key(f'response:{instance._meta.label_lower}', instance.pk, request.get_host(), *versions)
+        etag = f'"{key.rsplit(":", 1)[-1]}"'
+        headers = {'ETag': etag, 'Cache-Control': 'private, no-cache', 'Vary': 'Authorization'}
+
+        if etag in [tag.strip() for tag in request.headers.get('If-None-Match', '').split(',')]:
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        data = cache.get(key)
+        if data is None:
+            data = self.get_serializer(instance).data
+            cache.set(key, data, timeout=settings.RESPONSE_CACHE_TIMEOUT)
+
+        return Response(data=data, headers=headers)
@@ -0,0 +1,203 @@
+import hashlib
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files.base import ContentFile
+from django.db import models, transaction
+from django.template.defaultfilters import filesizeformat
+from django.utils.html import format_html
+from PIL import Image, ImageOps, UnidentifiedImageError
+from rest_framework import serializers
+
+# file extension of each format that processed images are saved in
+IMAGE_EXTENSIONS = {'JPEG': 'jpg', 'PNG': 'png', 'WEBP': 'webp'}
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def validate_image_upload(value):
+    """
+    check the size, format and dimensions of an uploaded image (images that are already stored are not checked).
+    """
+    if getattr(value, '_committed', False):
+        return
+
+    if value.size > settings.IMAGE_MAX_UPLOAD_SIZE:
+        raise ValidationError(f'Image size must be at most {filesizeformat(settings.IMAGE_MAX_UPLOAD_SIZE)}.')
+
+    position = value.tell() if hasattr(value, 'tell') else 0
+    try:
+        with Image.open(value) as image:
+            image_format, (width, height) = image.format, image.size
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError):
+        raise ValidationError('Upload a valid image.')
+    finally:
+        value.seek(position)
+
+    if image_format not in settings.IMAGE_ALLOWED_FORMATS:
+        raise ValidationError(f'Image format must be one of {", ".join(settings.IMAGE_ALLOWED_FORMATS)}.')
+    if width * height > settings.IMAGE_MAX_PIXELS:
+        raise ValidationError('Image dimensions are too large.')
+
+
+def process_image(file):
+    """
+    apply the EXIF orientation, drop the metadata (EXIF, GPS, ...) and downsize the image to IMAGE_MAX_DIMENSION.
+    return the processed content and a file name made of its sha256 hash,
+    so the same image is stored only once however many times it is uploaded.
+    """
+    file.seek(0)
+    with Image.open(file) as image:
+        image_format = image.format if image.format in IMAGE_EXTENSIONS else 'PNG'
+        image = ImageOps.exif_transpose(image)
+        if image_format == 'JPEG' and image.mode != 'RGB':
+            image = image.convert('RGB')
+        elif image.mode not in ('RGB', 'RGBA', 'L', 'LA'):
+            image = image.convert('RGBA')
+        image.thumbnail((settings.IMAGE_MAX_DIMENSION, settings.IMAGE_MAX_DIMENSION))
+
+        buffer = BytesIO()
+        # the image is saved without the exif/icc info of the original
+        image.save(buffer, format=image_format, optimize=True, **({'quality': 85} if image_format == 'JPEG' else {}))
+
+    content = buffer.getvalue()
+    name = f'{hashlib.sha256(content).hexdigest()[:32]}.{IMAGE_EXTENSIONS[image_format]}'
+    return ContentFile(content), name
+
+
+def thumbnail_name(name, size):
+    """
+    return the storage name of the thumbnail of the image with the given name and size (pixels).
+    for example -> projects/project/2f1c.jpg -> projects/project/thumbnails/2f1c_256.jpg
+    """
+    directory, file_name = os.path.split(name)
+    stem, extension = os.path.splitext(file_name)
+    return os.path.join(directory, 'thumbnails', f'{stem}_{size}{extension}')
+
+
+def generate_thumbnails(storage, name, overwrite=False):
+    """
+    create the thumbnails of the image in every size of IMAGE_THUMBNAIL_SIZES (the existing ones are kept).
+    return the number of created thumbnails.
+    """
+    sizes = [size for size in settings.IMAGE_THUMBNAIL_SIZES.values()
+             if overwrite or not storage.exists(thumbnail_name(name, size))]
+    if not sizes:
+        return 0
+
+    with storage.open(name, 'rb') as file, Image.open(file) as original:
+        image_format = original.format if original.format in IMAGE_EXTENSIONS else 'PNG'
+        original = ImageOps.exif_transpose(original)
+        if image_format == 'JPEG' and original.mode != 'RGB':
+            original = original.convert('RGB')
+        elif original.mode not in ('RGB', 'RGBA', 'L', 'LA'):
+            original = original.convert('RGBA')
+
+        for size in sizes:
+            image = original.copy()
+            image.thumbnail((size, size))
+            buffer = BytesIO()
+            image.save(buffer, format=image_format, optimize=True)
+            target = thumbnail_name(name, size)
+            if storage.exists(target):
+                storage.delete(target)
+            storage.save(target, ContentFile(buffer.getvalue()))
+    return len(sizes)
+
+
+def get_image_executor():
+    """
+    return the thread pool that generates thumbnails (created on first use).
+    Pillow releases the GIL while resizing, so the thumbnails don't block the request threads.
+    """
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=settings.IMAGE_PROCESSING_WORKERS,
+                                               thread_name_prefix='image-processing')
+    return _executor
+
+
+def schedule_thumbnails(storage, name):
+    """
+    generate the thumbnails of the image in the image pool after the current transaction is committed.
+    """
+    transaction.on_commit(lambda: get_image_executor().submit(generate_thumbnails, storage, name))
+
+
+class ProcessedImageField(models.ImageField):
+    """
+    image field that processes the uploaded image before storing it:
+    validates it, strips its metadata, downsizes it and names it by its content hash.
+    if the same image is already stored, the stored file is used instead of storing it again.
+    the thumbnails (IMAGE_THUMBNAIL_SIZES) are generated in the image pool after the save is committed.
+    """
+
+    default_validators = [validate_image_upload]
+
+    def pre_save(self, model_instance, add):
+        """
+        override this method to store the processed image instead of the raw upload.
+        """
+        file = getattr(model_instance, self.attname)
+        if file and not file._committed:
+            content, name = process_image(file)
+            stored_name = self.generate_filename(model_instance, name)
+            if file.storage.exists(stored_name):
+                file.name = stored_name
+                file._committed = True
+                file.file = content
+            else:
+                file.save(name, content, save=False)
+            schedule_thumbnails(file.storage, file.name)
+        return file
+
+
+def thumbnail_urls(file, request=None):
+    """
+    return the urls of the thumbnails of the image file, by size label (for example {'small': ..., 'medium': ...}).
+    a thumbnail that is not generated yet (or failed) has the url of the image itself.
+    """
+    if not file:
+        return None
+    urls = {}
+    for label, size in settings.IMAGE_THUMBNAIL_SIZES.items():
+        name = thumbnail_name(file.name, size)
+        urls[label] = file.storage.url(name if file.storage.exists(name) else file.name)
+    if request is not None:
+        urls = {label: request.build_absolute_uri(url) for label, url in urls.items()}
+    return urls
+
+
+class ThumbnailImageField(serializers.ImageField):
+    """
+    image serializer field that accepts an uploaded image and returns the urls of its thumbnails
+    (the url of the image for the ones that are not generated yet).
+    """
+
+    default_validators = [validate_image_upload]
+
+    def to_representation(self, value):
+        return thumbnail_urls(value, self.context.get('request'))
+
+
+class ThumbnailAdminMixin:
+    """
+    admin mixin that shows the pre-generated small thumbnail of the image field in the list (image_thumbnail).
+    """
+
+    thumbnail_field = 'image'
+
+    def image_thumbnail(self, obj):
+        urls = thumbnail_urls(getattr(obj, self.thumbnail_field))
+        if not urls:
+            return '-'
+        return format_html('<img src="{}" style="max-height: 64px; max-width: 64px;" loading="lazy">',
+                           next(iter(urls.values())))
+
+    image_thumbnail.short_description = 'Preview'
@@ -0,0 +1,19 @@
+from django.db import connections
+
+
+def create_prefix_indexes(using, model, columns):
+    """
+    create UPPER(column) varchar_pattern_ops indexes on the given columns of the model, only on PostgreSQL.
+    these indexes serve the istartswith lookups (UPPER(column) LIKE 'PREFIX%'), like the '^' search fields of admin.
+    they are created by raw SQL after migrate, because opclass indexes in Meta would break the other databases.
+    """
+    connection = connections[using]
+    if connection.vendor != 'postgresql':
+        return
+
+    table = connection.ops.quote_name(model._meta.db_table)
+    with connection.cursor() as cursor:
+        for column in columns:
+            index_name = connection.ops.quote_name(f'{model._meta.db_table.lower()}_{column}_prefix')
+            cursor.execute(f'CREATE INDEX IF NOT EXISTS {index_name} '
+                           f'ON {table} (UPPER({connection.ops.quote_name(column)}::text) varchar_pattern_ops)')
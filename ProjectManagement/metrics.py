@@ -0,0 +1,263 @@
+import logging
+import os
+import threading
+import time
+from contextvars import ContextVar
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from rest_framework import permissions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetExceeded(Exception):
+    """
+    raised (in 'raise' budget mode) when a request runs more queries than the budget of its url name.
+    """
+
+
+class EndpointMetrics:
+    """
+    in-process store of the request metrics, aggregated by url name.
+    each worker process keeps its own numbers (the metrics endpoint shows the numbers of the worker that answers).
+    """
+
+    def __init__(self):
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def record(self, view_name, queries, sql_ms, serialize_ms, render_ms, total_ms, size):
+        with self._lock:
+            item = self._data.setdefault(view_name, {'requests': 0, 'queries': 0, 'max_queries': 0, 'sql_ms': 0.0,
+                                                     'serialize_ms': 0.0, 'render_ms': 0.0, 'total_ms': 0.0,
+                                                     'max_total_ms': 0.0, 'bytes': 0})
+            item['requests'] += 1
+            item['queries'] += queries
+            item['max_queries'] = max(item['max_queries'], queries)
+            item['sql_ms'] += sql_ms
+            item['serialize_ms'] += serialize_ms
+            item['render_ms'] += render_ms
+            item['total_ms'] += total_ms
+            item['max_total_ms'] = max(item['max_total_ms'], total_ms)
+            item['bytes'] += size
+
+    def summary(self):
+        """
+        return the metrics of each url name with averages, the most expensive (total SQL time) first.
+        """
+        with self._lock:
+            data = {name: dict(item) for name, item in self._data.items()}
+
+        results = []
+        for name, item in data.items():
+            requests = item['requests']
+            results.append({'view_name': name, 'requests': requests,
+                            'avg_queries': round(item['queries'] / requests, 2), 'max_queries': item['max_queries'],
+                            'avg_sql_ms': round(item['sql_ms'] / requests, 2),
+                            'avg_serialize_ms': round(item['serialize_ms'] / requests, 2),
+                            'avg_render_ms': round(item['render_ms'] / requests, 2),
+                            'avg_total_ms': round(item['total_ms'] / requests, 2),
+                            'max_total_ms': round(item['max_total_ms'], 2),
+                            'avg_bytes': round(item['bytes'] / requests), 'total_sql_ms': round(item['sql_ms'], 2),
+                            'budget': settings.QUERY_BUDGETS.get(name)})
+        return sorted(results, key=lambda result: result['total_sql_ms'], reverse=True)
+
+    def reset(self):
+        with self._lock:
+            self._data.clear()
+
+
+endpoint_metrics = EndpointMetrics()
+
+
+class RequestQueries:
+    """
+    counts the queries of one request and measures their time (called by count_queries).
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+
+
+request_queries = ContextVar('request_queries', default=None)
+
+
+def count_queries(execute, sql, params, many, context):
+    """
+    execute wrapper of every connection that counts the query for the current request (if any).
+    the request is found by a context variable, not by the connection: under ASGI the queries of a request run
+    on the connection of a worker thread (sync_to_async), which gets the context of the request.
+    """
+    queries = request_queries.get()
+    if queries is None:
+        return execute(sql, params, many, context)
+    return queries(execute, sql, params, many, context)
+
+
+def instrument_connection(sender=None, connection=None, **kwargs):
+    if count_queries not in connection.execute_wrappers:
+        connection.execute_wrappers.append(count_queries)
+
+
+class QueryMetricsMiddleware:
+    """
+    records the query count, SQL time, serialization time, render time (JSON encoding),
+    total time and response size of each request by its url name,
+    sends them in the Server-Timing header and checks the query budget of the url name (QUERY_BUDGETS).
+    when the budget is exceeded -> QUERY_BUDGET_MODE 'log' logs a warning, 'raise' raises QueryBudgetExceeded
+    (meant for tests, so a change that adds queries to an endpoint fails the tests).
+    works in both modes: under ASGI the chain stays async (no thread for the middleware itself).
+    the serialization time is the time of the view without its queries (from process_view to
+    process_template_response, before rendering): the to_representation of the serializers, for DRF views.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+            self.process_view = self.aprocess_view
+            self.process_template_response = self.aprocess_template_response
+        connection_created.connect(instrument_connection)
+        for alias in connections:
+            # the connections opened before this middleware was loaded
+            if connections[alias].connection is not None:
+                instrument_connection(connection=connections[alias])
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not settings.QUERY_METRICS_ENABLED:
+            return self.get_response(request)
+
+        queries, token, start = self.start(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            request_queries.reset(token)
+        return self.finish(request, response, queries, start)
+
+    async def __acall__(self, request):
+        if not settings.QUERY_METRICS_ENABLED:
+            return await self.get_response(request)
+
+        queries, token, start = self.start(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            request_queries.reset(token)
+        return self.finish(request, response, queries, start)
+
+    @staticmethod
+    def start(request):
+        queries = RequestQueries()
+        request._view_start = None
+        request._serialize_time = request._render_time = 0.0
+        return queries, request_queries.set(queries), time.perf_counter()
+
+    def finish(self, request, response, queries, start):
+        """
+        record the metrics of the request, add the Server-Timing header and check the query budget.
+        """
+        total = time.perf_counter() - start
+
+        match = getattr(request, 'resolver_match', None)
+        view_name = match.view_name if match else 'unresolved'
+        size = 0 if response.streaming else len(response.content)
+        endpoint_metrics.record(view_name, queries.count, queries.duration * 1000, request._serialize_time * 1000,
+                                request._render_time * 1000, total * 1000, size)
+
+        response['Server-Timing'] = (f'db;dur={queries.duration * 1000:.2f};desc="{queries.count} queries", '
+                                     f'serialize;dur={request._serialize_time * 1000:.2f}, '
+                                     f'render;dur={request._render_time * 1000:.2f}, total;dur={total * 1000:.2f}')
+
+        self.check_budget(view_name, queries.count)
+        return response
+
+    @staticmethod
+    def start_view(request):
+        """
+        keep the start of the view and the SQL time before it, to measure the serialization time.
+        """
+        queries = request_queries.get()
+        if queries is not None:
+            request._view_start = time.perf_counter(), queries.duration
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        self.start_view(request)
+
+    async def aprocess_view(self, request, view_func, view_args, view_kwargs):
+        self.start_view(request)
+
+    @staticmethod
+    def measure_render(request, response):
+        """
+        measure the serialization time of the view (its time without its queries) and the rendering time
+        of the response (for DRF responses, the JSON encoding).
+        """
+        start = time.perf_counter()
+        queries = request_queries.get()
+        if queries is not None and getattr(request, '_view_start', None):
+            view_start, sql_before = request._view_start
+            request._serialize_time = max(start - view_start - (queries.duration - sql_before), 0.0)
+
+        def finish_render(rendered_response):
+            request._render_time += time.perf_counter() - start
+
+        response.add_post_render_callback(finish_render)
+        return response
+
+    def process_template_response(self, request, response):
+        return self.measure_render(request, response)
+
+    async def aprocess_template_response(self, request, response):
+        return self.measure_render(request, response)
+
+    @staticmethod
+    def check_budget(view_name, count):
+        budget = settings.QUERY_BUDGETS.get(view_name)
+        if budget is None or count <= budget:
+            return
+        message = f'{view_name} ran {count} queries, its budget is {budget}.'
+        if settings.QUERY_BUDGET_MODE == 'raise':
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
+
+
+class QueryMetricsView(APIView):
+    """
+    This view shows the request metrics of this worker process, grouped by url name.
+    delete -> reset the metrics
+    permission ->  Only staff users
+    """
+
+    permission_classes = (permissions.IsAdminUser,)
+
+    def get(self, request, *args, **kwargs):
+        """
+        this method returns the metrics of each url name, the most expensive (total SQL time) first.
+        """
+        return Response(data={'pid': os.getpid(), 'results': endpoint_metrics.summary()}, status=status.HTTP_200_OK)
+
+    def delete(self, request, *args, **kwargs):
+        """
+        this method clears the collected metrics.
+        """
+        endpoint_metrics.reset()
+        return Response(status=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,162 @@
+import random
+from contextvars import ContextVar
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+
+# routing state of the current request (None outside the requests, for example in management commands)
+_routing = ContextVar('replica_routing', default=None)
+
+
+def replica_aliases():
+    """
+    return the aliases of the configured replica databases.
+    """
+    return [alias for alias in settings.DATABASES if alias != 'default']
+
+
+def pin_key(user_id):
+    return f'replica-pin:{user_id}'
+
+
+class RoutingState:
+    """
+    replica routing state of one request.
+    replica -> the request may read from a replica (a safe request of a view in REPLICA_READ_VIEW_MODULES)
+    pinned -> the request wrote (or its user wrote a moment ago), so its reads stay on the primary
+    """
+
+    def __init__(self, request, replica):
+        self.request = request
+        self.replica = replica
+        self.pinned = False
+        self.wrote = False
+        self.alias = None
+        self._user_checked = False
+
+    def user_pinned(self):
+        """
+        check (once, after the user is authenticated) whether the user wrote in the last REPLICA_PIN_SECONDS.
+        """
+        if self._user_checked:
+            return False
+        # evaluating the lazy user of the session can read the database, that must not check again
+        self._user_checked = True
+        user = getattr(self.request, 'user', None)
+        if user is None or not user.is_authenticated:
+            # not authenticated yet (DRF authenticates in the view), check again at the next read
+            self._user_checked = False
+            return False
+        self.pinned = cache.get(pin_key(user.pk), False)
+        return self.pinned
+
+
+class ReplicaRouter:
+    """
+    database router that sends the reads of safe requests (GET, HEAD, OPTIONS) of the views in
+    REPLICA_READ_VIEW_MODULES to a replica (one replica for the whole request) and everything else to the primary.
+    reads stay on the primary (read-your-writes):
+    - for the rest of the request after its first write and inside transactions
+    - for REPLICA_PIN_SECONDS after a write of the same user (pinned in the cache by ReplicaRoutingMiddleware)
+    - outside the requests (management commands, background jobs)
+    """
+
+    def db_for_read(self, model, **hints):
+        state = _routing.get()
+        if state is None or not state.replica or state.pinned:
+            return None
+        if connections['default'].in_atomic_block or state.user_pinned():
+            return None
+        if state.alias is None:
+            state.alias = random.choice(replica_aliases())
+        return state.alias
+
+    def db_for_write(self, model, **hints):
+        state = _routing.get()
+        if state is not None:
+            state.pinned = state.wrote = True
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # the replicas have the same data as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # the replicas get the schema from the primary by replication
+        return db == 'default'
+
+
+class ReplicaRoutingMiddleware:
+    """
+    sets the replica routing state of each request (ReplicaRouter)
+    and pins the user to the primary for REPLICA_PIN_SECONDS after a request that wrote.
+    views can opt out of the replicas with `replica_reads = False`.
+    works in both modes: under ASGI the chain stays async (the routing state is a context variable, so the
+    queries that the async ORM runs in a worker thread see the state of their request).
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+            self.process_view = self.aprocess_view
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        state = RoutingState(request, replica=False)
+        token = _routing.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _routing.reset(token)
+
+        if state.wrote:
+            self.pin_user(request)
+        return response
+
+    async def __acall__(self, request):
+        state = RoutingState(request, replica=False)
+        token = _routing.set(state)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _routing.reset(token)
+
+        if state.wrote:
+            # the lazy user of the session may read the database
+            await sync_to_async(self.pin_user)(request)
+        return response
+
+    @staticmethod
+    def pin_user(request):
+        """
+        keep the reads of the user (that wrote in this request) on the primary for REPLICA_PIN_SECONDS.
+        """
+        user = getattr(request, 'user', None)
+        if user is not None and user.is_authenticated:
+            cache.set(pin_key(user.pk), True, timeout=settings.REPLICA_PIN_SECONDS)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        return self.select_reads(request, view_func)
+
+    async def aprocess_view(self, request, view_func, view_args, view_kwargs):
+        return self.select_reads(request, view_func)
+
+    @staticmethod
+    def select_reads(request, view_func):
+        """
+        let the safe requests of the views in REPLICA_READ_VIEW_MODULES read from a replica.
+        """
+        state = _routing.get()
+        if state is None or not replica_aliases() or request.method not in ('GET', 'HEAD', 'OPTIONS'):
+            return None
+        view_class = getattr(view_func, 'cls', None) or getattr(view_func, 'view_class', None)
+        state.replica = (view_func.__module__ in settings.REPLICA_READ_VIEW_MODULES
+                         and getattr(view_class, 'replica_reads', True))
+        return None
@@ -44,6 +44,9 @@ INSTALLED_APPS = [
     'Accounts',
     'Projects',
     'Financials',
+    'Search',
+    'Audit',
+    'Sync',
 ]
 
 if PRODUCTION is False:
@@ -52,6 +55,9 @@ if PRODUCTION is False:
 AUTH_USER_MODEL = 'Accounts.CustomUser'
 
 MIDDLEWARE = [
+    'ProjectManagement.metrics.QueryMetricsMiddleware',
+    'ProjectManagement.routers.ReplicaRoutingMiddleware',
+    'Audit.recorder.AuditMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -61,6 +67,14 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# request metrics (query count, SQL/serialization/render time, response size per url name) and query budgets.
+# QUERY_BUDGETS -> {url name: max queries}, for example {'projects:create_list_task': 10, 'update_payment_method': 8}
+# QUERY_BUDGET_MODE -> 'log' or 'raise' (for tests)
+
+QUERY_METRICS_ENABLED = config('QUERY_METRICS_ENABLED', default=True, cast=bool)
+QUERY_BUDGET_MODE = config('QUERY_BUDGET_MODE', default='log')
+QUERY_BUDGETS = {}
+
 ROOT_URLCONF = 'ProjectManagement.urls'
 
 TEMPLATES = [
@@ -84,6 +98,20 @@ WSGI_APPLICATION = 'ProjectManagement.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
+# seconds that a connection is reused by the following requests of a worker (0 -> a new connection per request)
+# and whether a reused connection is checked before the request uses it
+DB_CONN_MAX_AGE = config('DB_CONN_MAX_AGE', default=60, cast=int)
+DB_CONN_HEALTH_CHECKS = config('DB_CONN_HEALTH_CHECKS', default=True, cast=bool)
+
+# psycopg3 connection pool of each worker process (needs DB_ENGINE=django.db.backends.postgresql and
+# `pip install "psycopg[binary,pool]"`), used instead of the persistent connection when enabled.
+# workers * DB_POOL_MAX_SIZE must stay below max_connections of the Postgres server.
+DB_POOL = config('DB_POOL', default=False, cast=bool)
+DB_POOL_MIN_SIZE = config('DB_POOL_MIN_SIZE', default=2, cast=int)
+DB_POOL_MAX_SIZE = config('DB_POOL_MAX_SIZE', default=4, cast=int)
+DB_POOL_TIMEOUT = config('DB_POOL_TIMEOUT', default=10, cast=float)
+DB_POOL_MAX_LIFETIME = config('DB_POOL_MAX_LIFETIME', default=3600, cast=float)
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
@@ -101,9 +129,61 @@ if PRODUCTION:
             "PASSWORD": config('DB_PASSWORD'),
             "HOST": config('DB_HOST'),
             "PORT": config('DB_PORT'),
+            "CONN_MAX_AGE": DB_CONN_MAX_AGE,
+            "CONN_HEALTH_CHECKS": DB_CONN_HEALTH_CHECKS,
+        }
+    }
+
+    if DB_POOL:
+        # the pool keeps the connections, so Django must not keep its own persistent connection
+        DATABASES['default']['CONN_MAX_AGE'] = 0
+        DATABASES['default']['OPTIONS'] = {
+            'pool': {
+                'min_size': DB_POOL_MIN_SIZE,
+                'max_size': DB_POOL_MAX_SIZE,
+                'timeout': DB_POOL_TIMEOUT,
+                'max_lifetime': DB_POOL_MAX_LIFETIME,
+            }
+        }
+
+# read replicas (ProjectManagement/routers.py): the safe requests of REPLICA_READ_VIEW_MODULES read from a replica.
+# DB_REPLICAS -> comma separated hosts (host or host:port) of the Postgres replicas in production,
+#                names of SQLite database files in development (to try the routing with two local databases).
+# a user reads from the primary for REPLICA_PIN_SECONDS after a request that wrote (longer than the replication lag).
+DB_REPLICAS = config('DB_REPLICAS', default='', cast=Csv())
+REPLICA_PIN_SECONDS = config('REPLICA_PIN_SECONDS', default=5, cast=int)
+REPLICA_READ_VIEW_MODULES = ['Projects.views', 'Financials.views', 'Search.views', 'Sync.views']
+
+for number, replica in enumerate(DB_REPLICAS, start=1):
+    if PRODUCTION:
+        host, _, port = replica.partition(':')
+        replica_settings = {**DATABASES['default'], 'HOST': host, 'PORT': port or DATABASES['default']['PORT']}
+    else:
+        replica_settings = {**DATABASES['default'], 'NAME': BASE_DIR / replica}
+    # the tests use the primary as the replica
+    DATABASES[f'replica{number}'] = {**replica_settings, 'TEST': {'MIRROR': 'default'}}
+
+DATABASE_ROUTERS = ['ProjectManagement.routers.ReplicaRouter']
+
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+if PRODUCTION:
+    CACHES = {
+        'default': {
+            'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.redis.RedisCache'),
+            'LOCATION': config('CACHE_LOCATION', default='redis://127.0.0.1:6379'),
         }
     }
 
+RESPONSE_CACHE_TIMEOUT = config('RESPONSE_CACHE_TIMEOUT', default=600, cast=int)
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
@@ -122,6 +202,68 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Password hashing
+# the first hasher hashes new passwords, the others only verify old hashes (which are rehashed on login).
+# run "python manage.py benchmark_password_hashers" to choose the hasher and its parameters.
+
+PASSWORD_HASHERS = config('PASSWORD_HASHERS', cast=Csv(), default=','.join([
+    'Accounts.hashers.TunedPBKDF2PasswordHasher',
+    'Accounts.hashers.TunedArgon2PasswordHasher',
+    'Accounts.hashers.TunedBCryptSHA256PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]))
+
+# hasher parameters, 0 -> django's default
+PASSWORD_PBKDF2_ITERATIONS = config('PASSWORD_PBKDF2_ITERATIONS', default=0, cast=int)
+PASSWORD_ARGON2_TIME_COST = config('PASSWORD_ARGON2_TIME_COST', default=0, cast=int)
+PASSWORD_ARGON2_MEMORY_COST = config('PASSWORD_ARGON2_MEMORY_COST', default=0, cast=int)
+PASSWORD_ARGON2_PARALLELISM = config('PASSWORD_ARGON2_PARALLELISM', default=0, cast=int)
+PASSWORD_BCRYPT_ROUNDS = config('PASSWORD_BCRYPT_ROUNDS', default=0, cast=int)
+
+# threads that run password hashing for login and registration, and seconds a request waits for a free one
+PASSWORD_HASHING_WORKERS = config('PASSWORD_HASHING_WORKERS', default=2, cast=int)
+PASSWORD_HASHING_QUEUE_TIMEOUT = config('PASSWORD_HASHING_QUEUE_TIMEOUT', default=5, cast=float)
+
+AUTHENTICATION_BACKENDS = ['Accounts.backends.PooledModelBackend']
+
+# bulk user provisioning: processes that hash the passwords in the provision_users command (0 -> number of cores)
+# and max users per request (a request hashes them in the PASSWORD_HASHING_WORKERS threads)
+USER_PROVISIONING_WORKERS = config('USER_PROVISIONING_WORKERS', default=0, cast=int)
+USER_PROVISIONING_MAX_BATCH = config('USER_PROVISIONING_MAX_BATCH', default=10000, cast=int)
+
+# user search: default and max number of results, trigram (match anywhere) indexes on PostgreSQL,
+# and the p95 latency target (milliseconds) that benchmark_user_search checks
+USER_SEARCH_LIMIT = config('USER_SEARCH_LIMIT', default=10, cast=int)
+USER_SEARCH_MAX_LIMIT = config('USER_SEARCH_MAX_LIMIT', default=50, cast=int)
+USER_SEARCH_TRIGRAM = config('USER_SEARCH_TRIGRAM', default=False, cast=bool)
+USER_SEARCH_P95_TARGET_MS = config('USER_SEARCH_P95_TARGET_MS', default=50, cast=float)
+
+# number of active assignments (manager or expert of projects, tasks and subtasks) that a user can have at once,
+# more than this shows as an overallocation in the workload endpoints
+WORKLOAD_MAX_ASSIGNMENTS = config('WORKLOAD_MAX_ASSIGNMENTS', default=3, cast=int)
+
+# my work (projects, tasks and subtasks of the user in any role): default and max page size
+MY_WORK_LIMIT = config('MY_WORK_LIMIT', default=20, cast=int)
+MY_WORK_MAX_LIMIT = config('MY_WORK_MAX_LIMIT', default=100, cast=int)
+
+# full-text search (Search app): default and max number of results, max words of a query,
+# and the text search configuration of PostgreSQL (language of the stemming, 'simple' for no stemming)
+SEARCH_LIMIT = config('SEARCH_LIMIT', default=20, cast=int)
+SEARCH_MAX_LIMIT = config('SEARCH_MAX_LIMIT', default=50, cast=int)
+SEARCH_MAX_TERMS = config('SEARCH_MAX_TERMS', default=8, cast=int)
+SEARCH_CONFIG = config('SEARCH_CONFIG', default='simple')
+
+# audit events api: default and max page size
+AUDIT_LIMIT = config('AUDIT_LIMIT', default=50, cast=int)
+AUDIT_MAX_LIMIT = config('AUDIT_MAX_LIMIT', default=200, cast=int)
+
+# sync api (change feed of the offline clients): default and max page size,
+# and the days a tombstone (deleted object) is kept (prune_tombstones)
+SYNC_LIMIT = config('SYNC_LIMIT', default=100, cast=int)
+SYNC_MAX_LIMIT = config('SYNC_MAX_LIMIT', default=500, cast=int)
+SYNC_TOMBSTONE_DAYS = config('SYNC_TOMBSTONE_DAYS', default=90, cast=int)
+
 # Internationalization
 # https://docs.djangoproject.com/en/5.1/topics/i18n/
 
@@ -140,6 +282,21 @@ STATIC_URL = 'static/'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# uploaded images: max file size (bytes), max pixels, accepted formats, max width/height of the stored image,
+# thumbnail sizes (label -> pixels) and threads that generate the thumbnails
+IMAGE_MAX_UPLOAD_SIZE = config('IMAGE_MAX_UPLOAD_SIZE', default=5 * 1024 * 1024, cast=int)
+IMAGE_MAX_PIXELS = config('IMAGE_MAX_PIXELS', default=40_000_000, cast=int)
+IMAGE_ALLOWED_FORMATS = ('JPEG', 'PNG', 'WEBP', 'GIF')
+IMAGE_MAX_DIMENSION = config('IMAGE_MAX_DIMENSION', default=2048, cast=int)
+IMAGE_THUMBNAIL_SIZES = {'small': 64, 'medium': 256}
+IMAGE_PROCESSING_WORKERS = config('IMAGE_PROCESSING_WORKERS', default=2, cast=int)
+
+# admin changelists: tables with more rows than the threshold show estimated counts,
+# and their filtered lists count at most ADMIN_COUNT_LIMIT rows
+
+ADMIN_ESTIMATED_COUNT_THRESHOLD = config('ADMIN_ESTIMATED_COUNT_THRESHOLD', default=100000, cast=int)
+ADMIN_COUNT_LIMIT = config('ADMIN_COUNT_LIMIT', default=10000, cast=int)
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
 
@@ -149,7 +306,7 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'Accounts.authentication.CachedJWTAuthentication',
     )
 }
 
@@ -158,8 +315,22 @@ SIMPLE_JWT = {
     "REFRESH_TOKEN_LIFETIME": timedelta(days=30),
     'ROTATE_REFRESH_TOKENS': True,
     'BLACKLIST_AFTER_ROTATION': True,
+    'TOKEN_REFRESH_SERIALIZER': 'Accounts.serializers.TokenRefreshSerializer',
 }
 
+# seconds between rebuilds of the token blacklist bloom filter, and its false positive rate
+TOKEN_BLACKLIST_BLOOM_REFRESH = config('TOKEN_BLACKLIST_BLOOM_REFRESH', default=300, cast=int)
+TOKEN_BLACKLIST_BLOOM_ERROR_RATE = config('TOKEN_BLACKLIST_BLOOM_ERROR_RATE', default=0.001, cast=float)
+
+# seconds that an authenticated user stays in the shared cache and in the worker's own cache
+AUTH_USER_CACHE_TIMEOUT = config('AUTH_USER_CACHE_TIMEOUT', default=300, cast=int)
+AUTH_USER_LOCAL_CACHE_TIMEOUT = config('AUTH_USER_LOCAL_CACHE_TIMEOUT', default=5, cast=int)
+AUTH_USER_LOCAL_CACHE_SIZE = config('AUTH_USER_LOCAL_CACHE_SIZE', default=10000, cast=int)
+
+# cached financial reports
+
+FINANCIAL_SUMMARY_CACHE_TIMEOUT = config('FINANCIAL_SUMMARY_CACHE_TIMEOUT', default=300, cast=int)
+
 # smtp
 EMAIL_BACKEND = config('EMAIL_BACKEND')
 EMAIL_HOST = config('EMAIL_HOST')
@@ -168,3 +339,11 @@ EMAIL_PORT = config('EMAIL_PORT')
 EMAIL_HOST_PASSWORD = config('EMAIL_HOST_PASSWORD')
 EMAIL_USE_TLS = config('EMAIL_USE_TLS', default=True, cast=bool)
 DEFAULT_FROM_EMAIL = config('DEFAULT_FROM_EMAIL')
+
+# outbound email queue (sent by the send_queued_emails command),
+# and the days the sent and failed emails are kept (prune_outbound_emails)
+EMAIL_OUTBOX_BATCH_SIZE = config('EMAIL_OUTBOX_BATCH_SIZE', default=100, cast=int)
+EMAIL_OUTBOX_MAX_ATTEMPTS = config('EMAIL_OUTBOX_MAX_ATTEMPTS', default=5, cast=int)
+EMAIL_OUTBOX_RETRY_DELAY = config('EMAIL_OUTBOX_RETRY_DELAY', default=60, cast=int)
+EMAIL_OUTBOX_SENDING_TIMEOUT = config('EMAIL_OUTBOX_SENDING_TIMEOUT', default=600, cast=int)
+EMAIL_OUTBOX_KEEP_DAYS = config('EMAIL_OUTBOX_KEEP_DAYS', default=7, cast=int)
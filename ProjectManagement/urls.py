@@ -21,6 +21,7 @@ from django.conf.urls.static import static
 from rest_framework import permissions
 from drf_yasg.views import get_schema_view
 from drf_yasg import openapi
+from .metrics import QueryMetricsView
 
 schema_view = get_schema_view(
    openapi.Info(
@@ -38,6 +39,10 @@ urlpatterns = [
     path('accounts/', include('Accounts.urls')),
     path('projects/', include('Projects.urls')),
     path('financials/', include('Financials.urls')),
+    path('search/', include('Search.urls')),
+    path('audit/', include('Audit.urls')),
+    path('sync/', include('Sync.urls')),
+    path('metrics/queries/', QueryMetricsView.as_view(), name='query_metrics'),
     path('swagger<format>/', schema_view.without_ui(cache_timeout=0), name='schema-json'),
     path('swagger/', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
     path('redoc/', schema_view.with_ui('redoc', cache_timeout=0), name='schema-redoc'),
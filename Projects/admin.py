@@ -1,52 +1,66 @@
 from django.contrib import admin
 from .models import Project, Task, SubTask
-import admin_thumbnails
+from ProjectManagement.images import ThumbnailAdminMixin
+from ProjectManagement.paginators import EstimatedCountPaginator
 
 
-@admin_thumbnails.thumbnail('image')
-class ProjectAdmin(admin.ModelAdmin):
+class ProjectAdmin(ThumbnailAdminMixin, admin.ModelAdmin):
     """
     manage project instances in admin panel.
     Provides additional display, filtering, and searching options
-    search by -> title, CEO, category
-    filter by -> status
+    search by -> beginning of title, beginning of CEO's email or last name
+    filter by -> status, category
+    the list loads the CEO in the same query and shows estimated counts for large tables.
     """
 
     list_display = ('title', 'ceo', 'image_thumbnail', 'status', 'budget')
-    search_fields = ('title', 'ceo', 'category')
-    list_filter = ('status',)
+    list_select_related = ('ceo',)
+    search_fields = ('^title', '^ceo__email', '^ceo__last_name')
+    list_filter = ('status', 'category')
+    raw_id_fields = ('ceo', 'experts')
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
 
 admin.site.register(Project, ProjectAdmin)
 
 
 
-@admin_thumbnails.thumbnail('image')
-class TaskAdmin(admin.ModelAdmin):
+class TaskAdmin(ThumbnailAdminMixin, admin.ModelAdmin):
     """
     manage task instances in admin panel.
     Provides additional display, filtering, and searching options
-    search by -> title, manager, category
-    filter by -> status
+    search by -> beginning of title, beginning of manager's email or last name, beginning of project's title
+    filter by -> status, category
+    the list loads the manager, project and project's CEO in the same query and shows estimated counts for large tables.
     """
 
     list_display = ('title', 'manager', 'project__ceo', 'project__title', 'image_thumbnail', 'status', 'budget')
-    search_fields = ('title', 'manager', 'category', 'project__title')
-    list_filter = ('status',)
+    list_select_related = ('manager', 'project__ceo')
+    search_fields = ('^title', '^manager__email', '^manager__last_name', '^project__title')
+    list_filter = ('status', 'category')
+    raw_id_fields = ('project', 'manager', 'experts')
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
 
 admin.site.register(Task, TaskAdmin)
 
 
-@admin_thumbnails.thumbnail('image')
-class SubTaskAdmin(admin.ModelAdmin):
+class SubTaskAdmin(ThumbnailAdminMixin, admin.ModelAdmin):
     """
     manage subtask instances in admin panel.
     Provides additional display, filtering, and searching options
-    search by -> title, manager, category
-    filter by -> status
+    search by -> beginning of title, beginning of manager's email or last name, beginning of task's title
+    filter by -> status, category
+    the list loads the manager, task, project and project's CEO in the same query
+    and shows estimated counts for large tables.
     """
 
     list_display = ('title', 'manager', 'task__project__ceo', 'task__title', 'task__project__title', 'image_thumbnail', 'status', 'budget')
-    search_fields = ('title', 'manager', 'category', 'task__title')
-    list_filter = ('status',)
+    list_select_related = ('manager', 'task__project__ceo')
+    search_fields = ('^title', '^manager__email', '^manager__last_name', '^task__title')
+    list_filter = ('status', 'category')
+    raw_id_fields = ('task', 'manager', 'experts')
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
 
-admin.site.register(SubTask, SubTaskAdmin)
\ No newline at end of file
+admin.site.register(SubTask, SubTaskAdmin)
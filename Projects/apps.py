@@ -6,4 +6,6 @@ class ProjectsConfig(AppConfig):
     name = 'Projects'
 
     def ready(self):
+        from django.db.models.signals import post_migrate
         from . import signals
+        post_migrate.connect(receiver=signals.create_title_search_indexes, sender=self)
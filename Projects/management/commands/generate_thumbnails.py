@@ -0,0 +1,47 @@
+from concurrent.futures import ThreadPoolExecutor
+from django.apps import apps
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from ProjectManagement.images import ProcessedImageField, generate_thumbnails
+
+
+class Command(BaseCommand):
+    """
+    generate the missing thumbnails of every stored image (of all models with a processed image field),
+    including the default images. each distinct file is processed once, in a thread pool.
+    this command is meant to be run once after deploying the image pipeline and after changing the thumbnail sizes.
+    """
+
+    help = 'Generate missing thumbnails of the stored images.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--overwrite', action='store_true',
+                            help='Generate the thumbnails again even if they exist.')
+        parser.add_argument('--workers', type=int, default=None,
+                            help='Number of threads (default: IMAGE_PROCESSING_WORKERS).')
+
+    def handle(self, *args, **options):
+        files = set()
+        for model in apps.get_models():
+            for field in model._meta.concrete_fields:
+                if isinstance(field, ProcessedImageField):
+                    names = set(model._default_manager.exclude(**{field.name: ''})
+                                .values_list(field.name, flat=True).distinct())
+                    if isinstance(field.default, str):
+                        names.add(field.default)
+                    files.update((field.storage, name) for name in names)
+
+        created = missing = 0
+        with ThreadPoolExecutor(max_workers=options['workers'] or settings.IMAGE_PROCESSING_WORKERS) as executor:
+            futures = {executor.submit(generate_thumbnails, storage, name, options['overwrite']): name
+                       for storage, name in files}
+            for future, name in futures.items():
+                try:
+                    created += future.result()
+                except OSError as e:
+                    missing += 1
+                    self.stderr.write(f'{name}: {e}')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'{len(files)} images checked, {created} thumbnails created, {missing} images could not be read.'))
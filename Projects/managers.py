@@ -0,0 +1,31 @@
+from django.db import models
+from django.db.models import Q
+
+
+class TaskQuerySet(models.QuerySet):
+    """
+    queryset of task model.
+    """
+
+    def authorized_for(self, user):
+        """
+        return the tasks that the user is allowed to see (same rules as the permissions):
+            project CEO, task manager, experts
+        """
+        experts = self.model.experts.through.objects.filter(customuser=user).values('task_id')
+        return self.filter(Q(project__ceo=user) | Q(manager=user) | Q(pk__in=experts))
+
+
+class SubTaskQuerySet(models.QuerySet):
+    """
+    queryset of subtask model.
+    """
+
+    def authorized_for(self, user):
+        """
+        return the subtasks that the user is allowed to see (same rules as the permissions):
+            project CEO, task manager, subtask manager, experts
+        """
+        experts = self.model.experts.through.objects.filter(customuser=user).values('subtask_id')
+        return self.filter(Q(task__project__ceo=user) | Q(task__manager=user) | Q(manager=user) |
+                           Q(pk__in=experts))
@@ -5,9 +5,12 @@ from django.utils.timezone import now
 from django.contrib.contenttypes.fields import GenericRelation
 from django.contrib.contenttypes.models import ContentType
 from Financials.models import FinancialOutcomeRecord
+from ProjectManagement.images import ProcessedImageField
+from Sync.sequence import SyncedModel
+from .managers import TaskQuerySet, SubTaskQuerySet
 
 
-class Project(models.Model):
+class Project(SyncedModel):
     """
     project model stores user projects information.
     user can enter -> title, experts, description, category, budget, start and end date of project
@@ -31,7 +34,7 @@ class Project(models.Model):
     ceo = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='project_ceo')
     experts = models.ManyToManyField(CustomUser, related_name='project_experts')
     description = models.TextField()
-    image = models.ImageField(upload_to='projects/project/', default='projects/default/project_d.png')
+    image = ProcessedImageField(upload_to='projects/project/', default='projects/default/project_d.png')
     category = models.CharField(choices=CATEGORY_OPTIONS, max_length=6)
     start_date = models.DateField(null=True, blank=True)
     end_date = models.DateField(null=True, blank=True)
@@ -172,7 +175,7 @@ class Project(models.Model):
 
 
 
-class Task(models.Model):
+class Task(SyncedModel):
     """
     task model stores user task information.
     user can enter -> title, experts, description, category, budget, start and end date of task
@@ -197,7 +200,7 @@ class Task(models.Model):
     manager = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='task_manager')
     experts = models.ManyToManyField(CustomUser, related_name='task_experts')
     description = models.TextField()
-    image = models.ImageField(upload_to='projects/task/', default='projects/default/task_d.png')
+    image = ProcessedImageField(upload_to='projects/task/', default='projects/default/task_d.png')
     category = models.CharField(choices=CATEGORY_OPTIONS, max_length=6)
     start_date = models.DateField(null=True, blank=True)
     end_date = models.DateField(null=True, blank=True)
@@ -207,6 +210,8 @@ class Task(models.Model):
     completion_date = models.DateField(null=True, blank=True)
     financial_object_type = GenericRelation(FinancialOutcomeRecord, related_name='task')
 
+    objects = TaskQuerySet.as_manager()
+
     def __str__(self):
         return self.title
 
@@ -343,7 +348,7 @@ class Task(models.Model):
         return c.id
 
 
-class SubTask(models.Model):
+class SubTask(SyncedModel):
     """
     subtask model stores user subtask information.
     user can enter -> title, experts, description, category, budget, start and end date of task
@@ -368,7 +373,7 @@ class SubTask(models.Model):
     manager = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='subtask_manager')
     experts = models.ManyToManyField(CustomUser, related_name='subtask_experts')
     description = models.TextField()
-    image = models.ImageField(upload_to='projects/subtask/', default='projects/default/subtask_d.png')
+    image = ProcessedImageField(upload_to='projects/subtask/', default='projects/default/subtask_d.png')
     category = models.CharField(choices=CATEGORY_OPTIONS, max_length=6)
     start_date = models.DateField(null=True, blank=True)
     end_date = models.DateField(null=True, blank=True)
@@ -378,6 +383,8 @@ class SubTask(models.Model):
     completion_date = models.DateField(null=True, blank=True)
     financial_object_type = GenericRelation(FinancialOutcomeRecord, related_name='subtask')
 
+    objects = SubTaskQuerySet.as_manager()
+
     def __str__(self):
         return self.title
 
@@ -517,3 +524,43 @@ class SubTask(models.Model):
 
 
 
+
+
+class TaskDependency(models.Model):
+    """
+    dependency between two tasks of a project (finish to start):
+    the successor can start `lag` days after the predecessor finishes.
+    """
+    predecessor = models.ForeignKey(Task, on_delete=models.CASCADE, related_name='successor_dependencies')
+    successor = models.ForeignKey(Task, on_delete=models.CASCADE, related_name='predecessor_dependencies')
+    lag = models.PositiveSmallIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=('predecessor', 'successor'), name='unique_task_dependency'),
+            models.CheckConstraint(condition=~models.Q(predecessor=models.F('successor')),
+                                   name='task_dependency_not_self'),
+        ]
+
+    def __str__(self):
+        return f'{self.predecessor_id} -> {self.successor_id}'
+
+
+class SubTaskDependency(models.Model):
+    """
+    dependency between two subtasks of a project (finish to start), the subtasks can be in different tasks:
+    the successor can start `lag` days after the predecessor finishes.
+    """
+    predecessor = models.ForeignKey(SubTask, on_delete=models.CASCADE, related_name='successor_dependencies')
+    successor = models.ForeignKey(SubTask, on_delete=models.CASCADE, related_name='predecessor_dependencies')
+    lag = models.PositiveSmallIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=('predecessor', 'successor'), name='unique_subtask_dependency'),
+            models.CheckConstraint(condition=~models.Q(predecessor=models.F('successor')),
+                                   name='subtask_dependency_not_self'),
+        ]
+
+    def __str__(self):
+        return f'{self.predecessor_id} -> {self.successor_id}'
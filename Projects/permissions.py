@@ -17,6 +17,16 @@ class CanUpdateDeleteProject(permissions.BasePermission):
             return obj.ceo == request.user
 
 
+class CanSeeProjectSchedule(permissions.BasePermission):
+    """
+    custom permission to allow only the project CEO to see the schedule of the project
+    (it has every task and subtask of the project and their dependencies, like the task list).
+    method -> GET: project CEO
+    """
+    def has_object_permission(self, request, view, obj):
+        return obj.ceo == request.user
+
+
 class CanCreateSeeTask(permissions.BasePermission):
     """
     custom permission to allow the project CEO to create or view tasks within the project.
@@ -73,3 +83,14 @@ class CanUpdateDeleteSubTask(permissions.BasePermission):
             return request.user == obj.task.project.ceo or request.user == obj.task.manager or request.user == obj.manager or experts.exists()
         else:
             return request.user == obj.task.project.ceo or request.user == obj.task.manager or request.user == obj.manager
+
+
+class CanDeleteDependency(permissions.BasePermission):
+    """
+    custom permission to allow only the project CEO to delete a task or subtask dependency of the project.
+    method -> DELETE: project CEO
+    """
+    def has_object_permission(self, request, view, obj):
+        predecessor = obj.predecessor
+        project = predecessor.project if isinstance(predecessor, Task) else predecessor.task.project
+        return request.user == project.ceo
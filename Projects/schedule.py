@@ -0,0 +1,97 @@
+from collections import deque
+
+
+class DependencyCycle(ValueError):
+    """
+    raised when the dependencies of the scheduled nodes have a cycle (the schedule cannot be computed).
+    """
+
+
+def compute_schedule(durations, edges):
+    """
+    compute the critical path schedule (finish-to-start dependencies with lag) of the nodes.
+    durations -> {node id: duration in days}
+    edges -> iterable of (predecessor id, successor id, lag in days)
+    return -> {'finish': project duration, 'nodes': {node id: (earliest start, earliest finish, latest start,
+               latest finish, slack)}, 'critical_path': [critical node ids in topological order]}
+    the offsets are days from the start of the schedule.
+    one forward and one backward pass over the topological order (Kahn's algorithm), so the cost is linear in
+    nodes plus edges.
+    """
+    ids = list(durations)
+    index = {node_id: position for position, node_id in enumerate(ids)}
+    size = len(ids)
+    duration = [durations[node_id] for node_id in ids]
+    successors = [[] for _ in range(size)]
+    predecessors = [[] for _ in range(size)]
+    in_degree = [0] * size
+    for predecessor, successor, lag in edges:
+        p, s = index[predecessor], index[successor]
+        successors[p].append((s, lag))
+        predecessors[s].append((p, lag))
+        in_degree[s] += 1
+
+    order = []
+    queue = deque(position for position in range(size) if not in_degree[position])
+    while queue:
+        position = queue.popleft()
+        order.append(position)
+        for successor, _lag in successors[position]:
+            in_degree[successor] -= 1
+            if not in_degree[successor]:
+                queue.append(successor)
+    if len(order) != size:
+        raise DependencyCycle('The dependencies have a cycle.')
+
+    earliest_start = [0] * size
+    earliest_finish = [0] * size
+    for position in order:
+        start = 0
+        for predecessor, lag in predecessors[position]:
+            start = max(start, earliest_finish[predecessor] + lag)
+        earliest_start[position] = start
+        earliest_finish[position] = start + duration[position]
+
+    finish = max(earliest_finish, default=0)
+    latest_start = [0] * size
+    latest_finish = [0] * size
+    for position in reversed(order):
+        end = finish
+        for successor, lag in successors[position]:
+            end = min(end, latest_start[successor] - lag)
+        latest_finish[position] = end
+        latest_start[position] = end - duration[position]
+
+    nodes = {}
+    critical_path = []
+    for position in order:
+        slack = latest_start[position] - earliest_start[position]
+        nodes[ids[position]] = (earliest_start[position], earliest_finish[position], latest_start[position],
+                                latest_finish[position], slack)
+        if slack == 0:
+            critical_path.append(ids[position])
+
+    return {'finish': finish, 'nodes': nodes, 'critical_path': critical_path}
+
+
+def creates_cycle(edges, predecessor, successor):
+    """
+    return True if adding the dependency predecessor -> successor to the edges ((predecessor, successor) pairs)
+    makes a cycle, it means the predecessor is reachable from the successor.
+    """
+    if predecessor == successor:
+        return True
+    successors = {}
+    for edge_predecessor, edge_successor in edges:
+        successors.setdefault(edge_predecessor, []).append(edge_successor)
+
+    seen = {successor}
+    stack = [successor]
+    while stack:
+        for node in successors.get(stack.pop(), ()):
+            if node == predecessor:
+                return True
+            if node not in seen:
+                seen.add(node)
+                stack.append(node)
+    return False
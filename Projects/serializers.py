@@ -1,7 +1,10 @@
 from rest_framework import serializers
+from django.conf import settings
 from Accounts.models import CustomUser
-from .models import Project, Task, SubTask
+from .models import Project, Task, SubTask, TaskDependency, SubTaskDependency
+from .schedule import creates_cycle
 from Accounts.serializers import UserProfileDetailSerializer
+from ProjectManagement.images import ThumbnailImageField
 
 
 class ProjectSerializer(serializers.ModelSerializer):
@@ -13,6 +16,7 @@ class ProjectSerializer(serializers.ModelSerializer):
     experts = serializers.ListField(child=serializers.EmailField(), write_only=True, required=False)
     experts_details = UserProfileDetailSerializer(source='experts', many=True, read_only=True)
     ceo = UserProfileDetailSerializer(read_only=True)
+    image = ThumbnailImageField(required=False)
 
     class Meta:
         model = Project
@@ -123,6 +127,7 @@ class TaskSerializer(serializers.ModelSerializer):
     project = ProjectSerializer(read_only=True)
     manager = serializers.EmailField(write_only=True, required=True)
     manager_details = UserProfileDetailSerializer(source='manager', read_only=True)
+    image = ThumbnailImageField(required=False)
 
     class Meta:
         model = Task
@@ -282,6 +287,7 @@ class SubTaskSerializer(serializers.ModelSerializer):
     task = TaskSerializer(read_only=True)
     manager = serializers.EmailField(write_only=True, required=True)
     manager_details = UserProfileDetailSerializer(source='manager', read_only=True)
+    image = ThumbnailImageField(required=False)
 
     class Meta:
         model = SubTask
@@ -428,3 +434,155 @@ class SubTaskSerializer(serializers.ModelSerializer):
             instance.experts.add(*new_experts)
 
         return super().update(instance, validated_data)
+
+
+class ProjectTreeQuerySerializer(serializers.Serializer):
+    """
+    serialize the query params of project tree.
+    depth -> 0: only the project, 1: the project and its tasks, 2: the project, its tasks and their subtasks
+    status -> only the tasks and subtasks with these statuses (the subtasks of a filtered out task are not shown)
+    """
+    depth = serializers.IntegerField(min_value=0, max_value=2, default=2)
+    status = serializers.MultipleChoiceField(choices=Task.STATUS_OPTIONS, required=False)
+
+
+class TreeNodeSerializer(serializers.ModelSerializer):
+    """
+    base serializer of the project tree nodes.
+    the financial totals of every node are computed by one query and sent in the context (financials).
+    """
+    experts = UserProfileDetailSerializer(many=True, read_only=True)
+    financials = serializers.SerializerMethodField()
+
+    def get_financials(self, obj):
+        return self.context['financials'].get((obj._meta.model_name, obj.pk),
+                                              {'count': 0, 'total_price': 0, 'paid_price': 0})
+
+
+class SubTaskTreeSerializer(TreeNodeSerializer):
+    manager = UserProfileDetailSerializer(read_only=True)
+
+    class Meta:
+        model = SubTask
+        fields = ('pk', 'title', 'manager', 'experts', 'category', 'start_date', 'end_date', 'status', 'budget',
+                  'is_overdue', 'completion_date', 'financials')
+
+
+class TaskTreeSerializer(TreeNodeSerializer):
+    manager = UserProfileDetailSerializer(read_only=True)
+    subtasks = SubTaskTreeSerializer(source='tree_subtasks', many=True, read_only=True)
+
+    class Meta:
+        model = Task
+        fields = ('pk', 'title', 'manager', 'experts', 'category', 'start_date', 'end_date', 'status', 'budget',
+                  'is_overdue', 'completion_date', 'financials', 'subtasks')
+
+    def get_fields(self):
+        fields = super().get_fields()
+        if self.context['depth'] < 2:
+            fields.pop('subtasks')
+        return fields
+
+
+class ProjectTreeSerializer(TreeNodeSerializer):
+    ceo = UserProfileDetailSerializer(read_only=True)
+    tasks = TaskTreeSerializer(source='tree_tasks', many=True, read_only=True)
+
+    class Meta:
+        model = Project
+        fields = ('pk', 'title', 'ceo', 'experts', 'category', 'start_date', 'end_date', 'status', 'budget',
+                  'initial_budget', 'is_overdue', 'completion_date', 'financials', 'tasks')
+
+    def get_fields(self):
+        fields = super().get_fields()
+        if self.context['depth'] < 1:
+            fields.pop('tasks')
+        return fields
+
+
+class DependencySerializer(serializers.ModelSerializer):
+    """
+    base serializer of the task and subtask dependencies.
+    include validation -> both sides must be in the project of the url and a dependency cannot make a cycle.
+    """
+    project_lookup = None
+
+    class Meta:
+        fields = ('id', 'predecessor', 'successor', 'lag')
+
+    def get_fields(self):
+        """
+        override this method to limit the predecessor and successor choices to the project of the url.
+        """
+        fields = super().get_fields()
+        if 'project' in self.context:
+            for name in ('predecessor', 'successor'):
+                fields[name].queryset = fields[name].queryset.filter(**{self.project_lookup: self.context['project']})
+        return fields
+
+    def validate(self, attrs):
+        predecessor, successor = attrs['predecessor'], attrs['successor']
+        model = self.Meta.model
+
+        if predecessor == successor:
+            raise serializers.ValidationError({'Error': 'predecessor and successor cannot be the same.'})
+
+        edges = model.objects.filter(**{f'predecessor__{self.project_lookup}': self.context['project']}) \
+            .values_list('predecessor_id', 'successor_id')
+        if creates_cycle(edges, predecessor.pk, successor.pk):
+            raise serializers.ValidationError({'Error': 'This dependency makes a cycle.'})
+
+        return attrs
+
+
+class TaskDependencySerializer(DependencySerializer):
+    project_lookup = 'project'
+
+    class Meta(DependencySerializer.Meta):
+        model = TaskDependency
+
+
+class SubTaskDependencySerializer(DependencySerializer):
+    project_lookup = 'task__project'
+
+    class Meta(DependencySerializer.Meta):
+        model = SubTaskDependency
+
+
+class ScheduleQuerySerializer(serializers.Serializer):
+    """
+    serialize the query params of project schedule.
+    level -> schedule the tasks or the subtasks of the project
+    """
+    level = serializers.ChoiceField(choices=('task', 'subtask'), default='task')
+
+
+class MyWorkQuerySerializer(serializers.Serializer):
+    """
+    serialize the query params of my work.
+    status -> only the items with these statuses (can be repeated)
+    overdue -> true: only the overdue items, false: only the items that are not overdue
+    cursor -> the next cursor of the previous page
+    """
+    status = serializers.MultipleChoiceField(choices=Project.STATUS_OPTIONS, required=False)
+    overdue = serializers.BooleanField(required=False, allow_null=True)
+    cursor = serializers.CharField(required=False, max_length=100)
+    limit = serializers.IntegerField(required=False, min_value=1, max_value=settings.MY_WORK_MAX_LIMIT,
+                                     default=settings.MY_WORK_LIMIT)
+
+
+class WorkItemSerializer(serializers.Serializer):
+    """
+    serialize a project, task or subtask of my work with the roles of the user in it (ceo, manager, expert).
+    """
+    kind = serializers.CharField()
+    id = serializers.IntegerField()
+    title = serializers.CharField()
+    status = serializers.CharField()
+    start_date = serializers.DateField()
+    end_date = serializers.DateField()
+    completion_date = serializers.DateField()
+    is_overdue = serializers.BooleanField()
+    project_id = serializers.IntegerField()
+    task_id = serializers.IntegerField(required=False)
+    roles = serializers.ListField(child=serializers.CharField())
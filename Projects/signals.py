@@ -1,6 +1,10 @@
-from django.db.models.signals import post_save
-from .models import Task, Project, SubTask
+from django.db.models import Q
+from django.db.models.signals import post_init, post_save, pre_delete, post_delete, m2m_changed
+from .models import Task, Project, SubTask, TaskDependency, SubTaskDependency
+from Accounts.models import CustomUser
 from django.utils.timezone import now
+from ProjectManagement.cache import bump_versions
+from ProjectManagement.indexes import create_prefix_indexes
 
 
 def complete_task_status(sender, instance,**kwargs):
@@ -37,4 +41,182 @@ def complete_project_status(sender, instance,**kwargs):
         project.save()
 
 
-post_save.connect(receiver=complete_project_status,sender=Task)
\ No newline at end of file
+post_save.connect(receiver=complete_project_status,sender=Task)
+
+
+
+def invalidate_cached_details(sender, instance, **kwargs):
+    """
+    this method changes the cache version of the saved or deleted instance and its parent,
+    so the cached detail responses of them are not used anymore.
+    project -> project
+    task -> task, parent project
+    subtask -> subtask, parent task
+    """
+    if isinstance(instance, Project):
+        bump_versions(f'project:{instance.pk}')
+    elif isinstance(instance, Task):
+        bump_versions(f'task:{instance.pk}', f'project:{instance.project_id}')
+    elif isinstance(instance, SubTask):
+        bump_versions(f'subtask:{instance.pk}', f'task:{instance.task_id}')
+
+
+for model in (Project, Task, SubTask):
+    post_save.connect(receiver=invalidate_cached_details, sender=model)
+    post_delete.connect(receiver=invalidate_cached_details, sender=model)
+
+
+def invalidate_cached_details_experts(sender, instance, action, **kwargs):
+    """
+    this method changes the cache version of the instance when its experts list changes.
+    """
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        invalidate_cached_details(sender, instance)
+
+
+for model in (Project, Task, SubTask):
+    m2m_changed.connect(receiver=invalidate_cached_details_experts, sender=model.experts.through)
+
+
+# fields of the users that the cached details show (UserProfileDetailSerializer)
+PROFILE_FIELDS = ('first_name', 'last_name', 'phone_number', 'email', 'gender', 'image')
+
+
+def profile_fields(user):
+    """
+    return the loaded profile fields of the user (the name of the image, not the file object).
+    """
+    return tuple(getattr(value, 'name', value) for value in (user.__dict__.get(field) for field in PROFILE_FIELDS))
+
+
+def user_detail_names(user_id):
+    """
+    return the version names of the projects, tasks and subtasks whose cached details show the user
+    (as ceo, manager or expert). the details of the children include the versions of their parents,
+    so the objects that show the user directly are enough. one query per model.
+    """
+    names = []
+    for model, kind, role in ((Project, 'project', 'ceo'), (Task, 'task', 'manager'), (SubTask, 'subtask', 'manager')):
+        experts = model.experts.through.objects.filter(customuser_id=user_id).values(f'{kind}_id')
+        names += [f'{kind}:{pk}' for pk in model.objects.filter(Q(**{f'{role}_id': user_id}) | Q(pk__in=experts))
+                  .values_list('pk', flat=True)]
+    return names
+
+
+def remember_profile_fields(sender, instance, **kwargs):
+    """
+    this method keeps the loaded profile fields of the user, to know on save whether they changed.
+    """
+    instance._profile_fields = profile_fields(instance)
+
+
+def invalidate_user_details(sender, instance, created=False, **kwargs):
+    """
+    this method changes the cache version of the details that show the saved user, when the profile fields
+    of the user changed (saving the password or the last login doesn't touch the cache).
+    """
+    fields = profile_fields(instance)
+    if created or fields == instance._profile_fields:
+        return
+    instance._profile_fields = fields
+    bump_versions(*user_detail_names(instance.pk))
+
+
+def remember_user_details(sender, instance, **kwargs):
+    """
+    this method keeps the details that show the user before it is deleted (its expert rows are deleted with it).
+    """
+    instance._detail_names = user_detail_names(instance.pk)
+
+
+def invalidate_deleted_user_details(sender, instance, **kwargs):
+    """
+    this method changes the cache version of the details that showed the deleted user.
+    """
+    bump_versions(*getattr(instance, '_detail_names', ()))
+
+
+post_init.connect(receiver=remember_profile_fields, sender=CustomUser)
+post_save.connect(receiver=invalidate_user_details, sender=CustomUser)
+pre_delete.connect(receiver=remember_user_details, sender=CustomUser)
+post_delete.connect(receiver=invalidate_deleted_user_details, sender=CustomUser)
+
+
+# fields that the cached project schedules depend on (the parent last: a task or subtask can move)
+SCHEDULE_FIELDS = {
+    Project: ('start_date',),
+    Task: ('title', 'start_date', 'end_date', 'project_id'),
+    SubTask: ('title', 'start_date', 'end_date', 'task_id'),
+}
+
+
+def task_project_id(task_id):
+    """
+    return the project id of the task (one query, None if the task doesn't exist).
+    """
+    return Task.objects.filter(pk=task_id).values_list('project_id', flat=True).first()
+
+
+def subtask_project_id(subtask_id):
+    """
+    return the project id of the subtask (one query, None if the subtask doesn't exist).
+    """
+    return SubTask.objects.filter(pk=subtask_id).values_list('task__project_id', flat=True).first()
+
+
+def remember_schedule_fields(sender, instance, **kwargs):
+    """
+    this method keeps the loaded schedule fields of the instance, to know on save whether they changed.
+    """
+    instance._schedule_fields = tuple(instance.__dict__.get(field) for field in SCHEDULE_FIELDS[sender])
+
+
+for model in SCHEDULE_FIELDS:
+    post_init.connect(receiver=remember_schedule_fields, sender=model)
+
+
+def invalidate_cached_schedule(sender, instance, created=False, **kwargs):
+    """
+    this method changes the schedule version of the project when a task or subtask is created or deleted,
+    the start date of the project or the dates (or title) of a task or subtask change,
+    or a dependency is created, changed or deleted.
+    a task or subtask that moved to another parent changes the schedule version of its previous project too.
+    """
+    previous_parent = None
+    if sender in SCHEDULE_FIELDS and not created and kwargs.get('signal') is post_save:
+        fields = tuple(instance.__dict__.get(field) for field in SCHEDULE_FIELDS[sender])
+        if fields == instance._schedule_fields:
+            return
+        if sender is not Project and fields[-1] != instance._schedule_fields[-1]:
+            previous_parent = instance._schedule_fields[-1]
+        instance._schedule_fields = fields
+
+    if isinstance(instance, Project):
+        project_id = instance.pk
+    elif isinstance(instance, Task):
+        project_id = instance.project_id
+    elif isinstance(instance, SubTask):
+        project_id = task_project_id(instance.task_id)
+    elif isinstance(instance, TaskDependency):
+        project_id = task_project_id(instance.predecessor_id)
+    else:
+        project_id = subtask_project_id(instance.predecessor_id)
+
+    project_ids = {project_id}
+    if previous_parent is not None:
+        project_ids.add(previous_parent if isinstance(instance, Task) else task_project_id(previous_parent))
+    project_ids.discard(None)
+    bump_versions(*(f'schedule:{project_id}' for project_id in project_ids))
+
+
+for model in (Project, Task, SubTask, TaskDependency, SubTaskDependency):
+    post_save.connect(receiver=invalidate_cached_schedule, sender=model)
+    post_delete.connect(receiver=invalidate_cached_schedule, sender=model)
+
+
+def create_title_search_indexes(sender, using='default', **kwargs):
+    """
+    this method creates the prefix indexes of the titles (admin search by beginning of title) on PostgreSQL.
+    """
+    for model in (Project, Task, SubTask):
+        create_prefix_indexes(using, model, ('title',))
@@ -14,4 +14,21 @@ urlpatterns = [
     path('complete-project/<int:pk>/', views.CompleteProjectStatusView.as_view(), name='complete_project'),
     path('complete-task/<int:pk>/', views.CompleteTaskStatusView.as_view(), name='complete_task'),
     path('complete-subtask/<int:pk>/', views.CompleteSubTaskStatusView.as_view(), name='complete_subtask'),
+    path('my-work/', views.MyWorkView.as_view(), name='my_work'),
+    path('<int:pk>/tree/', views.ProjectTreeView.as_view(), name='project_tree'),
+    path('<int:pk>/schedule/', views.ProjectScheduleView.as_view(), name='project_schedule'),
+    path('<int:project_id>/task-dependencies/', views.TaskDependencyListCreateView.as_view(),
+         name='create_list_task_dependency'),
+    path('<int:project_id>/subtask-dependencies/', views.SubTaskDependencyListCreateView.as_view(),
+         name='create_list_subtask_dependency'),
+    path('task-dependencies/<int:pk>/', views.TaskDependencyDeleteView.as_view(), name='delete_task_dependency'),
+    path('subtask-dependencies/<int:pk>/', views.SubTaskDependencyDeleteView.as_view(),
+         name='delete_subtask_dependency'),
+
+    path('async/list-project/', views.AsyncProjectListView.as_view(), name='async_list_project'),
+    path('async/project/<int:pk>/', views.AsyncProjectDetailView.as_view(), name='async_project'),
+    path('async/<int:project_id>/list-task/', views.AsyncTaskListView.as_view(), name='async_list_task'),
+    path('async/task/<int:pk>/', views.AsyncTaskDetailView.as_view(), name='async_task'),
+    path('async/<int:task_id>/list-subtask/', views.AsyncSubTaskListView.as_view(), name='async_list_subtask'),
+    path('async/subtask/<int:pk>/', views.AsyncSubTaskDetailView.as_view(), name='async_subtask'),
 ]
\ No newline at end of file
@@ -1,11 +1,24 @@
 from rest_framework import generics, permissions, status
 from rest_framework.views import APIView
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import Coalesce
 from django.shortcuts import get_object_or_404
+from django.utils.timezone import now
 from rest_framework.response import Response
-from .models import Project, Task, SubTask
+from datetime import timedelta
+from .models import Project, Task, SubTask, TaskDependency, SubTaskDependency
+from .schedule import DependencyCycle, compute_schedule
+from .work import InvalidCursor, decode_cursor, encode_cursor, work_item_ids, work_items
+from Financials.models import FinancialOutcomeRecord
 from . import serializers
+from ProjectManagement.asyncviews import AsyncAPIView
+from ProjectManagement.cache import VersionedRetrieveMixin, get_versions, make_key
 from .permissions import CanUpdateDeleteProject, CanCreateSeeTask, CanUpdateDeleteTask, CanCreateSeeSubTask, \
-    CanUpdateDeleteSubTask
+    CanUpdateDeleteSubTask, CanDeleteDependency, CanSeeProjectSchedule
 
 
 class ProjectListCreateView(generics.ListCreateAPIView):
@@ -36,10 +49,11 @@ class ProjectListCreateView(generics.ListCreateAPIView):
         serializer.save(ceo=self.request.user)
 
 
-class ProjectUpdateDeleteView(generics.RetrieveUpdateDestroyAPIView):
+class ProjectUpdateDeleteView(VersionedRetrieveMixin, generics.RetrieveUpdateDestroyAPIView):
     """
-    this view is used to update and delete a project
-    methods -> PUT, PATCH: for update the information of the project
+    this view is used to retrieve, update and delete a project
+    methods -> GET: for show the information of the project (cached until the project changes)
+               PUT, PATCH: for update the information of the project
                DELETE: for delete the project
     permission -> authenticated users, ceo of project
     """
@@ -99,10 +113,11 @@ class TaskListCreateView(generics.ListCreateAPIView):
         serializer.save(project=project)
 
 
-class TaskUpdateDeleteView(generics.RetrieveUpdateDestroyAPIView):
+class TaskUpdateDeleteView(VersionedRetrieveMixin, generics.RetrieveUpdateDestroyAPIView):
     """
-    this view is used to update and delete a task
-    methods -> PUT, PATCH: for update the information of the task
+    this view is used to retrieve, update and delete a task
+    methods -> GET: for show the information of the task (cached until the task or its project changes)
+               PUT, PATCH: for update the information of the task
                DELETE: for delete the task
     permission -> authenticated users, project's ceo, task's manager
     """
@@ -111,6 +126,12 @@ class TaskUpdateDeleteView(generics.RetrieveUpdateDestroyAPIView):
     serializer_class = serializers.TaskSerializer
     queryset = Task
 
+    def get_cache_version_names(self, instance):
+        """
+        the cached task data depends on -> the task, the parent project (nested in task data)
+        """
+        return f'task:{instance.pk}', f'project:{instance.project_id}'
+
     def perform_update(self, serializer):
         """
         validate and update the task data
@@ -162,10 +183,11 @@ class SubTaskListCreateView(generics.ListCreateAPIView):
 
 
 
-class SubTaskUpdateDeleteView(generics.RetrieveUpdateDestroyAPIView):
+class SubTaskUpdateDeleteView(VersionedRetrieveMixin, generics.RetrieveUpdateDestroyAPIView):
     """
-    this view is used to update and delete a subtask
-    methods -> PUT, PATCH: for update the information of the subtask
+    this view is used to retrieve, update and delete a subtask
+    methods -> GET: for show the information of the subtask (cached until the subtask or its parents change)
+               PUT, PATCH: for update the information of the subtask
                DELETE: for delete the subtask
     permission -> authenticated users, project's ceo, task's manager, subtask's manager
     """
@@ -174,6 +196,12 @@ class SubTaskUpdateDeleteView(generics.RetrieveUpdateDestroyAPIView):
     serializer_class = serializers.SubTaskSerializer
     queryset = SubTask
 
+    def get_cache_version_names(self, instance):
+        """
+        the cached subtask data depends on -> the subtask, the parent task and project (nested in subtask data)
+        """
+        return f'subtask:{instance.pk}', f'task:{instance.task_id}', f'project:{instance.task.project_id}'
+
     def perform_update(self, serializer):
         """
         validate and update the subtask data
@@ -259,4 +287,375 @@ class CompleteSubTaskStatusView(APIView):
         return Response(data={'detail': 'Subtask completed successfully'}, status=status.HTTP_200_OK)
 
 
+class MyWorkView(APIView):
+    """
+    this view shows every project, task and subtask the user is connected to through any role
+    (ceo of projects, manager of tasks and subtasks, expert of any of them), newest first.
+    query params -> status (can be repeated), overdue (true or false), cursor, limit
+    methods -> GET: for show the user's work items (next -> the url of the next page or null)
+    permission -> Only authenticated users
+    """
+
+    permission_classes = (permissions.IsAuthenticated,)
+
+    def get(self, request, *args, **kwargs):
+        """
+        this method reads one page of item ids with one UNION query over the role sources (one more item to know
+        if there is a next page) and the items of the page with one query for each kind.
+        """
+        query_serializer = serializers.MyWorkQuerySerializer(data=request.query_params)
+        query_serializer.is_valid(raise_exception=True)
+        data = query_serializer.validated_data
+        try:
+            cursor = decode_cursor(data['cursor']) if data.get('cursor') else None
+        except InvalidCursor as error:
+            return Response(data={'Error': str(error)}, status=status.HTTP_400_BAD_REQUEST)
+
+        item_ids = work_item_ids(request.user, statuses=data.get('status'), overdue=data.get('overdue'),
+                                 cursor=cursor, limit=data['limit'] + 1)
+        next_url = None
+        if len(item_ids) > data['limit']:
+            item_ids = item_ids[:data['limit']]
+            params = request.query_params.copy()
+            params['cursor'] = encode_cursor(*item_ids[-1])
+            next_url = request.build_absolute_uri(f'{request.path}?{params.urlencode()}')
+
+        results = serializers.WorkItemSerializer(work_items(request.user, item_ids), many=True).data
+        return Response(data={'next': next_url, 'results': results}, status=status.HTTP_200_OK)
+
+
+class ProjectTreeView(APIView):
+    """
+    this view shows the whole hierarchy of a project (project -> tasks -> subtasks) with the financial outcome
+    totals of each node, in a fixed number of queries whatever the size of the project.
+    query params -> depth (0, 1, 2; default 2), status (can be repeated, filters tasks and subtasks)
+    methods -> GET: for show the project tree
+    permission -> authenticated users, ceo of project, experts
+    the tree only has the tasks, subtasks (under a shown task) and financial totals that the user is allowed to
+    see in the other endpoints (all of them for the ceo).
+    """
+
+    permission_classes = (permissions.IsAuthenticated, CanUpdateDeleteProject)
+
+    def get(self, request, *args, **kwargs):
+        """
+        this method reads the project, its tasks and its subtasks (each with its manager and experts),
+        the financial totals of all the nodes in one grouped query and assembles the tree in memory.
+        """
+        query_serializer = serializers.ProjectTreeQuerySerializer(data=request.query_params)
+        query_serializer.is_valid(raise_exception=True)
+        depth = query_serializer.validated_data['depth']
+        statuses = query_serializer.validated_data.get('status')
+
+        project = get_object_or_404(Project.objects.select_related('ceo').prefetch_related('experts'),
+                                    pk=kwargs['pk'])
+        self.check_object_permissions(request, project)
+
+        tasks = Task.objects.filter(project=project).authorized_for(request.user)
+        if statuses:
+            tasks = tasks.filter(status__in=statuses)
+        subtasks = SubTask.objects.filter(task__in=tasks.values('id')).authorized_for(request.user)
+        if statuses:
+            subtasks = subtasks.filter(status__in=statuses)
+
+        project.tree_tasks = []
+        if depth >= 1:
+            project.tree_tasks = list(tasks.select_related('manager').prefetch_related('experts').order_by('id'))
+            for task in project.tree_tasks:
+                task.tree_subtasks = []
+        if depth >= 2:
+            tasks_by_id = {task.pk: task for task in project.tree_tasks}
+            for subtask in subtasks.select_related('manager').prefetch_related('experts').order_by('id'):
+                tasks_by_id[subtask.task_id].tree_subtasks.append(subtask)
+
+        context = {'request': request, 'depth': depth,
+                   'financials': self.financial_totals(request.user, project, tasks if depth >= 1 else None,
+                                                       subtasks if depth >= 2 else None)}
+        return Response(data=serializers.ProjectTreeSerializer(project, context=context).data,
+                        status=status.HTTP_200_OK)
+
+    @staticmethod
+    def financial_totals(user, project, tasks, subtasks):
+        """
+        return the financial outcome totals of the tree nodes by (model name, id), computed by one query
+        (the task and subtask ids are subqueries, so the query doesn't grow with the project),
+        only from the records that the user is allowed to see.
+        """
+        content_types = ContentType.objects.get_for_models(Project, Task, SubTask)
+        condition = Q(content_type=content_types[Project], object_id=project.pk)
+        if tasks is not None:
+            condition |= Q(content_type=content_types[Task], object_id__in=tasks.values('id'))
+        if subtasks is not None:
+            condition |= Q(content_type=content_types[SubTask], object_id__in=subtasks.values('id'))
+
+        model_names = {content_type.id: model._meta.model_name for model, content_type in content_types.items()}
+        rows = FinancialOutcomeRecord.objects.authorized_for(user).filter(condition).values(
+            'content_type', 'object_id').annotate(
+            count=Count('id'), total_price=Coalesce(Sum('price'), 0),
+            paid_price=Coalesce(Sum('price', filter=Q(status='paid')), 0)).order_by()
+        return {(model_names[row.pop('content_type')], row.pop('object_id')): row for row in rows}
+
+
+class TaskDependencyListCreateView(generics.ListCreateAPIView):
+    """
+    this view is used to listing and creating the dependencies between the tasks of a project.
+    methods -> GET: for show the task dependencies of the project
+               POST: for create a new dependency (predecessor, successor, lag in days)
+    permission -> authenticated users, ceo of project
+    """
+    permission_classes = (permissions.IsAuthenticated, CanCreateSeeTask)
+    serializer_class = serializers.TaskDependencySerializer
+
+    def get_queryset(self):
+        return TaskDependency.objects.filter(predecessor__project=self.kwargs['project_id'])
+
+    def get_serializer_context(self):
+        """
+        sent the project to serializer with context to validate the tasks of the dependency.
+        """
+        context = super().get_serializer_context()
+        context['project'] = self.kwargs['project_id']
+        return context
+
+    def create(self, request, *args, **kwargs):
+        """
+        override this method to check and create the dependency while the project row is locked,
+        so two requests cannot create dependencies that make a cycle together (each one checks the edges
+        after the other one is committed).
+        """
+        with transaction.atomic():
+            list(Project.objects.select_for_update().filter(pk=self.kwargs['project_id']).values_list('pk'))
+            return super().create(request, *args, **kwargs)
+
+
+class SubTaskDependencyListCreateView(TaskDependencyListCreateView):
+    """
+    this view is used to listing and creating the dependencies between the subtasks of a project.
+    methods -> GET: for show the subtask dependencies of the project
+               POST: for create a new dependency (predecessor, successor, lag in days)
+    permission -> authenticated users, ceo of project
+    """
+    serializer_class = serializers.SubTaskDependencySerializer
+
+    def get_queryset(self):
+        return SubTaskDependency.objects.filter(predecessor__task__project=self.kwargs['project_id'])
+
+
+class TaskDependencyDeleteView(generics.DestroyAPIView):
+    """
+    this view is used to delete a task dependency.
+    permission -> authenticated users, ceo of project
+    """
+    permission_classes = (permissions.IsAuthenticated, CanDeleteDependency)
+    queryset = TaskDependency.objects.select_related('predecessor__project__ceo')
+
+
+class SubTaskDependencyDeleteView(generics.DestroyAPIView):
+    """
+    this view is used to delete a subtask dependency.
+    permission -> authenticated users, ceo of project
+    """
+    permission_classes = (permissions.IsAuthenticated, CanDeleteDependency)
+    queryset = SubTaskDependency.objects.select_related('predecessor__task__project__ceo')
+
+
+class ProjectScheduleView(APIView):
+    """
+    this view shows the critical path schedule of the tasks or subtasks of a project:
+    earliest/latest start and finish, slack of each node and the critical path (the nodes without slack).
+    the duration of a node is the days between its start and end date, the dependencies are finish to start.
+    the schedule is cached until the project, the dates of its tasks/subtasks or its dependencies change,
+    so it is read from the primary (a replica that lags could cache an old schedule under the new version).
+    query params -> level (task or subtask, default task)
+    methods -> GET: for show the schedule
+    permission -> authenticated users, ceo of project
+    """
+
+    permission_classes = (permissions.IsAuthenticated, CanSeeProjectSchedule)
+    replica_reads = False
+
+    def get(self, request, *args, **kwargs):
+        query_serializer = serializers.ScheduleQuerySerializer(data=request.query_params)
+        query_serializer.is_valid(raise_exception=True)
+        level = query_serializer.validated_data['level']
+
+        project = get_object_or_404(Project, pk=kwargs['pk'])
+        self.check_object_permissions(request, project)
+
+        key = make_key('schedule', project.pk, level, *get_versions(f'schedule:{project.pk}'))
+        data = cache.get(key)
+        if data is None:
+            try:
+                data = self.build_schedule(project, level)
+            except DependencyCycle as e:
+                return Response(data={'Error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+            cache.set(key, data, timeout=settings.RESPONSE_CACHE_TIMEOUT)
+
+        return Response(data=data, status=status.HTTP_200_OK)
+
+    @staticmethod
+    def build_schedule(project, level):
+        """
+        read the nodes and the dependencies (two queries of plain values) and compute their schedule.
+        """
+        if level == 'task':
+            nodes = Task.objects.filter(project=project)
+            edges = TaskDependency.objects.filter(predecessor__project=project)
+        else:
+            nodes = SubTask.objects.filter(task__project=project)
+            edges = SubTaskDependency.objects.filter(predecessor__task__project=project)
+
+        nodes = list(nodes.order_by('id').values_list('id', 'title', 'start_date', 'end_date'))
+        durations = {node_id: (end_date - start_date).days + 1 if start_date and end_date else 0
+                     for node_id, _title, start_date, end_date in nodes}
+        schedule = compute_schedule(durations, edges.values_list('predecessor_id', 'successor_id', 'lag'))
+
+        start = project.start_date or min((node[2] for node in nodes if node[2]), default=now().date())
+
+        def day(offset):
+            return start + timedelta(days=offset)
+
+        titles = {node_id: title for node_id, title, _start_date, _end_date in nodes}
+        return {
+            'project': project.pk,
+            'level': level,
+            'start_date': start,
+            'finish_date': day(schedule['finish'] - 1) if schedule['finish'] else start,
+            'duration': schedule['finish'],
+            'critical_path': schedule['critical_path'],
+            'nodes': [{'id': node_id, 'title': titles[node_id], 'duration': durations[node_id],
+                       'earliest_start': day(earliest_start),
+                       'earliest_finish': day(max(earliest_finish - 1, earliest_start)),
+                       'latest_start': day(latest_start),
+                       'latest_finish': day(max(latest_finish - 1, latest_start)),
+                       'slack': slack, 'critical': slack == 0}
+                      for node_id, (earliest_start, earliest_finish, latest_start, latest_finish, slack)
+                      in schedule['nodes'].items()],
+        }
+
+
+def budget_totals(queryset):
+    """
+    return the aggregates of a task or subtask list (one query).
+    """
+    return queryset.aaggregate(count=Count('id'), total_budget=Coalesce(Sum('budget'), 0),
+                               completed=Count('id', filter=Q(status='completed')))
+
+
+def remaining_budget(budget, totals):
+    return None if budget is None else budget - totals['total_budget']
+
+
+class AsyncProjectListView(AsyncAPIView):
+    """
+    async variant of the project list.
+    methods -> GET: for show the list of projects with their count and total budget
+    permission ->  Only authenticated users
+    """
+
+    permission_classes = (permissions.IsAuthenticated,)
+    serializer_class = serializers.ProjectSerializer
+
+    async def get(self, request, *args, **kwargs):
+        """
+        this method reads the user's projects and their totals.
+        """
+        projects = Project.objects.filter(ceo=request.user)
+        rows = await self.alist(projects.select_related('ceo').prefetch_related('experts'))
+        totals = await projects.aaggregate(count=Count('id'), total_budget=Coalesce(Sum('budget'), 0))
+        return Response(data={**totals, 'results': await self.serialize(rows, many=True)}, status=status.HTTP_200_OK)
+
+
+class AsyncProjectDetailView(AsyncAPIView):
+    """
+    async variant of the project detail.
+    methods -> GET: for show the information of the project
+    permission -> authenticated users, ceo of project
+    """
+
+    permission_classes = (permissions.IsAuthenticated, CanUpdateDeleteProject)
+    serializer_class = serializers.ProjectSerializer
+
+    async def get(self, request, *args, **kwargs):
+        project = await self.aget_object(Project.objects.select_related('ceo').prefetch_related('experts'),
+                                         pk=kwargs['pk'])
+        return Response(data=await self.serialize(project), status=status.HTTP_200_OK)
+
+
+class AsyncTaskListView(AsyncAPIView):
+    """
+    async variant of the task list.
+    methods -> GET: for show the list of tasks of specific project with their budget totals
+    permission -> authenticated users, ceo of project
+    """
+    permission_classes = (permissions.IsAuthenticated, CanCreateSeeTask)
+    serializer_class = serializers.TaskSerializer
+
+    async def get(self, request, *args, **kwargs):
+        """
+        this method reads the tasks, their budget totals and the project budget.
+        """
+        tasks = Task.objects.filter(project=kwargs['project_id'])
+        rows = await self.alist(tasks.select_related('project__ceo', 'manager').prefetch_related('experts',
+                                                                                                  'project__experts'))
+        totals = await budget_totals(tasks)
+        project_budget = await Project.objects.filter(pk=kwargs['project_id']).values_list('budget', flat=True).aget()
+        return Response(data={**totals, 'project_budget': project_budget,
+                              'remaining_budget': remaining_budget(project_budget, totals),
+                              'results': await self.serialize(rows, many=True)}, status=status.HTTP_200_OK)
+
+
+class AsyncTaskDetailView(AsyncAPIView):
+    """
+    async variant of the task detail.
+    methods -> GET: for show the information of the task
+    permission -> authenticated users, project's ceo, task's manager
+    """
+
+    permission_classes = (permissions.IsAuthenticated, CanUpdateDeleteTask)
+    serializer_class = serializers.TaskSerializer
+
+    async def get(self, request, *args, **kwargs):
+        task = await self.aget_object(Task.objects.select_related('project__ceo', 'manager')
+                                      .prefetch_related('experts', 'project__experts'), pk=kwargs['pk'])
+        return Response(data=await self.serialize(task), status=status.HTTP_200_OK)
+
+
+class AsyncSubTaskListView(AsyncAPIView):
+    """
+    async variant of the subtask list.
+    methods -> GET: for show the list of subtasks of specific task with their budget totals
+    permission -> authenticated users, project's ceo, task's manager
+    """
+    permission_classes = (permissions.IsAuthenticated, CanCreateSeeSubTask)
+    serializer_class = serializers.SubTaskSerializer
+
+    async def get(self, request, *args, **kwargs):
+        """
+        this method reads the subtasks, their budget totals and the task budget.
+        """
+        subtasks = SubTask.objects.filter(task=kwargs['task_id'])
+        rows = await self.alist(subtasks.select_related('task__project__ceo', 'task__manager', 'manager')
+                                .prefetch_related('experts', 'task__experts', 'task__project__experts'))
+        totals = await budget_totals(subtasks)
+        task_budget = await Task.objects.filter(pk=kwargs['task_id']).values_list('budget', flat=True).aget()
+        return Response(data={**totals, 'task_budget': task_budget,
+                              'remaining_budget': remaining_budget(task_budget, totals),
+                              'results': await self.serialize(rows, many=True)}, status=status.HTTP_200_OK)
+
+
+class AsyncSubTaskDetailView(AsyncAPIView):
+    """
+    async variant of the subtask detail.
+    methods -> GET: for show the information of the subtask
+    permission -> authenticated users, project's ceo, task's manager, subtask's manager
+    """
+
+    permission_classes = (permissions.IsAuthenticated, CanUpdateDeleteSubTask)
+    serializer_class = serializers.SubTaskSerializer
 
+    async def get(self, request, *args, **kwargs):
+        subtask = await self.aget_object(SubTask.objects.select_related('task__project__ceo', 'task__manager', 'manager')
+                                         .prefetch_related('experts', 'task__experts', 'task__project__experts'),
+                                         pk=kwargs['pk'])
+        return Response(data=await self.serialize(subtask), status=status.HTTP_200_OK)
@@ -0,0 +1,110 @@
+import base64
+from django.db.models import CharField, Exists, OuterRef, Q, Value
+from django.utils.timezone import now
+
+from .models import Project, Task, SubTask
+
+KINDS = {'project': Project, 'task': Task, 'subtask': SubTask}
+
+
+class InvalidCursor(ValueError):
+    """
+    raised when the cursor of the my work list cannot be decoded.
+    """
+
+
+def encode_cursor(item_id, kind):
+    return base64.urlsafe_b64encode(f'{item_id}:{kind}'.encode()).decode()
+
+
+def decode_cursor(cursor):
+    """
+    return (id, kind) of the last item of the previous page.
+    """
+    try:
+        item_id, kind = base64.urlsafe_b64decode(cursor.encode()).decode().split(':')
+        item_id = int(item_id)
+    except (ValueError, UnicodeError):
+        raise InvalidCursor('Invalid cursor.')
+    if kind not in KINDS:
+        raise InvalidCursor('Invalid cursor.')
+    return item_id, kind
+
+
+def overdue_condition(prefix=''):
+    """
+    the condition of change_overdue of the models (an end date in the past and not completed).
+    """
+    return Q(**{f'{prefix}end_date__lt': now().date()}) & ~Q(**{f'{prefix}status': 'completed'})
+
+
+def role_sources(user):
+    """
+    return (kind, queryset of the item ids, prefix of the item fields) of every role of the user:
+    project ceo, task and subtask manager (foreign keys) and project, task and subtask expert (through tables).
+    """
+    sources = [('project', Project.objects.filter(ceo=user), '')]
+    for kind in ('task', 'subtask'):
+        sources.append((kind, KINDS[kind].objects.filter(manager=user), ''))
+    for kind, model in KINDS.items():
+        sources.append((kind, model.experts.through.objects.filter(customuser=user), f'{kind}__'))
+    return sources
+
+
+def work_item_ids(user, statuses=None, overdue=None, cursor=None, limit=20):
+    """
+    return [(id, kind), ...] of the projects, tasks and subtasks the user is connected to through any role,
+    newest first (id descending, then kind), at most `limit` items after the cursor.
+    one UNION query over the six role sources: UNION removes the items reached through two roles.
+    the filters and the cursor are applied to every source, so each one can use its indexes
+    (the cursor condition `id < c or (id = c and kind > k)` is `id < c` or `id <= c` for a source of one kind).
+    """
+    queries = []
+    for kind, queryset, prefix in role_sources(user):
+        if statuses:
+            queryset = queryset.filter(**{f'{prefix}status__in': statuses})
+        if overdue is not None:
+            queryset = queryset.filter(overdue_condition(prefix)) if overdue else \
+                queryset.exclude(overdue_condition(prefix))
+        if cursor:
+            cursor_id, cursor_kind = cursor
+            lookup = 'lte' if kind > cursor_kind else 'lt'
+            queryset = queryset.filter(**{f'{prefix}id__{lookup}': cursor_id})
+        queries.append(queryset.annotate(kind=Value(kind, output_field=CharField()))
+                       .values_list(f'{prefix}id', 'kind').order_by())
+
+    return list(queries[0].union(*queries[1:]).order_by('-id', 'kind')[:limit])
+
+
+def work_items(user, item_ids):
+    """
+    return the list items of the (id, kind) pairs in the same order, with the roles of the user in each item.
+    one query of plain values for each kind on the page.
+    """
+    ids = {kind: [item_id for item_id, item_kind in item_ids if item_kind == kind] for kind in KINDS}
+    fields = ('id', 'title', 'status', 'start_date', 'end_date', 'completion_date')
+    extra = {'project': ('ceo_id',), 'task': ('project_id', 'manager_id'),
+             'subtask': ('task_id', 'task__project_id', 'manager_id')}
+
+    rows = {}
+    for kind, model in KINDS.items():
+        if not ids[kind]:
+            continue
+        through = model.experts.through.objects.filter(**{kind: OuterRef('pk')}, customuser=user)
+        for row in model.objects.filter(pk__in=ids[kind]).values(*fields, *extra[kind], is_expert=Exists(through)):
+            roles = []
+            if row.pop('ceo_id', None) == user.pk:
+                roles.append('ceo')
+            if row.pop('manager_id', None) == user.pk:
+                roles.append('manager')
+            if row.pop('is_expert'):
+                roles.append('expert')
+            if kind == 'project':
+                row['project_id'] = row['id']
+            elif kind == 'subtask':
+                row['project_id'] = row.pop('task__project_id')
+            row['is_overdue'] = bool(row['end_date'] and row['status'] != 'completed'
+                                     and row['end_date'] < now().date())
+            rows[kind, row['id']] = {'kind': kind, **row, 'roles': roles}
+
+    return [rows[kind, item_id] for item_id, kind in item_ids if (kind, item_id) in rows]
@@ -0,0 +1,11 @@
+from django.apps import AppConfig
+
+
+class SearchConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'Search'
+
+    def ready(self):
+        from django.db.models.signals import post_migrate
+        from . import signals
+        post_migrate.connect(receiver=signals.create_search_index, sender=self)
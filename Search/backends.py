@@ -0,0 +1,156 @@
+import html
+import re
+from abc import ABC, abstractmethod
+from django.conf import settings
+from django.db import connections
+from django.db.models import Q
+
+from .models import SearchEntry
+
+HIGHLIGHT_START, HIGHLIGHT_STOP = '<mark>', '</mark>'
+# the database marks the matches with these control characters, the text is escaped before they become tags
+MATCH_START, MATCH_STOP = '\x02', '\x03'
+
+
+def mark_matches(text):
+    """
+    return the text of the entry escaped as HTML, with the matches of the database marked by HIGHLIGHT_START and
+    HIGHLIGHT_STOP: the title and body are user text, so the only tags of the result are the marks.
+    """
+    text = html.escape(text or '')
+    return text.replace(MATCH_START, HIGHLIGHT_START).replace(MATCH_STOP, HIGHLIGHT_STOP)
+
+
+def search_terms(query):
+    """
+    return the words of the query (at most SEARCH_MAX_TERMS), the operators and quotes of the user are not used.
+    """
+    return re.findall(r'\w+', query)[:settings.SEARCH_MAX_TERMS]
+
+
+class SearchBackend(ABC):
+    """
+    base class of the full-text search of the entries on one database vendor.
+    install -> create the index of the entries (after migrate, idempotent)
+    rebuild -> fill the index again from the entries table
+    search -> return [(entry id, rank, highlighted title, snippet of the body), ...] of the entries of the
+              queryset (authorized entries) that match all the terms (the last term as a prefix), best first,
+              the title and snippet escaped as HTML (mark_matches)
+    """
+
+    def install(self, connection):
+        pass
+
+    def rebuild(self, connection):
+        pass
+
+    @abstractmethod
+    def search(self, queryset, terms, limit):
+        pass
+
+    @staticmethod
+    def execute(queryset, sql, params):
+        with connections[queryset.db].cursor() as cursor:
+            cursor.execute(sql, params)
+            return [(entry_id, rank, mark_matches(title), mark_matches(snippet))
+                    for entry_id, rank, title, snippet in cursor.fetchall()]
+
+
+class PostgresSearchBackend(SearchBackend):
+    """
+    search_vector is a stored generated column of the entries (title with weight A, body with weight B, the same
+    vector as SearchVector('title', weight='A') + SearchVector('body', weight='B')), so it is kept up to date
+    by every insert and update without a query of its own, and it has a GIN index.
+    ranked by ts_rank_cd, highlighted by ts_headline (only for the rows of the page).
+    """
+
+    def install(self, connection):
+        table = connection.ops.quote_name(SearchEntry._meta.db_table)
+        config = settings.SEARCH_CONFIG
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'ALTER TABLE {table} ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS ('
+                f"setweight(to_tsvector('{config}'::regconfig, coalesce(title, '')), 'A') || "
+                f"setweight(to_tsvector('{config}'::regconfig, coalesce(body, '')), 'B')) STORED")
+            cursor.execute(f'CREATE INDEX IF NOT EXISTS search_searchentry_vector ON {table} USING GIN (search_vector)')
+
+    def search(self, queryset, terms, limit):
+        table = connections[queryset.db].ops.quote_name(SearchEntry._meta.db_table)
+        entries_sql, entries_params = queryset.values('id').query.sql_with_params()
+        tsquery = ' & '.join(terms[:-1] + [f'{terms[-1]}:*'])
+        options = f'StartSel="{MATCH_START}", StopSel="{MATCH_STOP}"'
+        sql = (f'SELECT entry.id, ts_rank_cd(entry.search_vector, query) AS rank, '
+               f'ts_headline(%s, entry.title, query, %s), ts_headline(%s, entry.body, query, %s) '
+               f'FROM {table} entry, to_tsquery(%s::regconfig, %s) query '
+               f'WHERE entry.search_vector @@ query AND entry.id IN ({entries_sql}) '
+               f'ORDER BY rank DESC, entry.id DESC LIMIT %s')
+        config = settings.SEARCH_CONFIG
+        params = (config, f'{options}, HighlightAll=true', config, f'{options}, MaxWords=30, MinWords=10',
+                  config, tsquery, *entries_params, limit)
+        return self.execute(queryset, sql, params)
+
+
+class SQLiteSearchBackend(SearchBackend):
+    """
+    the entries are indexed by an FTS5 table that reads its text from the entries table (external content),
+    triggers on the entries table keep it up to date.
+    ranked by bm25 (a title match counts 10 times a body match), highlighted by highlight and snippet.
+    """
+
+    @staticmethod
+    def fts_table(connection):
+        return SearchEntry._meta.db_table, connection.ops.quote_name(f'{SearchEntry._meta.db_table}_fts')
+
+    def install(self, connection):
+        table, fts = self.fts_table(connection)
+        table = connection.ops.quote_name(table)
+        delete = f"INSERT INTO {fts}({fts}, rowid, title, body) VALUES ('delete', old.id, old.title, old.body);"
+        insert = f'INSERT INTO {fts}(rowid, title, body) VALUES (new.id, new.title, new.body);'
+        with connection.cursor() as cursor:
+            cursor.execute(f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5(title, body, content={table}, "
+                           f"content_rowid='id', tokenize='unicode61 remove_diacritics 2')")
+            cursor.execute(f'CREATE TRIGGER IF NOT EXISTS search_entry_insert AFTER INSERT ON {table} '
+                           f'BEGIN {insert} END')
+            cursor.execute(f'CREATE TRIGGER IF NOT EXISTS search_entry_delete AFTER DELETE ON {table} '
+                           f'BEGIN {delete} END')
+            cursor.execute(f'CREATE TRIGGER IF NOT EXISTS search_entry_update AFTER UPDATE ON {table} '
+                           f'BEGIN {delete} {insert} END')
+
+    def rebuild(self, connection):
+        _table, fts = self.fts_table(connection)
+        with connection.cursor() as cursor:
+            cursor.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+    def search(self, queryset, terms, limit):
+        _table, fts = self.fts_table(connections[queryset.db])
+        entries_sql, entries_params = queryset.values('id').query.sql_with_params()
+        match = ' '.join(f'"{term}"' for term in terms) + '*'
+        sql = (f'SELECT rowid, -bm25({fts}, 10.0, 1.0) AS rank, '
+               f"highlight({fts}, 0, %s, %s), snippet({fts}, 1, %s, %s, '...', 16) "
+               f'FROM {fts} WHERE {fts} MATCH %s AND rowid IN ({entries_sql}) '
+               f'ORDER BY rank DESC, rowid DESC LIMIT %s')
+        params = (MATCH_START, MATCH_STOP, MATCH_START, MATCH_STOP, match, *entries_params, limit)
+        return self.execute(queryset, sql, params)
+
+
+class LikeSearchBackend(SearchBackend):
+    """
+    the other databases have no index of their own: the entries are matched by icontains, not ranked
+    nor highlighted (newest first), the title and body are only escaped.
+    """
+
+    def search(self, queryset, terms, limit):
+        for term in terms:
+            queryset = queryset.filter(Q(title__icontains=term) | Q(body__icontains=term))
+        return [(entry_id, 0, mark_matches(title), mark_matches(body[:200]))
+                for entry_id, title, body in queryset.order_by('-id').values_list('id', 'title', 'body')[:limit]]
+
+
+BACKENDS = {
+    'postgresql': PostgresSearchBackend(),
+    'sqlite': SQLiteSearchBackend(),
+}
+
+
+def get_backend(connection):
+    return BACKENDS.get(connection.vendor, LikeSearchBackend())
@@ -0,0 +1,70 @@
+from django.contrib.contenttypes.models import ContentType
+from django.db import connections, transaction
+from Projects.models import Project, Task, SubTask
+from Financials.models import FinancialOutcomeRecord, FinancialIncomeRecord
+from .backends import get_backend
+from .models import SearchEntry
+
+
+def all_entries():
+    """
+    yield the search entries of every project, task, subtask and financial record (not saved).
+    one query of plain values for each model, the parents of the records are looked up in memory.
+    """
+    task_projects = {}
+    subtask_tasks = {}
+    for row in Project.objects.values('id', 'title', 'description').iterator():
+        yield SearchEntry(kind='project', object_id=row['id'], title=row['title'], body=row['description'] or '',
+                          project_id=row['id'])
+    for row in Task.objects.values('id', 'title', 'description', 'project_id').iterator():
+        task_projects[row['id']] = row['project_id']
+        yield SearchEntry(kind='task', object_id=row['id'], title=row['title'], body=row['description'] or '',
+                          project_id=row['project_id'], task_id=row['id'])
+    for row in SubTask.objects.values('id', 'title', 'description', 'task_id').iterator():
+        subtask_tasks[row['id']] = row['task_id']
+        yield SearchEntry(kind='subtask', object_id=row['id'], title=row['title'], body=row['description'] or '',
+                          project_id=task_projects[row['task_id']], task_id=row['task_id'], subtask_id=row['id'])
+
+    content_types = ContentType.objects.get_for_models(Project, Task, SubTask)
+    models = {content_type.pk: model for model, content_type in content_types.items()}
+    for row in FinancialOutcomeRecord.objects.values('id', 'title', 'description', 'content_type_id',
+                                                     'object_id').iterator():
+        model, object_id = models.get(row['content_type_id']), row['object_id']
+        if model is Project:
+            parents = (object_id, None, None)
+        elif model is Task and object_id in task_projects:
+            parents = (task_projects[object_id], object_id, None)
+        elif model is SubTask and object_id in subtask_tasks:
+            task_id = subtask_tasks[object_id]
+            parents = (task_projects[task_id], task_id, object_id)
+        else:
+            continue
+        yield SearchEntry(kind='financial_outcome', object_id=row['id'], title=row['title'],
+                          body=row['description'] or '', project_id=parents[0], task_id=parents[1],
+                          subtask_id=parents[2])
+    for row in FinancialIncomeRecord.objects.values('id', 'title', 'description', 'project_id').iterator():
+        yield SearchEntry(kind='financial_income', object_id=row['id'], title=row['title'],
+                          body=row['description'] or '', project_id=row['project_id'])
+
+
+def rebuild_entries(using='default', batch_size=1000):
+    """
+    replace the search entries by the entries of the current objects (after bulk inserts, which send no signals)
+    and rebuild the full-text index. return the number of entries.
+    """
+    connection = connections[using]
+    backend = get_backend(connection)
+    count = 0
+    with transaction.atomic(using=using):
+        SearchEntry.objects.using(using).all().delete()
+        batch = []
+        for entry in all_entries():
+            batch.append(entry)
+            if len(batch) == batch_size:
+                SearchEntry.objects.using(using).bulk_create(batch)
+                count += len(batch)
+                batch = []
+        SearchEntry.objects.using(using).bulk_create(batch)
+        count += len(batch)
+        backend.rebuild(connection)
+    return count
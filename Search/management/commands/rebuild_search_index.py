@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from Search.entries import rebuild_entries
+
+
+class Command(BaseCommand):
+    """
+    create the search entries of every project, task, subtask and financial record again and rebuild the
+    full-text index. the entries are kept up to date on save, this command is meant to be run once after
+    deploying the search and after bulk imports (bulk inserts send no signals).
+    """
+
+    help = 'Rebuild the search entries and the full-text index.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default='default', help='Database alias (default: default).')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Entries of each insert.')
+
+    def handle(self, *args, **options):
+        count = rebuild_entries(using=options['database'], batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'{count} search entries indexed.'))
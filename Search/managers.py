@@ -0,0 +1,37 @@
+from django.apps import apps
+from django.db import models
+from django.db.models import Q
+
+
+class SearchEntryQuerySet(models.QuerySet):
+    """
+    queryset of search entry model.
+    """
+
+    def authorized_for(self, user):
+        """
+        return the search entries of the objects that the user is allowed to see (same rules as the permissions):
+            project: project CEO, experts
+            task: project CEO, task manager, experts
+            subtask: project CEO, task manager, subtask manager, experts
+            financial outcome: project CEO, task manager (task and subtask records), subtask manager (subtask records)
+            financial income: project CEO
+        the filter is built from the parent ids of the entries and subqueries, so it is evaluated as one query.
+        """
+        project_model = apps.get_model('Projects', 'Project')
+        task_model = apps.get_model('Projects', 'Task')
+        subtask_model = apps.get_model('Projects', 'SubTask')
+
+        projects = project_model.objects.filter(ceo=user).values('id')
+        tasks = task_model.objects.filter(manager=user).values('id')
+        subtasks = subtask_model.objects.filter(manager=user).values('id')
+        project_experts = project_model.experts.through.objects.filter(customuser=user).values('project_id')
+        task_experts = task_model.experts.through.objects.filter(customuser=user).values('task_id')
+        subtask_experts = subtask_model.experts.through.objects.filter(customuser=user).values('subtask_id')
+
+        return self.filter(Q(project__in=projects) |
+                           Q(kind__in=('task', 'subtask', 'financial_outcome'), task__in=tasks) |
+                           Q(kind__in=('subtask', 'financial_outcome'), subtask__in=subtasks) |
+                           Q(kind='project', project__in=project_experts) |
+                           Q(kind='task', task__in=task_experts) |
+                           Q(kind='subtask', subtask__in=subtask_experts))
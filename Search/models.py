@@ -0,0 +1,39 @@
+from django.db import models
+from Projects.models import Project, Task, SubTask
+from .managers import SearchEntryQuerySet
+
+
+class SearchEntry(models.Model):
+    """
+    search entry model stores the searchable text of a project, task, subtask, financial outcome or financial
+    income (one entry per object, kept up to date by the signals of Search/signals.py).
+    the full-text index of the entries is created after migrate: a tsvector column with a GIN index on PostgreSQL,
+    an FTS5 table with triggers on SQLite (Search/backends.py).
+    project, task and subtask -> the object and its parents, the search results are filtered by them
+    (the same users that can see the object in the other endpoints).
+    """
+
+    KIND_CHOICES = (
+        ('project', 'Project'),
+        ('task', 'Task'),
+        ('subtask', 'Subtask'),
+        ('financial_outcome', 'Financial Outcome'),
+        ('financial_income', 'Financial Income'),
+    )
+
+    kind = models.CharField(choices=KIND_CHOICES, max_length=17)
+    object_id = models.PositiveIntegerField()
+    title = models.CharField(max_length=256)
+    body = models.TextField(blank=True)
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='search_entries')
+    task = models.ForeignKey(Task, on_delete=models.CASCADE, null=True, blank=True, related_name='search_entries')
+    subtask = models.ForeignKey(SubTask, on_delete=models.CASCADE, null=True, blank=True,
+                                related_name='search_entries')
+
+    objects = SearchEntryQuerySet.as_manager()
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=['kind', 'object_id'], name='unique_search_entry')]
+
+    def __str__(self):
+        return f'{self.kind} {self.object_id}: {self.title}'
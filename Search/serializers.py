@@ -0,0 +1,31 @@
+from rest_framework import serializers
+from django.conf import settings
+from .models import SearchEntry
+
+
+class SearchQuerySerializer(serializers.Serializer):
+    """
+    serialize the query params of search.
+    q -> the words to find in the titles and descriptions (the last word can be the beginning of a word)
+    kind -> only the entries of these kinds (can be repeated)
+    """
+
+    q = serializers.CharField(required=True, max_length=200)
+    kind = serializers.MultipleChoiceField(choices=SearchEntry.KIND_CHOICES, required=False)
+    limit = serializers.IntegerField(required=False, min_value=1, max_value=settings.SEARCH_MAX_LIMIT,
+                                     default=settings.SEARCH_LIMIT)
+
+
+class SearchResultSerializer(serializers.ModelSerializer):
+    """
+    serialize a search result: the entry, its rank and the matched words marked in the title and the body
+    (title_highlight and snippet are HTML: the text is escaped and the only tags are <mark> and </mark>).
+    """
+
+    rank = serializers.FloatField(source='search_rank')
+    title_highlight = serializers.CharField(source='search_title')
+    snippet = serializers.CharField(source='search_snippet')
+
+    class Meta:
+        model = SearchEntry
+        fields = ('kind', 'object_id', 'title', 'project', 'task', 'subtask', 'rank', 'title_highlight', 'snippet')
@@ -0,0 +1,109 @@
+from django.contrib.contenttypes.models import ContentType
+from django.db import connections
+from django.db.models.signals import post_init, post_save, post_delete
+from Projects.models import Project, Task, SubTask
+from Projects.signals import task_project_id
+from Financials.models import FinancialOutcomeRecord, FinancialIncomeRecord
+from .backends import get_backend
+from .models import SearchEntry
+
+# kind of the search entries of each model
+SEARCH_KINDS = {
+    Project: 'project',
+    Task: 'task',
+    SubTask: 'subtask',
+    FinancialOutcomeRecord: 'financial_outcome',
+    FinancialIncomeRecord: 'financial_income',
+}
+
+# fields of the instance that the search entry depends on (text and parents)
+SEARCH_FIELDS = {
+    Project: ('title', 'description'),
+    Task: ('title', 'description'),
+    SubTask: ('title', 'description'),
+    FinancialOutcomeRecord: ('title', 'description', 'content_type_id', 'object_id'),
+    FinancialIncomeRecord: ('title', 'description', 'project_id'),
+}
+
+
+def entry_parents(instance):
+    """
+    return (project id, task id, subtask id) of the instance: the instance itself and its parents.
+    the parent ids of tasks are kept in memory (Projects/signals.py), the others take one small query at most.
+    """
+    if isinstance(instance, Project):
+        return instance.pk, None, None
+    elif isinstance(instance, Task):
+        return instance.project_id, instance.pk, None
+    elif isinstance(instance, SubTask):
+        return task_project_id(instance.task_id), instance.task_id, instance.pk
+    elif isinstance(instance, FinancialIncomeRecord):
+        return instance.project_id, None, None
+
+    model = ContentType.objects.get_for_id(instance.content_type_id).model_class()
+    if model is Project:
+        return instance.object_id, None, None
+    elif model is Task:
+        return task_project_id(instance.object_id), instance.object_id, None
+    elif model is not SubTask:
+        return None, None, None
+    task_id = SubTask.objects.filter(pk=instance.object_id).values_list('task_id', flat=True).first()
+    return task_project_id(task_id) if task_id else None, task_id, instance.object_id
+
+
+def entry_fields(instance):
+    """
+    return the fields of the search entry of the instance (None if its parent object does not exist).
+    """
+    project_id, task_id, subtask_id = entry_parents(instance)
+    if project_id is None:
+        return None
+    return {'title': instance.title, 'body': instance.description or '', 'project_id': project_id,
+            'task_id': task_id, 'subtask_id': subtask_id}
+
+
+def remember_search_fields(sender, instance, **kwargs):
+    """
+    this method keeps the loaded search fields of the instance, to know on save whether they changed.
+    """
+    instance._search_fields = tuple(instance.__dict__.get(field) for field in SEARCH_FIELDS[sender])
+
+
+def update_search_entry(sender, instance, created, **kwargs):
+    """
+    this method creates or updates the search entry of the saved instance, only when it is created or
+    its title, description or parent changed (saving the status or the dates doesn't touch the index).
+    """
+    fields = tuple(instance.__dict__.get(field) for field in SEARCH_FIELDS[sender])
+    if not created and fields == getattr(instance, '_search_fields', None):
+        return
+    instance._search_fields = fields
+
+    values = entry_fields(instance)
+    kind = SEARCH_KINDS[sender]
+    if values is None:
+        SearchEntry.objects.filter(kind=kind, object_id=instance.pk).delete()
+    elif created:
+        SearchEntry.objects.create(kind=kind, object_id=instance.pk, **values)
+    else:
+        SearchEntry.objects.update_or_create(kind=kind, object_id=instance.pk, defaults=values)
+
+
+def delete_search_entry(sender, instance, **kwargs):
+    """
+    this method deletes the search entry of the deleted instance.
+    """
+    SearchEntry.objects.filter(kind=SEARCH_KINDS[sender], object_id=instance.pk).delete()
+
+
+for model in SEARCH_KINDS:
+    post_init.connect(receiver=remember_search_fields, sender=model)
+    post_save.connect(receiver=update_search_entry, sender=model)
+    post_delete.connect(receiver=delete_search_entry, sender=model)
+
+
+def create_search_index(sender, using='default', **kwargs):
+    """
+    this method creates the full-text index of the search entries (Search/backends.py).
+    """
+    get_backend(connections[using]).install(connections[using])
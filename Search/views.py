@@ -0,0 +1,47 @@
+from django.db import connections
+from rest_framework import permissions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from . import serializers
+from .backends import get_backend, search_terms
+from .models import SearchEntry
+
+
+class SearchView(APIView):
+    """
+    this view finds the projects, tasks, subtasks and financial records whose title or description has all the
+    words of the query, best matches first, with the matched words marked in the title and a snippet of the body.
+    only the objects that the user is allowed to see are searched.
+    query params -> q, kind (can be repeated), limit
+    permission -> Only authenticated users
+    """
+
+    permission_classes = (permissions.IsAuthenticated,)
+
+    def get(self, request, *args, **kwargs):
+        """
+        this method searches the full-text index of the entries (PostgreSQL or SQLite, Search/backends.py),
+        filtered by the authorized entries in the same query, and reads the entries of the results in one more query.
+        """
+        query_serializer = serializers.SearchQuerySerializer(data=request.query_params)
+        query_serializer.is_valid(raise_exception=True)
+        terms = search_terms(query_serializer.validated_data['q'])
+        if not terms:
+            return Response(data={'Error': 'The query has no words.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        entries = SearchEntry.objects.authorized_for(request.user)
+        if query_serializer.validated_data.get('kind'):
+            entries = entries.filter(kind__in=query_serializer.validated_data['kind'])
+        matches = get_backend(connections[entries.db]).search(entries, terms, query_serializer.validated_data['limit'])
+
+        # an entry deleted after the match is not in the entries anymore, so it is skipped
+        found = SearchEntry.objects.in_bulk([entry_id for entry_id, *_match in matches])
+        results = []
+        for entry_id, rank, title, snippet in matches:
+            if entry_id in found:
+                entry = found[entry_id]
+                entry.search_rank, entry.search_title, entry.search_snippet = rank, title, snippet
+                results.append(entry)
+        data = serializers.SearchResultSerializer(results, many=True).data
+        return Response(data={'count': len(data), 'results': data}, status=status.HTTP_200_OK)
@@ -0,0 +1,201 @@
+import base64
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import Q
+
+from Projects.models import Project, Task, SubTask
+from Financials.models import FinancialOutcomeRecord, FinancialIncomeRecord
+from .models import Tombstone
+
+# fields of the sync payload of each kind
+PAYLOAD_FIELDS = {
+    'project': ('id', 'title', 'description', 'category', 'start_date', 'end_date', 'status', 'initial_budget',
+                'budget', 'is_overdue', 'completion_date', 'ceo_id'),
+    'task': ('id', 'project_id', 'title', 'description', 'category', 'start_date', 'end_date', 'status', 'budget',
+             'is_overdue', 'completion_date', 'manager_id'),
+    'subtask': ('id', 'task_id', 'title', 'description', 'category', 'start_date', 'end_date', 'status', 'budget',
+                'is_overdue', 'completion_date', 'manager_id'),
+    'financial_outcome': ('id', 'title', 'description', 'price', 'status', 'payment_method', 'payment_date',
+                          'create_date', 'update_date', 'content_type__model', 'object_id', 'created_by_id'),
+    'financial_income': ('id', 'project_id', 'title', 'description', 'amount', 'source', 'owner_id', 'create_date'),
+}
+
+EXPERT_MODELS = {'project': Project, 'task': Task, 'subtask': SubTask}
+
+SYNC_MODELS = {**EXPERT_MODELS, 'financial_outcome': FinancialOutcomeRecord, 'financial_income': FinancialIncomeRecord}
+
+# fields of the users that see a project, task or subtask and everything under it (its CEO and managers)
+OWNER_FIELDS = {
+    'project': ('ceo_id',),
+    'task': ('manager_id', 'project__ceo_id'),
+    'subtask': ('manager_id', 'task__manager_id', 'task__project__ceo_id'),
+}
+
+
+class InvalidCursor(ValueError):
+    """
+    raised when the sync cursor cannot be decoded.
+    """
+
+
+def encode_cursor(change_seq, kind, object_id):
+    return base64.urlsafe_b64encode(f'{change_seq}:{kind}:{object_id}'.encode()).decode()
+
+
+def decode_cursor(cursor):
+    """
+    return (change sequence, kind, id) of the last change that the client has.
+    """
+    try:
+        change_seq, kind, object_id = base64.urlsafe_b64decode(cursor.encode()).decode().split(':')
+        change_seq, object_id = int(change_seq), int(object_id)
+    except (ValueError, UnicodeError):
+        raise InvalidCursor('Invalid cursor.')
+    if kind not in PAYLOAD_FIELDS:
+        raise InvalidCursor('Invalid cursor.')
+    return change_seq, kind, object_id
+
+
+def synced_objects(user):
+    """
+    return {kind: queryset} of the objects that the user is allowed to see (same rules as the permissions).
+    """
+    project_experts = Project.experts.through.objects.filter(customuser=user).values('project_id')
+    return {
+        'project': Project.objects.filter(Q(ceo=user) | Q(pk__in=project_experts)),
+        'task': Task.objects.authorized_for(user),
+        'subtask': SubTask.objects.authorized_for(user),
+        'financial_outcome': FinancialOutcomeRecord.objects.authorized_for(user),
+        'financial_income': FinancialIncomeRecord.objects.filter(project__ceo=user),
+    }
+
+
+def owners(kind, object_id):
+    """
+    return the ids of the users that see the project, task or subtask and everything under it: its CEO and
+    managers (one query). the financial records are seen by them, not by the experts.
+    """
+    if kind not in OWNER_FIELDS:
+        return set()
+    return set(EXPERT_MODELS[kind].objects.filter(pk=object_id).values_list(*OWNER_FIELDS[kind]).first() or ())
+
+
+def object_owners(kind, fields):
+    """
+    return the ids of the users that see an object (and everything under it) through the values of its
+    access fields (the CEO, manager and parent of Sync/signals.py), one query at most.
+    """
+    if kind == 'project':
+        return {fields['ceo_id']}
+    elif kind == 'task':
+        return {fields['manager_id']} | owners('project', fields['project_id'])
+    elif kind == 'subtask':
+        return {fields['manager_id']} | owners('task', fields['task_id'])
+    elif kind == 'financial_outcome':
+        return owners(ContentType.objects.get_for_id(fields['content_type_id']).model, fields['object_id'])
+    return owners('project', fields['project_id'])
+
+
+def audience(kind, instance):
+    """
+    return the ids of the users that can see the instance (same rules as synced_objects), two queries at most.
+    """
+    users = object_owners(kind, instance.__dict__)
+    if kind in EXPERT_MODELS:
+        users |= set(EXPERT_MODELS[kind].experts.through.objects.filter(**{f'{kind}_id': instance.pk})
+                     .values_list('customuser_id', flat=True))
+    return users
+
+
+def descendants(kind, object_id):
+    """
+    return {kind: queryset} of the object and the objects under it, that its CEO and managers see through it.
+    """
+    objects = {kind: SYNC_MODELS[kind].objects.filter(pk=object_id)}
+    if kind == 'project':
+        objects['task'] = Task.objects.filter(project_id=object_id)
+        objects['subtask'] = SubTask.objects.filter(task__project_id=object_id)
+        objects['financial_outcome'] = FinancialOutcomeRecord.objects.for_project(object_id)
+        objects['financial_income'] = FinancialIncomeRecord.objects.filter(project_id=object_id)
+    elif kind in ('task', 'subtask'):
+        content_types = ContentType.objects.get_for_models(Task, SubTask)
+        condition = Q(content_type=content_types[SYNC_MODELS[kind]], object_id=object_id)
+        if kind == 'task':
+            objects['subtask'] = SubTask.objects.filter(task_id=object_id)
+            condition |= Q(content_type=content_types[SubTask], object_id__in=objects['subtask'].values('id'))
+        objects['financial_outcome'] = FinancialOutcomeRecord.objects.filter(condition)
+    return objects
+
+
+def revoked(user, objects):
+    """
+    return [(kind, id), ...] of the objects ({kind: queryset}) that the user cannot see, one query per kind.
+    """
+    visible = synced_objects(user)
+    return [(kind, object_id) for kind, queryset in objects.items()
+            for object_id in queryset.exclude(pk__in=visible[kind].values('pk')).values_list('pk', flat=True)]
+
+
+def after_cursor(cursor, kind):
+    """
+    return the condition of the changes of one kind that come after the cursor in (change_seq, kind, id) order.
+    """
+    change_seq, cursor_kind, object_id = cursor
+    if kind > cursor_kind:
+        return Q(change_seq__gte=change_seq)
+    elif kind == cursor_kind:
+        return Q(change_seq__gt=change_seq) | Q(change_seq=change_seq, id__gt=object_id)
+    return Q(change_seq__gt=change_seq)
+
+
+def changes(user, cursor=None, limit=100):
+    """
+    return ([change, ...], cursor of the last change or None, has more) of the first `limit` changes after the cursor,
+    in (change_seq, kind, id) order:
+    the current payload of every created or updated object, {'deleted': True} for the deleted ones and the ones
+    that the user cannot see anymore (the tombstones of the user, after a cursor only).
+    each kind (and the tombstones) is read with one query from its change_seq index, at most limit + 1 rows,
+    and the experts of the projects, tasks and subtasks of the page with one query per kind,
+    so the work depends on the page size, not on the number of objects.
+    """
+    rows = []
+    for kind, queryset in synced_objects(user).items():
+        if cursor:
+            queryset = queryset.filter(after_cursor(cursor, kind))
+        for values in queryset.order_by('change_seq', 'id').values('change_seq', *PAYLOAD_FIELDS[kind])[:limit + 1]:
+            rows.append((values.pop('change_seq'), kind, values['id'], values))
+
+    # the first sync has nothing to delete
+    if cursor:
+        change_seq, kind, object_id = cursor
+        tombstones = Tombstone.objects.filter(Q(change_seq__gt=change_seq) |
+                                              Q(change_seq=change_seq, kind__gt=kind) |
+                                              Q(change_seq=change_seq, kind=kind, object_id__gt=object_id),
+                                              user=user)
+        for change_seq, kind, object_id in (tombstones.order_by('change_seq', 'kind', 'object_id')
+                                            .values_list('change_seq', 'kind', 'object_id')[:limit + 1]):
+            rows.append((change_seq, kind, object_id, None))
+
+    rows.sort(key=lambda row: row[:3])
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    experts = {}
+    for kind, model in EXPERT_MODELS.items():
+        ids = [object_id for _seq, row_kind, object_id, values in rows if row_kind == kind and values is not None]
+        if ids:
+            for object_id, user_id in (model.experts.through.objects.filter(**{f'{kind}_id__in': ids})
+                                       .values_list(f'{kind}_id', 'customuser_id')):
+                experts.setdefault((kind, object_id), []).append(user_id)
+
+    page = []
+    for change_seq, kind, object_id, values in rows:
+        change = {'change_seq': change_seq, 'kind': kind, 'id': object_id, 'deleted': values is None}
+        if values is not None:
+            if kind in EXPERT_MODELS:
+                values['experts'] = experts.get((kind, object_id), [])
+            if kind == 'financial_outcome':
+                values['model'] = values.pop('content_type__model')
+            change['data'] = values
+        page.append(change)
+    last = encode_cursor(*rows[-1][:3]) if rows else None
+    return page, last, has_more
@@ -0,0 +1,37 @@
+from datetime import timedelta
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Max
+from django.utils.timezone import now
+
+from Sync.models import ChangeCounter, Tombstone
+
+
+class Command(BaseCommand):
+    """
+    delete the tombstones older than SYNC_TOMBSTONE_DAYS (or --days). the clients with a cursor older than the
+    pruned tombstones get 410 from the sync api and sync again from the beginning.
+    this command is meant to be run periodically (for example daily by cron).
+    """
+
+    help = 'Delete the old tombstones of the sync api.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=None,
+                            help='Keep the tombstones of the last days (default: SYNC_TOMBSTONE_DAYS).')
+
+    def handle(self, *args, **options):
+        cutoff = now() - timedelta(days=options['days'] or settings.SYNC_TOMBSTONE_DAYS)
+        with transaction.atomic():
+            old = Tombstone.objects.filter(deleted_at__lt=cutoff)
+            pruned_seq = old.aggregate(seq=Max('change_seq'))['seq']
+            if pruned_seq is None:
+                self.stdout.write(self.style.SUCCESS('0 tombstones deleted.'))
+                return
+            counter, _created = ChangeCounter.objects.select_for_update().get_or_create(pk=1)
+            counter.pruned_seq = max(counter.pruned_seq, pruned_seq)
+            counter.save(update_fields=['pruned_seq'])
+            count, _deleted = old.delete()
+
+        self.stdout.write(self.style.SUCCESS(f'{count} tombstones deleted.'))
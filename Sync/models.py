@@ -0,0 +1,49 @@
+from django.db import models
+from django.utils.timezone import now
+from Accounts.models import CustomUser
+
+
+class ChangeCounter(models.Model):
+    """
+    change counter model stores the last change sequence number (one row).
+    every save of a synced object takes the next number (Sync/sequence.py).
+    pruned_seq -> the sequence number of the newest pruned tombstone, a client with an older cursor
+                  cannot get all the deletes and must sync again from the beginning
+    """
+
+    value = models.BigIntegerField(default=0)
+    pruned_seq = models.BigIntegerField(default=0)
+
+    def __str__(self):
+        return str(self.value)
+
+
+class Tombstone(models.Model):
+    """
+    tombstone model stores the synced objects that a user cannot see anymore, so their clients can remove them
+    (sync api): one tombstone for each user that could see a deleted object, and one for a user that lost access
+    to an object (removed from its experts, or a change of its CEO, manager or parent).
+    only the kind and id of the object are kept, and each user reads only their own tombstones.
+    user -> not a constraint: deleting a user deletes their projects and tasks, whose tombstones may be for
+            the same user (prune_tombstones deletes them later)
+    """
+
+    KIND_CHOICES = (
+        ('project', 'Project'),
+        ('task', 'Task'),
+        ('subtask', 'Subtask'),
+        ('financial_outcome', 'Financial Outcome'),
+        ('financial_income', 'Financial Income'),
+    )
+
+    kind = models.CharField(choices=KIND_CHOICES, max_length=17)
+    object_id = models.PositiveBigIntegerField()
+    user = models.ForeignKey(CustomUser, on_delete=models.DO_NOTHING, db_constraint=False, related_name='+')
+    change_seq = models.BigIntegerField()
+    deleted_at = models.DateTimeField(default=now)
+
+    class Meta:
+        indexes = [models.Index(fields=['user', 'change_seq', 'kind', 'object_id'])]
+
+    def __str__(self):
+        return f'{self.kind} {self.object_id}'
@@ -0,0 +1,52 @@
+from django.db import connections, models, router, transaction
+from django.db.transaction import TransactionManagementError
+
+from .models import ChangeCounter
+
+
+def next_change_seq(using='default'):
+    """
+    return the next change sequence number (one query), in the transaction of the change that it numbers.
+    the counter row stays locked until the transaction commits, so the changes become visible in the order of
+    their numbers and a client that synced up to a number never misses a change with a smaller number
+    (the saves of the synced objects wait for each other, only for the rest of their transactions).
+    outside a transaction the number would be committed before the change is written, so it is an error.
+    """
+    connection = connections[using]
+    if not connection.in_atomic_block:
+        raise TransactionManagementError('The change sequence number must be taken in the transaction of the change.')
+    table = connection.ops.quote_name(ChangeCounter._meta.db_table)
+    with connection.cursor() as cursor:
+        if connection.vendor in ('postgresql', 'sqlite'):
+            cursor.execute(f'UPDATE {table} SET value = value + 1 WHERE id = 1 RETURNING value')
+        else:
+            cursor.execute(f'UPDATE {table} SET value = value + 1 WHERE id = 1')
+            cursor.execute(f'SELECT value FROM {table} WHERE id = 1')
+        row = cursor.fetchone()
+    if row is None:
+        # the first change of the database creates the counter
+        ChangeCounter.objects.using(using).get_or_create(pk=1)
+        return next_change_seq(using)
+    return row[0]
+
+
+class SyncedModel(models.Model):
+    """
+    abstract model of the objects of the sync api.
+    every save takes the next change sequence number and writes the row in one transaction
+    (the pre_save and post_save signals run in it too).
+    """
+
+    change_seq = models.BigIntegerField(default=0, db_index=True)
+
+    class Meta:
+        abstract = True
+
+    def save_base(self, raw=False, force_insert=False, force_update=False, using=None, update_fields=None):
+        using = using or router.db_for_write(self.__class__, instance=self)
+        with transaction.atomic(using=using, savepoint=False):
+            self.change_seq = next_change_seq(using)
+            if update_fields is not None:
+                update_fields = frozenset({*update_fields, 'change_seq'})
+            super().save_base(raw=raw, force_insert=force_insert, force_update=force_update, using=using,
+                              update_fields=update_fields)
@@ -0,0 +1,13 @@
+from rest_framework import serializers
+from django.conf import settings
+
+
+class SyncQuerySerializer(serializers.Serializer):
+    """
+    serialize the query params of sync.
+    since -> the cursor of the previous response (empty for the first sync, which returns every object)
+    """
+
+    since = serializers.CharField(required=False, max_length=100)
+    limit = serializers.IntegerField(required=False, min_value=1, max_value=settings.SYNC_MAX_LIMIT,
+                                     default=settings.SYNC_LIMIT)
@@ -0,0 +1,117 @@
+from django.db.models.signals import post_init, post_save, pre_delete, post_delete, m2m_changed
+from Projects.models import Project, Task, SubTask
+from Financials.models import FinancialOutcomeRecord, FinancialIncomeRecord
+from .feed import audience, descendants, object_owners, revoked
+from .models import Tombstone
+from .sequence import next_change_seq
+
+# kind of the synced models in the sync api
+SYNC_KINDS = {
+    Project: 'project',
+    Task: 'task',
+    SubTask: 'subtask',
+    FinancialOutcomeRecord: 'financial_outcome',
+    FinancialIncomeRecord: 'financial_income',
+}
+
+# fields of the synced models that decide who can see them and the objects under them (CEO, manager, parent)
+ACCESS_FIELDS = {
+    Project: ('ceo_id',),
+    Task: ('project_id', 'manager_id'),
+    SubTask: ('task_id', 'manager_id'),
+    FinancialOutcomeRecord: ('content_type_id', 'object_id'),
+    FinancialIncomeRecord: ('project_id',),
+}
+
+
+def revoke(users, objects, change_seq, using='default'):
+    """
+    this method gives tombstones to the users for the objects ({kind: queryset}) that they cannot see anymore.
+    """
+    Tombstone.objects.using(using).bulk_create(
+        Tombstone(kind=kind, object_id=object_id, user_id=user_id, change_seq=change_seq)
+        for user_id in users if user_id is not None for kind, object_id in revoked(user_id, objects))
+
+
+def remember_access_fields(sender, instance, **kwargs):
+    """
+    this method keeps the loaded access fields of the instance, to know on save whether they changed.
+    """
+    instance._sync_access = {field: instance.__dict__.get(field) for field in ACCESS_FIELDS[sender]}
+
+
+def access_changed(sender, instance, created, using='default', **kwargs):
+    """
+    this method handles a change of the CEO, manager or parent of the saved instance (in its transaction):
+    the objects under it take the next change sequence number, so the users that can see them now get them,
+    and the users that saw it through the previous values get tombstones of what they cannot see anymore.
+    """
+    previous = getattr(instance, '_sync_access', None)
+    remember_access_fields(sender, instance)
+    if created or previous is None or previous == instance._sync_access:
+        return
+
+    kind = SYNC_KINDS[sender]
+    objects = descendants(kind, instance.pk)
+    change_seq = next_change_seq(using)
+    for object_kind, queryset in objects.items():
+        if object_kind != kind:
+            queryset.using(using).update(change_seq=change_seq)
+    users = object_owners(kind, previous) - object_owners(kind, instance._sync_access)
+    revoke(users, objects, change_seq, using)
+
+
+def remember_audience(sender, instance, **kwargs):
+    """
+    this method keeps the users that can see the instance that is going to be deleted
+    (the objects above it are deleted after the pre_delete signals, so they can still be read).
+    """
+    instance._sync_audience = audience(SYNC_KINDS[sender], instance)
+
+
+def create_tombstones(sender, instance, using='default', **kwargs):
+    """
+    this method gives a tombstone of the deleted instance, with the next change sequence number,
+    to every user that could see it.
+    """
+    change_seq = next_change_seq(using)
+    Tombstone.objects.using(using).bulk_create(
+        Tombstone(kind=SYNC_KINDS[sender], object_id=instance.pk, user_id=user_id, change_seq=change_seq)
+        for user_id in getattr(instance, '_sync_audience', ()) if user_id is not None)
+
+
+for model in SYNC_KINDS:
+    post_init.connect(receiver=remember_access_fields, sender=model)
+    post_save.connect(receiver=access_changed, sender=model)
+    pre_delete.connect(receiver=remember_audience, sender=model)
+    post_delete.connect(receiver=create_tombstones, sender=model)
+
+
+def experts_changed(sender, instance, action, reverse, model, pk_set, using='default', **kwargs):
+    """
+    this method gives the next change sequence number to the projects, tasks or subtasks whose experts changed
+    (the experts are a part of their sync payload), and tombstones to the removed experts that cannot see them
+    anymore. from the user side (reverse) the changed objects are pk_set, the ones of a clear are read before it.
+    """
+    objects_model = model if reverse else type(instance)
+    kind = SYNC_KINDS[objects_model]
+    if action == 'pre_clear':
+        instance_field, changed_field = ('customuser_id', f'{kind}_id') if reverse else (f'{kind}_id', 'customuser_id')
+        instance._sync_cleared = set(sender.objects.using(using).filter(**{instance_field: instance.pk})
+                                     .values_list(changed_field, flat=True))
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    changed = instance.__dict__.pop('_sync_cleared', set()) if action == 'post_clear' else pk_set
+    if not changed:
+        return
+    objects = objects_model.objects.using(using).filter(pk__in=changed if reverse else [instance.pk])
+    change_seq = next_change_seq(using)
+    objects.update(change_seq=change_seq)
+    if action != 'post_add':
+        revoke([instance.pk] if reverse else changed, {kind: objects}, change_seq, using)
+
+
+for model in (Project, Task, SubTask):
+    m2m_changed.connect(receiver=experts_changed, sender=model.experts.through)
@@ -0,0 +1,127 @@
+import threading
+from datetime import date
+from unittest import skipUnless
+from django.db import connection
+from django.db.models.signals import pre_save
+from django.test import TestCase, TransactionTestCase
+
+from Accounts.models import CustomUser
+from Projects.models import Project, Task, SubTask
+from .feed import changes, decode_cursor
+
+
+def create_user(number):
+    return CustomUser.objects.create_user(phone_number=f'0912{number:07d}', email=f'user{number}@example.com',
+                                          password='pass12345!', first_name=f'First{number}',
+                                          last_name=f'Last{number}')
+
+
+def create_project(ceo, title='project'):
+    return Project.objects.create(title=title, ceo=ceo, description='-', category='red',
+                                  start_date=date(2030, 1, 1), end_date=date(2030, 12, 31))
+
+
+def synced(user, cursor=None):
+    """
+    return ([(kind, id, deleted), ...], cursor) of the changes of the user after the cursor.
+    """
+    page, last, _has_more = changes(user, decode_cursor(cursor) if cursor else None, limit=1000)
+    return [(change['kind'], change['id'], change['deleted']) for change in page], last or cursor
+
+
+@skipUnless(connection.features.test_db_allows_multiple_connections, 'needs a database with many connections')
+class ConcurrentSaveTest(TransactionTestCase):
+
+    def test_no_skipped_change(self):
+        """
+        a save that took its change sequence number holds back the saves after it until it commits,
+        so a client that syncs in between cannot get a later change first and skip the earlier one.
+        """
+        ceo = create_user(1)
+        create_project(ceo, 'synced')
+        _changes, cursor = synced(ceo)
+        paused, release, errors = threading.Event(), threading.Event(), []
+
+        def pause(sender, instance, **kwargs):
+            # pre_save runs after the number is taken, in the transaction of the save
+            if instance.title == 'first':
+                paused.set()
+                release.wait(timeout=10)
+
+        def save(title):
+            try:
+                create_project(ceo, title)
+            except Exception as error:
+                errors.append(error)
+            finally:
+                connection.close()
+
+        pre_save.connect(pause, sender=Project, dispatch_uid='sync_test_pause')
+        first = threading.Thread(target=save, args=('first',))
+        second = threading.Thread(target=save, args=('second',))
+        try:
+            first.start()
+            self.assertTrue(paused.wait(timeout=10))
+            second.start()
+            second.join(timeout=1)
+            middle, cursor = synced(ceo, cursor)
+        finally:
+            release.set()
+            first.join()
+            second.join()
+            pre_save.disconnect(sender=Project, dispatch_uid='sync_test_pause')
+
+        self.assertEqual(errors, [])
+        final, _cursor = synced(ceo, cursor)
+        self.assertCountEqual([object_id for _kind, object_id, _deleted in middle + final],
+                              Project.objects.filter(title__in=('first', 'second')).values_list('id', flat=True))
+
+
+class TombstoneTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.ceo, cls.manager, cls.expert, cls.other = (create_user(number) for number in range(1, 5))
+        cls.project = create_project(cls.ceo)
+        cls.task = Task.objects.create(title='task', project=cls.project, manager=cls.manager, description='-',
+                                       category='red', start_date=date(2030, 1, 1), end_date=date(2030, 1, 31))
+        cls.subtask = SubTask.objects.create(title='subtask', task=cls.task, manager=cls.manager, description='-',
+                                             category='red', start_date=date(2030, 1, 1), end_date=date(2030, 1, 5))
+        cls.task.experts.add(cls.expert)
+
+    def test_delete(self):
+        """
+        the users that could see a deleted object get its tombstone, the others don't.
+        """
+        cursors = {user: synced(user)[1] for user in (self.ceo, self.manager, self.expert)}
+        deleted = [('subtask', self.subtask.pk, True), ('task', self.task.pk, True)]
+        self.task.delete()
+
+        self.assertCountEqual(synced(self.ceo, cursors[self.ceo])[0], deleted)
+        self.assertCountEqual(synced(self.manager, cursors[self.manager])[0], deleted)
+        self.assertEqual(synced(self.expert, cursors[self.expert])[0], [deleted[1]])
+        self.assertEqual(synced(self.other, cursors[self.ceo])[0], [])
+
+    def test_removed_expert(self):
+        """
+        an expert removed from a task gets its tombstone.
+        """
+        _changes, cursor = synced(self.expert)
+        self.task.experts.remove(self.expert)
+        self.assertEqual(synced(self.expert, cursor)[0], [('task', self.task.pk, True)])
+
+    def test_manager_change(self):
+        """
+        the previous manager of a task gets the tombstones of the task and the subtasks that they cannot see
+        anymore, the new manager gets the task and its subtasks.
+        """
+        _changes, cursor = synced(self.ceo)
+        self.subtask.manager = self.other
+        self.subtask.save()
+        self.task.manager = self.other
+        self.task.save()
+
+        self.assertCountEqual(synced(self.manager, cursor)[0], [('task', self.task.pk, True),
+                                                                ('subtask', self.subtask.pk, True)])
+        self.assertCountEqual(synced(self.other, cursor)[0], [('task', self.task.pk, False),
+                                                              ('subtask', self.subtask.pk, False)])
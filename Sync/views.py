@@ -0,0 +1,42 @@
+from rest_framework import permissions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from . import serializers
+from .feed import InvalidCursor, changes, decode_cursor
+from .models import ChangeCounter
+
+
+class SyncView(APIView):
+    """
+    this view shows the changes of the projects, tasks, subtasks and financial records that the user can see,
+    after the cursor of the previous sync: the current data of the created and updated objects and the ids of
+    the deleted ones and of the ones that the user cannot see anymore (removed from the experts, another manager).
+    a client keeps the cursor of the response and asks again while has_more is true.
+    query params -> since, limit
+    methods -> GET: for show the changes (410 if the deletes after the cursor were pruned: sync again without since)
+    permission -> Only authenticated users
+    """
+
+    permission_classes = (permissions.IsAuthenticated,)
+
+    def get(self, request, *args, **kwargs):
+        """
+        this method reads one page of changes (one query per kind on the change_seq indexes, Sync/feed.py).
+        """
+        query_serializer = serializers.SyncQuerySerializer(data=request.query_params)
+        query_serializer.is_valid(raise_exception=True)
+        since = query_serializer.validated_data.get('since')
+        try:
+            cursor = decode_cursor(since) if since else None
+        except InvalidCursor as error:
+            return Response(data={'Error': str(error)}, status=status.HTTP_400_BAD_REQUEST)
+
+        if cursor and cursor[0] < (ChangeCounter.objects.filter(pk=1).values_list('pruned_seq', flat=True)
+                                   .first() or 0):
+            return Response(data={'Error': 'The cursor is too old, sync again without since.'},
+                            status=status.HTTP_410_GONE)
+
+        page, last, has_more = changes(request.user, cursor, query_serializer.validated_data['limit'])
+        return Response(data={'cursor': last or since, 'has_more': has_more, 'changes': page},
+                        status=status.HTTP_200_OK)
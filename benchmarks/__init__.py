@@ -0,0 +1,20 @@
+"""
+benchmark suite of the Projects and Financials endpoints.
+
+python -m benchmarks.run --output results/head.json                 (SQLite)
+BENCHMARK_DB=postgres python -m benchmarks.run --output head.json    (local Postgres, see benchmarks/settings.py)
+python -m benchmarks.compare results/base.json results/head.json
+
+connection reuse on the task list (a new connection per request, persistent connections, psycopg3 pool):
+DB_CONN_MAX_AGE=0 BENCHMARK_DB=postgres python -m benchmarks.run --scenario create_list_task --output new.json
+DB_CONN_MAX_AGE=60 BENCHMARK_DB=postgres python -m benchmarks.run --scenario create_list_task --output reuse.json
+DB_POOL=True BENCHMARK_DB=postgres python -m benchmarks.run --scenario create_list_task --output pool.json
+python -m benchmarks.compare new.json reuse.json
+
+throughput of the task list under gunicorn (WSGI) and uvicorn (ASGI), sync view and async variant:
+python -m benchmarks.throughput --concurrency 16 --duration 10 --output throughput.json
+
+each run creates a test database, fills it with a deterministic dataset (benchmarks/generator.py),
+runs every scenario (benchmarks/scenarios.py) and writes the latency percentiles and query counts as JSON,
+so the results of two commits can be compared.
+"""
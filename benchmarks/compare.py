@@ -0,0 +1,79 @@
+"""
+compare two benchmark results (python -m benchmarks.run --output ...) and show the change of each scenario.
+
+python -m benchmarks.compare base.json head.json [--threshold 10] [--fail-on-regression]
+
+a scenario regresses when its p95 latency grows more than the threshold (percent)
+or when it runs more queries than before.
+"""
+import argparse
+import json
+import sys
+
+
+def load(path):
+    with open(path) as file:
+        return json.load(file)
+
+
+def change(base, head):
+    if not base:
+        return 0.0
+    return (head - base) / base * 100
+
+
+def compare(base, head, threshold):
+    """
+    return the rows of the comparison table and the names of the regressed scenarios.
+    """
+    rows, regressions = [], []
+    for name in sorted(set(base['scenarios']) | set(head['scenarios'])):
+        old, new = base['scenarios'].get(name), head['scenarios'].get(name)
+        if old is None or new is None:
+            rows.append((name, 'only in ' + ('head' if old is None else 'base'), '', '', ''))
+            continue
+
+        p95_change = change(old['p95_ms'], new['p95_ms'])
+        flags = []
+        if p95_change > threshold:
+            flags.append('slower')
+        if new['queries'] > old['queries']:
+            flags.append('more queries')
+        if flags:
+            regressions.append(name)
+        rows.append((name, f'{old["p95_ms"]:.2f} -> {new["p95_ms"]:.2f} ms', f'{p95_change:+.1f}%',
+                     f'{old["queries"]} -> {new["queries"]}', ', '.join(flags)))
+    return rows, regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Compare two benchmark results.')
+    parser.add_argument('base', help='JSON results of the base commit.')
+    parser.add_argument('head', help='JSON results of the new commit.')
+    parser.add_argument('--threshold', type=float, default=10.0,
+                        help='p95 growth (percent) that counts as a regression.')
+    parser.add_argument('--fail-on-regression', action='store_true',
+                        help='Exit with status 1 when a scenario regresses.')
+    options = parser.parse_args(argv)
+
+    base, head = load(options.base), load(options.head)
+    for key in ('database', 'dataset'):
+        if base['meta'].get(key) != head['meta'].get(key):
+            print(f'warning: the results have different {key}, they are not comparable.', file=sys.stderr)
+
+    print(f'base {base["meta"].get("commit")} ({base["meta"].get("database")}) -> '
+          f'head {head["meta"].get("commit")} ({head["meta"].get("database")})')
+    rows, regressions = compare(base, head, options.threshold)
+    for name, p95, p95_change, queries, flags in rows:
+        print(f'{name:<45} {p95:<24} {p95_change:>8}  queries {queries:<10} {flags}')
+
+    if regressions:
+        print(f'{len(regressions)} scenarios regressed: {", ".join(regressions)}')
+        if options.fail_on_regression:
+            sys.exit(1)
+    else:
+        print('no regressions.')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,188 @@
+import random
+from dataclasses import dataclass, field, asdict
+from datetime import timedelta
+from django.contrib.auth.hashers import make_password
+from django.contrib.contenttypes.models import ContentType
+from django.utils.timezone import now
+
+from Accounts.models import CustomUser
+from Financials.models import FinancialOutcomeRecord, CashPaymentRecord, CheckPaymentRecord, \
+    InstallmentPaymentRecord, InstallmentSchedule, FinancialIncomeRecord
+from Projects.models import Project, Task, SubTask
+from Search.entries import rebuild_entries
+
+CATEGORIES = ('red', 'green', 'blue', 'purple', 'pink', 'yellow')
+WORDS = ('alpha', 'bravo', 'delta', 'orbit', 'vector', 'harbor', 'summit', 'atlas', 'nova', 'pixel')
+
+
+@dataclass
+class DatasetSpec:
+    """
+    size of the generated dataset. the same spec and seed always generate the same data.
+    """
+    seed: int = 42
+    users: int = 50
+    projects: int = 20
+    tasks_per_project: int = 10
+    subtasks_per_task: int = 5
+    experts_per_object: int = 3
+    outcomes_per_object: int = 2
+    installments_per_outcome: int = 6
+    incomes_per_project: int = 5
+
+    def as_dict(self):
+        return asdict(self)
+
+
+@dataclass
+class Dataset:
+    """
+    ids of the generated rows that the scenarios use.
+    owner_id is the CEO of every generated project, so the scenarios can use one user for most endpoints.
+    the payment ids are of the outcomes of projects and tasks (the records that the CEO is allowed to change).
+    """
+    spec: DatasetSpec
+    owner_id: int = None
+    user_ids: list = field(default_factory=list)
+    project_ids: list = field(default_factory=list)
+    task_ids: list = field(default_factory=list)
+    subtask_ids: list = field(default_factory=list)
+    outcome_ids: list = field(default_factory=list)
+    cash_ids: list = field(default_factory=list)
+    check_ids: list = field(default_factory=list)
+    installment_ids: list = field(default_factory=list)
+    installment_schedule_ids: list = field(default_factory=list)
+    income_ids: list = field(default_factory=list)
+
+    def pick(self, name, iteration):
+        """
+        return the id of the given list for the iteration (round robin, so the scenarios touch different rows).
+        """
+        ids = getattr(self, name)
+        return ids[iteration % len(ids)]
+
+
+def generate(spec=None):
+    """
+    generate the benchmark dataset and return its ids.
+    rows are inserted by bulk_create (with the fields that the model save methods would set),
+    so generating a large dataset takes seconds.
+    dates are relative to today, because the endpoints compare them with today.
+    """
+    spec = spec or DatasetSpec()
+    generator = random.Random(spec.seed)
+    today = now().date()
+    dataset = Dataset(spec=spec)
+
+    password = make_password('benchmark-password')
+    users = CustomUser.objects.bulk_create([
+        CustomUser(first_name=generator.choice(WORDS).title(), last_name=f'User{i}', phone_number=f'098{i:08d}',
+                   email=f'benchmark{i}@example.com', gender=generator.choice(('female', 'male')), password=password)
+        for i in range(spec.users)])
+    dataset.user_ids = [user.id for user in users]
+    owner = users[0]
+    dataset.owner_id = owner.id
+
+    def title(prefix, i):
+        return f'{prefix} {generator.choice(WORDS)} {i}'
+
+    def dates():
+        start = today - timedelta(days=generator.randint(0, 60))
+        return start, start + timedelta(days=generator.randint(30, 180))
+
+    projects = []
+    for i in range(spec.projects):
+        start_date, end_date = dates()
+        budget = generator.randint(100, 1000) * 100000
+        projects.append(Project(title=title('Project', i), ceo=owner, description='benchmark project',
+                                category=generator.choice(CATEGORIES), start_date=start_date, end_date=end_date,
+                                status='in_progress', budget=budget, initial_budget=budget))
+    projects = Project.objects.bulk_create(projects)
+
+    tasks = []
+    for project in projects:
+        for i in range(spec.tasks_per_project):
+            start_date, end_date = project.start_date, project.end_date
+            tasks.append(Task(title=title('Task', i), project=project, manager=generator.choice(users),
+                              description='benchmark task', category=generator.choice(CATEGORIES),
+                              start_date=start_date, end_date=end_date, status='in_progress',
+                              budget=project.budget // (spec.tasks_per_project * 2)))
+    tasks = Task.objects.bulk_create(tasks)
+
+    subtasks = []
+    for task in tasks:
+        for i in range(spec.subtasks_per_task):
+            status = generator.choice(('not_started', 'in_progress', 'completed'))
+            subtasks.append(SubTask(title=title('Subtask', i), task=task, manager=generator.choice(users),
+                                    description='benchmark subtask', category=generator.choice(CATEGORIES),
+                                    start_date=task.start_date, end_date=task.end_date, status=status,
+                                    completion_date=today if status == 'completed' else None,
+                                    budget=task.budget // (spec.subtasks_per_task * 2)))
+    subtasks = SubTask.objects.bulk_create(subtasks)
+
+    dataset.project_ids = [project.id for project in projects]
+    dataset.task_ids = [task.id for task in tasks]
+    dataset.subtask_ids = [subtask.id for subtask in subtasks]
+
+    for model, objects in ((Project, projects), (Task, tasks), (SubTask, subtasks)):
+        through = model.experts.through
+        column = f'{model._meta.model_name}_id'
+        through.objects.bulk_create([through(**{column: obj.id, 'customuser_id': user.id})
+                                     for obj in objects
+                                     for user in generator.sample(users, min(spec.experts_per_object, len(users)))])
+
+    outcomes = []
+    for model, objects in ((Project, projects), (Task, tasks), (SubTask, subtasks)):
+        content_type = ContentType.objects.get_for_model(model)
+        for obj in objects:
+            creator_id = obj.ceo_id if model is Project else obj.manager_id
+            for i in range(spec.outcomes_per_object):
+                outcomes.append(FinancialOutcomeRecord(
+                    created_by_id=creator_id, title=title('Outcome', i), description='benchmark outcome',
+                    price=generator.randint(1, 500) * 10000,
+                    payment_method=('cash', 'check', 'installment')[len(outcomes) % 3],
+                    status=generator.choice(('in_progress', 'in_progress', 'paid')),
+                    content_type=content_type, object_id=obj.id))
+    outcomes = FinancialOutcomeRecord.objects.bulk_create(outcomes)
+    dataset.outcome_ids = [outcome.id for outcome in outcomes]
+
+    subtask_type = ContentType.objects.get_for_model(SubTask)
+    cash, checks, installments = [], [], []
+    for outcome in outcomes:
+        offset = timedelta(days=generator.randint(-30, 60))
+        if outcome.payment_method == 'cash':
+            cash.append(CashPaymentRecord(financial_outcome=outcome, payment_date=today + offset,
+                                          status='done' if outcome.status == 'paid' else ''))
+        elif outcome.payment_method == 'check':
+            checks.append(CheckPaymentRecord(financial_outcome=outcome, check_date=today + abs(offset),
+                                             check_number=f'{generator.randint(10 ** 9, 10 ** 10 - 1)}',
+                                             status='done' if outcome.status == 'paid' else ''))
+        else:
+            installments.append(InstallmentPaymentRecord(financial_outcome=outcome,
+                                                         count_installments=spec.installments_per_outcome,
+                                                         status='done' if outcome.status == 'paid' else ''))
+    cash = CashPaymentRecord.objects.bulk_create(cash)
+    checks = CheckPaymentRecord.objects.bulk_create(checks)
+    installments = InstallmentPaymentRecord.objects.bulk_create(installments)
+
+    def owned(records):
+        return [record.id for record in records if record.financial_outcome.content_type_id != subtask_type.id]
+
+    dataset.cash_ids, dataset.check_ids, dataset.installment_ids = owned(cash), owned(checks), owned(installments)
+
+    schedules = InstallmentSchedule.objects.bulk_create([
+        InstallmentSchedule(installment_id=installment, date=today + timedelta(days=30 * i),
+                            installment_status='paid' if installment.status == 'done' else 'in_progress')
+        for installment in installments for i in range(spec.installments_per_outcome)])
+    dataset.installment_schedule_ids = [schedule.id for schedule in schedules
+                                        if schedule.installment_id_id in set(dataset.installment_ids)]
+
+    incomes = FinancialIncomeRecord.objects.bulk_create([
+        FinancialIncomeRecord(title=title('Income', i), description='benchmark income',
+                              amount=generator.randint(1, 100) * 100000,
+                              source=generator.choice(('investment', 'grant', 'other')), owner=owner, project=project)
+        for project in projects for i in range(spec.incomes_per_project)])
+    dataset.income_ids = [income.id for income in incomes]
+
+    rebuild_entries()  # bulk_create sends no signals
+    return dataset
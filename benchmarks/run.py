@@ -0,0 +1,165 @@
+"""
+run the benchmark scenarios and write their results as JSON.
+
+python -m benchmarks.run [--iterations 50] [--warmup 5] [--scenario NAME ...] [--projects 20 ...] [--output FILE]
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from contextlib import ExitStack
+from dataclasses import fields
+from datetime import datetime, timezone
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'benchmarks.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.db import close_old_connections, connection, connections, transaction  # noqa: E402
+from django.test import Client  # noqa: E402
+from rest_framework_simplejwt.tokens import AccessToken  # noqa: E402
+
+from Accounts.models import CustomUser  # noqa: E402
+from ProjectManagement.metrics import RequestQueries  # noqa: E402
+from benchmarks.generator import DatasetSpec, generate  # noqa: E402
+from benchmarks.scenarios import SCENARIOS  # noqa: E402
+
+
+def percentile(values, p):
+    """
+    return the p percentile of the sorted values (nearest rank).
+    """
+    return values[min(int(len(values) * p / 100), len(values) - 1)]
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def send(client, scenario, dataset, iteration, headers):
+    """
+    send one request of the scenario and return its status code, duration (ms) and query count.
+    the requests of mutating scenarios are rolled back, so every iteration sees the generated data.
+    the test client doesn't close the connections like the request handler does,
+    so they are closed here (as CONN_MAX_AGE says) and the duration includes opening the connection.
+    """
+    queries = RequestQueries()
+    request = getattr(client, scenario.method)
+    path = scenario.path(dataset, iteration)
+    close_old_connections()
+    with ExitStack() as stack:
+        for alias in connections:
+            stack.enter_context(connections[alias].execute_wrapper(queries))
+        if scenario.mutates:
+            stack.enter_context(transaction.atomic())
+        start = time.perf_counter()
+        response = request(path, data=scenario.data, content_type='application/json', headers=headers)
+        duration = (time.perf_counter() - start) * 1000
+        if scenario.mutates:
+            transaction.set_rollback(True)
+    close_old_connections()
+    return response.status_code, duration, queries.count
+
+
+def run_scenario(client, scenario, dataset, headers, iterations, warmup):
+    for iteration in range(warmup):
+        send(client, scenario, dataset, iteration, headers)
+
+    durations, query_counts, status_codes = [], [], {}
+    for iteration in range(iterations):
+        status_code, duration, count = send(client, scenario, dataset, warmup + iteration, headers)
+        durations.append(duration)
+        query_counts.append(count)
+        status_codes[str(status_code)] = status_codes.get(str(status_code), 0) + 1
+
+    durations.sort()
+    return {
+        'iterations': iterations,
+        'p50_ms': round(percentile(durations, 50), 3),
+        'p95_ms': round(percentile(durations, 95), 3),
+        'p99_ms': round(percentile(durations, 99), 3),
+        'mean_ms': round(statistics.fmean(durations), 3),
+        'min_ms': round(durations[0], 3),
+        'max_ms': round(durations[-1], 3),
+        'queries': statistics.median_low(query_counts),
+        'max_queries': max(query_counts),
+        'status_codes': status_codes,
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the Projects and Financials endpoints.')
+    parser.add_argument('--iterations', type=int, default=50, help='Measured requests of each scenario.')
+    parser.add_argument('--warmup', type=int, default=5, help='Requests of each scenario before measuring.')
+    parser.add_argument('--scenario', action='append', default=[],
+                        help='Run only the scenarios whose name starts with this value (can be repeated).')
+    parser.add_argument('--output', help='Path of the JSON results (default: stdout).')
+    for spec_field in fields(DatasetSpec):
+        parser.add_argument(f'--{spec_field.name.replace("_", "-")}', type=int, default=spec_field.default,
+                            help=f'Dataset size: {spec_field.name} (default: {spec_field.default}).')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    options = parse_args(argv)
+    spec = DatasetSpec(**{spec_field.name: getattr(options, spec_field.name) for spec_field in fields(DatasetSpec)})
+    scenarios = [scenario for scenario in SCENARIOS
+                 if not options.scenario or scenario.name.startswith(tuple(options.scenario))]
+
+    old_name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+    try:
+        start = time.perf_counter()
+        dataset = generate(spec)
+        print(f'dataset generated in {time.perf_counter() - start:.1f} seconds', file=sys.stderr)
+
+        owner = CustomUser.objects.get(pk=dataset.owner_id)
+        headers = {'Authorization': f'Bearer {AccessToken.for_user(owner)}'}
+        client = Client(raise_request_exception=False)
+
+        results = {}
+        for scenario in scenarios:
+            results[scenario.name] = run_scenario(client, scenario, dataset, headers, options.iterations,
+                                                  options.warmup)
+            result = results[scenario.name]
+            print(f'{scenario.name:<45} p50 {result["p50_ms"]:>8.2f} ms  p95 {result["p95_ms"]:>8.2f} ms  '
+                  f'queries {result["queries"]:>4}  {result["status_codes"]}', file=sys.stderr)
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    report = {
+        'meta': {
+            'commit': git_commit(),
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'database': connection.vendor,
+            'connections': {'conn_max_age': connection.settings_dict['CONN_MAX_AGE'],
+                            'health_checks': connection.settings_dict['CONN_HEALTH_CHECKS'],
+                            'pool': connection.settings_dict.get('OPTIONS', {}).get('pool')},
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'iterations': options.iterations,
+            'warmup': options.warmup,
+            'dataset': spec.as_dict(),
+        },
+        'scenarios': results,
+    }
+    output = json.dumps(report, indent=2)
+    if options.output:
+        with open(options.output, 'w') as file:
+            file.write(output + '\n')
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()
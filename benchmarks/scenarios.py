@@ -0,0 +1,105 @@
+"""
+the benchmark scenarios. each scenario is one request that is sent many times, with the ids picked round robin
+from the dataset (so every iteration reads different rows, not only the cached ones).
+to benchmark a new endpoint, add its scenario to SCENARIOS.
+"""
+from dataclasses import dataclass
+
+
+@dataclass
+class Scenario:
+    """
+    name -> name of the scenario in the results (the url name, with a suffix when an url has more scenarios)
+    path -> function(dataset, iteration) that returns the path of the request
+    mutates -> the request changes data, so each iteration runs in a transaction that is rolled back
+    """
+    name: str
+    path: object
+    method: str = 'get'
+    data: dict = None
+    mutates: bool = False
+
+
+def pick(name, template):
+    """
+    return a path function that formats the template with the id of the given dataset list.
+    """
+    return lambda dataset, iteration: template.format(dataset.pick(name, iteration))
+
+
+def fixed(path):
+    return lambda dataset, iteration: path
+
+
+SCENARIOS = [
+    # projects
+    Scenario('create_list_project', fixed('/projects/create-list-project/')),
+    Scenario('update_delete_project', pick('project_ids', '/projects/update-delete-project/{}/')),
+    Scenario('create_list_task', pick('project_ids', '/projects/{}/create-list-task/')),
+    Scenario('update_delete_task', pick('task_ids', '/projects/update-delete-task/{}/')),
+    Scenario('create_list_subtask', pick('task_ids', '/projects/{}/create-list-subtask/')),
+    Scenario('update_delete_subtask', pick('subtask_ids', '/projects/update-delete-subtask/{}/')),
+    Scenario('my_work', fixed('/projects/my-work/')),
+    Scenario('my_work:overdue', fixed('/projects/my-work/?overdue=true&status=in_progress')),
+    Scenario('project_tree', pick('project_ids', '/projects/{}/tree/')),
+    Scenario('project_schedule', pick('project_ids', '/projects/{}/schedule/')),
+    Scenario('project_schedule:subtask', pick('project_ids', '/projects/{}/schedule/?level=subtask')),
+    Scenario('complete_project', pick('project_ids', '/projects/complete-project/{}/'), method='post', mutates=True),
+    Scenario('complete_task', pick('task_ids', '/projects/complete-task/{}/'), method='post', mutates=True),
+    Scenario('complete_subtask', pick('subtask_ids', '/projects/complete-subtask/{}/'), method='post', mutates=True),
+
+    # financial outcomes and payments
+    Scenario('create_list_financial_outcome:project',
+             pick('project_ids', '/financials/create-list-financial-outcome/project/{}/')),
+    Scenario('create_list_financial_outcome:task',
+             pick('task_ids', '/financials/create-list-financial-outcome/task/{}/')),
+    Scenario('update_delete_financial_outcome', pick('outcome_ids', '/financials/update-delete-financial-outcome/{}/')),
+    Scenario('update_payment_method', pick('outcome_ids', '/financials/update-payment_method/{}/')),
+    Scenario('list_installment_schedule', pick('installment_ids', '/financials/list_installment_schedule/{}/')),
+    Scenario('update_installment_schedule',
+             pick('installment_schedule_ids', '/financials/update_installment_schedule/{}/')),
+    Scenario('complete_cash_payment', pick('cash_ids', '/financials/complete-cash-payment/{}/'),
+             method='post', mutates=True),
+    Scenario('complete_check_payment', pick('check_ids', '/financials/complete-check-payment/{}/'),
+             method='post', mutates=True),
+    Scenario('complete_installment_schedule_payment',
+             pick('installment_schedule_ids', '/financials/complete-installment_schedule-payment/{}/'),
+             method='post', mutates=True),
+
+    # financial incomes
+    Scenario('create_list_financial_income', pick('project_ids', '/financials/create-list-financial-income/{}/')),
+    Scenario('update_delete_financial_income', pick('income_ids', '/financials/update-delete-financial-income/{}/')),
+
+    # reports
+    Scenario('payment_calendar', fixed('/financials/calendar/')),
+    Scenario('project_cashflow', pick('project_ids', '/financials/cashflow/{}/')),
+    Scenario('project_cashflow:week', pick('project_ids', '/financials/cashflow/{}/?bucket=week')),
+    Scenario('financial_outcome_summary:status', fixed('/financials/summary/outcome/?group_by=status')),
+    Scenario('financial_outcome_summary:project', fixed('/financials/summary/outcome/?group_by=project')),
+    Scenario('financial_income_summary', fixed('/financials/summary/income/')),
+    Scenario('user_workload', pick('user_ids', '/accounts/users/{}/workload/?bucket=week')),
+    Scenario('workload', fixed('/accounts/users/workload/?overallocated=true')),
+
+    # search
+    Scenario('search', fixed('/search/?q=project')),
+    Scenario('search:prefix', fixed('/search/?q=benchmark%20ta&kind=task&kind=subtask')),
+
+    # audit
+    Scenario('audit_events', fixed('/audit/events/')),
+    Scenario('audit_events:object', pick('project_ids', '/audit/events/?object_type=project&object_id={}')),
+
+    # sync (first page of the change feed)
+    Scenario('sync', fixed('/sync/')),
+
+    # async variants (served by the test client through the WSGI path, see benchmarks/throughput.py for ASGI)
+    Scenario('async_list_project', fixed('/projects/async/list-project/')),
+    Scenario('async_project', pick('project_ids', '/projects/async/project/{}/')),
+    Scenario('async_list_task', pick('project_ids', '/projects/async/{}/list-task/')),
+    Scenario('async_task', pick('task_ids', '/projects/async/task/{}/')),
+    Scenario('async_list_subtask', pick('task_ids', '/projects/async/{}/list-subtask/')),
+    Scenario('async_subtask', pick('subtask_ids', '/projects/async/subtask/{}/')),
+    Scenario('async_list_financial_outcome', pick('project_ids', '/financials/async/list-financial-outcome/project/{}/')),
+    Scenario('async_financial_outcome', pick('outcome_ids', '/financials/async/financial-outcome/{}/')),
+    Scenario('async_list_financial_income', pick('project_ids', '/financials/async/list-financial-income/{}/')),
+    Scenario('async_financial_income', pick('income_ids', '/financials/async/financial-income/{}/')),
+]
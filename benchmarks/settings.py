@@ -0,0 +1,57 @@
+"""
+settings of the benchmark runs: the project settings with a local cache, a fast password hasher
+and the database selected by BENCHMARK_DB (sqlite or postgres).
+the connection settings (DB_CONN_MAX_AGE, DB_CONN_HEALTH_CHECKS, DB_POOL, ...) are the same env vars as production.
+"""
+from decouple import config
+
+from ProjectManagement.settings import *  # noqa: F401,F403
+
+PRODUCTION = False
+DEBUG = False
+ALLOWED_HOSTS = ['testserver', 'localhost', '127.0.0.1']
+
+# the benchmark measures the endpoints, not the password hashing of the generated users
+PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+# database of the benchmark (a test database is created from its name and dropped at the end)
+BENCHMARK_DB = config('BENCHMARK_DB', default='sqlite')
+
+if BENCHMARK_DB == 'postgres':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': config('BENCHMARK_DB_NAME', default='project_management'),
+            'USER': config('BENCHMARK_DB_USER', default='postgres'),
+            'PASSWORD': config('BENCHMARK_DB_PASSWORD', default=''),
+            'HOST': config('BENCHMARK_DB_HOST', default='127.0.0.1'),
+            'PORT': config('BENCHMARK_DB_PORT', default='5432'),
+            'CONN_MAX_AGE': DB_CONN_MAX_AGE,  # noqa: F405
+            'CONN_HEALTH_CHECKS': DB_CONN_HEALTH_CHECKS,  # noqa: F405
+        }
+    }
+    if DB_POOL:  # noqa: F405
+        DATABASES['default']['CONN_MAX_AGE'] = 0
+        DATABASES['default']['OPTIONS'] = {'pool': {'min_size': DB_POOL_MIN_SIZE,  # noqa: F405
+                                                    'max_size': DB_POOL_MAX_SIZE,  # noqa: F405
+                                                    'timeout': DB_POOL_TIMEOUT}}  # noqa: F405
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': BASE_DIR / 'db.sqlite3',  # noqa: F405
+            'CONN_MAX_AGE': DB_CONN_MAX_AGE,  # noqa: F405
+            # a file (not the in-memory default of the test databases), to measure the disk reads too
+            'TEST': {'NAME': BASE_DIR / 'benchmark.sqlite3'},  # noqa: F405
+        }
+    }
+
+# set by benchmarks.throughput for the servers that it starts, so they use the test database of the run
+if config('BENCHMARK_SERVE_DB', default=''):
+    DATABASES['default']['NAME'] = config('BENCHMARK_SERVE_DB')
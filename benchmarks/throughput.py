@@ -0,0 +1,205 @@
+"""
+compare the throughput of the WSGI path (gunicorn) and the ASGI path (uvicorn) for the sync and async variants
+of an endpoint under concurrent requests.
+
+python -m benchmarks.throughput [--concurrency 16] [--duration 10] [--workers 1] [--threads 4] [--output FILE]
+
+needs uvicorn and gunicorn (pip install uvicorn gunicorn). the test database is created and filled as in
+benchmarks.run, then each target starts its server on the database, is loaded for --duration seconds and stopped.
+"""
+import argparse
+import importlib.util
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from http.client import HTTPConnection
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'benchmarks.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.db import connection, connections  # noqa: E402
+from rest_framework_simplejwt.tokens import AccessToken  # noqa: E402
+
+from Accounts.models import CustomUser  # noqa: E402
+from benchmarks.generator import DatasetSpec, generate  # noqa: E402
+from benchmarks.run import git_commit, percentile  # noqa: E402
+
+
+@dataclass
+class Target:
+    name: str
+    server: str
+    path: str
+
+
+# the task list (sync generic view and its async variant) under each server
+TARGETS = [
+    Target('wsgi:sync', 'gunicorn', '/projects/{}/create-list-task/'),
+    Target('wsgi:async', 'gunicorn', '/projects/async/{}/list-task/'),
+    Target('asgi:sync', 'uvicorn', '/projects/{}/create-list-task/'),
+    Target('asgi:async', 'uvicorn', '/projects/async/{}/list-task/'),
+]
+
+
+def server_command(server, port, options):
+    if server == 'uvicorn':
+        return [sys.executable, '-m', 'uvicorn', 'ProjectManagement.asgi:application', '--host', '127.0.0.1',
+                '--port', str(port), '--workers', str(options.workers), '--log-level', 'warning', '--no-access-log']
+    return [sys.executable, '-m', 'gunicorn', 'ProjectManagement.wsgi:application', '--bind', f'127.0.0.1:{port}',
+            '--workers', str(options.workers), '--threads', str(options.threads), '--worker-class', 'gthread',
+            '--log-level', 'warning']
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_server(port, process, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f'the server exited with status {process.returncode}.')
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError('the server did not start in time.')
+
+
+def load(port, paths, headers, concurrency, duration):
+    """
+    send requests from `concurrency` clients (keep-alive connections) for `duration` seconds
+    and return the latencies (ms) and status codes.
+    """
+    latencies, status_codes = [], {}
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration
+
+    def client(number):
+        http = HTTPConnection('127.0.0.1', port, timeout=60)
+        own_latencies, own_codes = [], {}
+        iteration = number
+        while time.monotonic() < deadline:
+            start = time.perf_counter()
+            try:
+                http.request('GET', paths[iteration % len(paths)], headers=headers)
+                response = http.getresponse()
+                response.read()
+                code = str(response.status)
+            except OSError:
+                http.close()
+                http = HTTPConnection('127.0.0.1', port, timeout=60)
+                code = 'error'
+            own_latencies.append((time.perf_counter() - start) * 1000)
+            own_codes[code] = own_codes.get(code, 0) + 1
+            iteration += concurrency
+        http.close()
+        with lock:
+            latencies.extend(own_latencies)
+            for code, count in own_codes.items():
+                status_codes[code] = status_codes.get(code, 0) + count
+
+    threads = [threading.Thread(target=client, args=(number,)) for number in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return sorted(latencies), status_codes
+
+
+def run_target(target, dataset, headers, database, options):
+    port = free_port()
+    env = {**os.environ, 'DJANGO_SETTINGS_MODULE': 'benchmarks.settings', 'PRODUCTION': 'False',
+           'BENCHMARK_SERVE_DB': str(database)}
+    process = subprocess.Popen(server_command(target.server, port, options), env=env)
+    try:
+        wait_for_server(port, process)
+        paths = [target.path.format(project_id) for project_id in dataset.project_ids]
+        load(port, paths, headers, options.concurrency, min(options.duration, 2))  # warmup
+        latencies, status_codes = load(port, paths, headers, options.concurrency, options.duration)
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+    return {
+        'server': target.server,
+        'path': target.path,
+        'requests': len(latencies),
+        'requests_per_second': round(len(latencies) / options.duration, 2),
+        'p50_ms': round(percentile(latencies, 50), 3) if latencies else None,
+        'p95_ms': round(percentile(latencies, 95), 3) if latencies else None,
+        'p99_ms': round(percentile(latencies, 99), 3) if latencies else None,
+        'status_codes': status_codes,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Compare the WSGI and ASGI throughput of the task list.')
+    parser.add_argument('--concurrency', type=int, default=16, help='Number of concurrent clients.')
+    parser.add_argument('--duration', type=float, default=10, help='Seconds of load for each target.')
+    parser.add_argument('--workers', type=int, default=1, help='Server worker processes.')
+    parser.add_argument('--threads', type=int, default=4, help='Threads of each gunicorn worker.')
+    parser.add_argument('--target', action='append', default=[],
+                        help='Run only the targets whose name starts with this value (can be repeated).')
+    parser.add_argument('--projects', type=int, default=DatasetSpec.projects, help='Dataset size: projects.')
+    parser.add_argument('--output', help='Path of the JSON results (default: stdout).')
+    options = parser.parse_args(argv)
+
+    targets = [target for target in TARGETS if not options.target or target.name.startswith(tuple(options.target))]
+    missing = {target.server for target in targets if importlib.util.find_spec(target.server) is None}
+    if missing:
+        sys.exit(f'{", ".join(sorted(missing))} is not installed (pip install uvicorn gunicorn).')
+
+    spec = DatasetSpec(projects=options.projects)
+    old_name = connection.settings_dict['NAME']
+    database = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+    try:
+        dataset = generate(spec)
+        owner = CustomUser.objects.get(pk=dataset.owner_id)
+        headers = {'Authorization': f'Bearer {AccessToken.for_user(owner)}'}
+        connections.close_all()
+
+        results = {}
+        for target in targets:
+            results[target.name] = run_target(target, dataset, headers, database, options)
+            result = results[target.name]
+            print(f'{target.name:<12} {result["requests_per_second"]:>8.1f} req/s  p50 {result["p50_ms"]} ms  '
+                  f'p95 {result["p95_ms"]} ms  {result["status_codes"]}', file=sys.stderr)
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    report = {
+        'meta': {
+            'commit': git_commit(),
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'database': connection.vendor,
+            'concurrency': options.concurrency,
+            'duration': options.duration,
+            'workers': options.workers,
+            'threads': options.threads,
+            'dataset': spec.as_dict(),
+        },
+        'targets': results,
+    }
+    output = json.dumps(report, indent=2)
+    if options.output:
+        with open(options.output, 'w') as file:
+            file.write(output + '\n')
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()